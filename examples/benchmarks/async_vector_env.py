@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""Measures the step rate of `AsyncVectorEnv` for several numbers of
+environments per worker process, on a cheap environment where the
+communication between the processes dominates. With `--shared-memory`, the
+observations, actions, rewards and dones go through shared memory instead of
+being pickled.
+"""
+import argparse
+import time
+
+import gym
+from gym.vector import AsyncVectorEnv
+
+
+def benchmark(args, envs_per_worker):
+    env_fns = [lambda: gym.make(args.env_id) for _ in range(args.num_envs)]
+    env = AsyncVectorEnv(env_fns, shared_memory=args.shared_memory,
+                         envs_per_worker=envs_per_worker)
+    env.seed(0)
+    env.reset()
+    actions = [env.action_space.sample() for _ in range(16)]
+    start = time.time()
+    for i in range(args.num_steps):
+        env.step(actions[i % len(actions)])
+    elapsed = time.time() - start
+    env.close()
+    return args.num_steps / elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--env-id', default='CartPole-v1')
+    parser.add_argument('--num-envs', type=int, default=64)
+    parser.add_argument('--num-steps', type=int, default=1000)
+    parser.add_argument('--envs-per-worker', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--shared-memory', dest='shared_memory', action='store_true')
+    parser.add_argument('--no-shared-memory', dest='shared_memory', action='store_false')
+    parser.set_defaults(shared_memory=True)
+    args = parser.parse_args()
+
+    for envs_per_worker in args.envs_per_worker:
+        steps_per_second = benchmark(args, envs_per_worker)
+        print('envs_per_worker={:3d}: {:8.1f} batch steps/s, {:10.1f} env steps/s'.format(
+            envs_per_worker, steps_per_second, steps_per_second * args.num_envs))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""Measures the step rate of `AsyncVectorEnv` with floating workers, and with
+workers pinned to a core each (`worker_affinity='auto'`, which also limits
+their BLAS and OpenMP libraries to a single thread), on an environment doing
+some linear algebra and returning image observations. With 'auto', the
+workers are spread over the NUMA nodes, and each worker first-touches its
+slices of the shared observation buffers, so that they are allocated on its
+node; the difference only shows on machines with several NUMA nodes.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+import gym
+from gym import spaces
+from gym.vector import AsyncVectorEnv
+from gym.vector.utils import numa_nodes
+
+
+class ComputeEnv(gym.Env):
+    def __init__(self, matrix_size, shape):
+        self.observation_space = spaces.Box(low=0, high=255, shape=shape, dtype=np.uint8)
+        self.action_space = spaces.Discrete(4)
+        self._matrix = np.random.RandomState(0).rand(matrix_size, matrix_size)
+        self._observation = np.zeros(shape, dtype=np.uint8)
+
+    def reset(self):
+        return self._observation
+
+    def step(self, action):
+        np.dot(self._matrix, self._matrix)
+        return self._observation, 0., False, {}
+
+
+def benchmark(args, **kwargs):
+    shape = tuple(args.shape)
+    env = AsyncVectorEnv([lambda: ComputeEnv(args.matrix_size, shape)
+                          for _ in range(args.num_envs)], **kwargs)
+    env.reset()
+    actions = np.zeros(args.num_envs, dtype=np.int64)
+    start = time.time()
+    for _ in range(args.num_steps):
+        env.step(actions)
+    elapsed = time.time() - start
+    env.close()
+    return args.num_steps / elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-envs', type=int, default=len(os.sched_getaffinity(0)))
+    parser.add_argument('--num-steps', type=int, default=500)
+    parser.add_argument('--matrix-size', type=int, default=128)
+    parser.add_argument('--shape', type=int, nargs='+', default=[84, 84, 4])
+    args = parser.parse_args()
+
+    print('NUMA nodes: {}'.format(numa_nodes()))
+    for name, kwargs in [('floating', {}),
+                         ('worker_threads=1', {'worker_threads': 1}),
+                         ("worker_affinity='auto'", {'worker_affinity': 'auto'})]:
+        print('{:>24s}: {:8.1f} batch steps/s'.format(name, benchmark(args, **kwargs)))
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""Measures the latency of `AsyncVectorEnv.step` with the 'pipe' and 'flag'
+synchronization backends, for several numbers of environments, on a cheap
+environment where the synchronization between the processes dominates.
+"""
+import argparse
+import time
+
+import numpy as np
+
+import gym
+from gym.vector import AsyncVectorEnv
+
+
+def benchmark(args, sync_backend, num_envs):
+    env_fns = [lambda: gym.make(args.env_id) for _ in range(num_envs)]
+    env = AsyncVectorEnv(env_fns, sync_backend=sync_backend,
+                         spin_count=args.spin_count)
+    env.seed(0)
+    env.reset()
+    actions = [env.action_space.sample() for _ in range(16)]
+    latencies = np.zeros(args.num_steps)
+    for i in range(args.num_steps):
+        start = time.time()
+        env.step(actions[i % len(actions)])
+        latencies[i] = time.time() - start
+    env.close()
+    return latencies
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--env-id', default='CartPole-v1')
+    parser.add_argument('--num-envs', type=int, nargs='+', default=[1, 8, 64])
+    parser.add_argument('--num-steps', type=int, default=2000)
+    parser.add_argument('--spin-count', type=int, default=None)
+    args = parser.parse_args()
+
+    for num_envs in args.num_envs:
+        for sync_backend in ('pipe', 'flag'):
+            latencies = 1e6 * benchmark(args, sync_backend, num_envs)
+            print('num_envs={:3d} {:>4s}: mean {:8.1f} us, p50 {:8.1f} us, '
+                  'p99 {:8.1f} us'.format(num_envs, sync_backend, np.mean(latencies),
+                  np.percentile(latencies, 50), np.percentile(latencies, 99)))
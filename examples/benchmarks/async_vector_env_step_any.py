@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""Compares the throughput of `AsyncVectorEnv` when the whole batch is stepped
+with `step`, and when the environments are stepped as soon as they are ready
+with `step_async(actions, indices)` and `recv_ready`, on environments whose
+step times are heterogeneous: every episode ends with a slow reset, as with
+the extra simulation steps of `MobileSIA7FARMGymEnv.reset`.
+"""
+import argparse
+import time
+
+import numpy as np
+
+import gym
+from gym import spaces
+from gym.vector import AsyncVectorEnv
+
+
+class HeterogeneousEnv(gym.Env):
+    def __init__(self, step_time, reset_time, max_episode_steps, seed):
+        self.step_time = step_time
+        self.reset_time = reset_time
+        self.max_episode_steps = max_episode_steps
+        self.observation_space = spaces.Box(low=-1., high=1., shape=(16,), dtype=np.float32)
+        self.action_space = spaces.Box(low=-1., high=1., shape=(4,), dtype=np.float32)
+        self.np_random = np.random.RandomState(seed)
+        self._steps = 0
+
+    def reset(self):
+        self._steps = 0
+        time.sleep(self.np_random.exponential(self.reset_time))
+        return self.observation_space.sample()
+
+    def step(self, action):
+        self._steps += 1
+        time.sleep(self.np_random.exponential(self.step_time))
+        done = self._steps >= self.max_episode_steps
+        return self.observation_space.sample(), 0., done, {}
+
+
+def make_env(args, seed):
+    return lambda: HeterogeneousEnv(args.step_time, args.reset_time,
+                                    args.max_episode_steps, seed)
+
+
+def benchmark(args, min_ready):
+    env = AsyncVectorEnv([make_env(args, i) for i in range(args.num_envs)],
+                         sync_backend=args.sync_backend)
+    env.reset()
+    actions = np.zeros((args.num_envs, 4), dtype=np.float32)
+    num_steps = 0
+    start = time.time()
+    if min_ready is None:
+        while num_steps < args.num_steps:
+            env.step(actions)
+            num_steps += args.num_envs
+    else:
+        env.step_async(actions)
+        while num_steps < args.num_steps:
+            indices, _, _, _, _ = env.recv_ready(min_ready)
+            num_steps += len(indices)
+            env.step_async(actions[indices], indices)
+        env.recv_ready(args.num_envs)
+    elapsed = time.time() - start
+    env.close()
+    return num_steps / elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-envs', type=int, default=16)
+    parser.add_argument('--num-steps', type=int, default=5000)
+    parser.add_argument('--step-time', type=float, default=1e-3)
+    parser.add_argument('--reset-time', type=float, default=2e-2)
+    parser.add_argument('--max-episode-steps', type=int, default=20)
+    parser.add_argument('--min-ready', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--sync-backend', default='pipe', choices=['pipe', 'flag'])
+    args = parser.parse_args()
+
+    print('step:               {:8.1f} env steps/s'.format(benchmark(args, None)))
+    for min_ready in args.min_ready:
+        print('recv_ready({:3d}):    {:8.1f} env steps/s'.format(
+            min_ready, benchmark(args, min_ready)))
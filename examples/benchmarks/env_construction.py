@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""Measures the time to build the environments of
+`gym.vector.make('SIA7FARMPickAndPlace-v1', 64)`, with every environment
+parsing its model (the model cache is cleared before each environment is
+built) and with the model parsed once, the other environments being loaded
+from the cached compiled model.
+"""
+import argparse
+import time
+
+import gym
+from gym.envs.mujoco import mujoco_env
+from gym.vector import AsyncVectorEnv, SyncVectorEnv
+
+
+def make_env(env_id, cached):
+    def _make():
+        if not cached:
+            mujoco_env.clear_model_cache()
+        return gym.make(env_id)
+    return _make
+
+
+def benchmark(args, cls, cached):
+    mujoco_env.clear_model_cache()
+    env_fns = [make_env(args.env_id, cached) for _ in range(args.num_envs)]
+    start = time.time()
+    env = cls(env_fns)
+    elapsed = time.time() - start
+    env.close()
+    return elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--env-id', type=str, default='SIA7FARMPickAndPlace-v1')
+    parser.add_argument('--num-envs', type=int, default=64)
+    args = parser.parse_args()
+
+    for name, cls in [('sync', SyncVectorEnv), ('async', AsyncVectorEnv)]:
+        for cached in (False, True):
+            print('{} x{} {:>5s} {:>8s}: {:8.2f} s'.format(args.env_id, args.num_envs,
+                name, 'cached' if cached else 'uncached', benchmark(args, cls, cached)))
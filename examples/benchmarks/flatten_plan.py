@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""Compares `gym.spaces.flatten`/`unflatten` with a precompiled `FlattenPlan`
+on the goal Dict observation spaces of the Fetch and Hand robotics
+environments, for single samples and for batches (`flatten_batch` and
+`unflatten_batch` against a loop over the samples).
+"""
+import argparse
+import timeit
+from collections import OrderedDict
+
+import numpy as np
+
+from gym import spaces
+
+
+def goal_space(observation_dim, goal_dim):
+    # Same layout as `RobotEnv.observation_space`
+    return spaces.Dict(dict(
+        desired_goal=spaces.Box(-np.inf, np.inf, shape=(goal_dim,), dtype='float32'),
+        achieved_goal=spaces.Box(-np.inf, np.inf, shape=(goal_dim,), dtype='float32'),
+        observation=spaces.Box(-np.inf, np.inf, shape=(observation_dim,), dtype='float32'),
+    ))
+
+SPACES = OrderedDict([
+    ('FetchPickAndPlace', goal_space(25, 3)),
+    ('HandManipulateBlock', goal_space(61, 7)),
+    ('HandReach', goal_space(63, 15))
+])
+
+
+def benchmark(args, space):
+    plan = spaces.FlattenPlan(space)
+    sample = space.sample()
+    flat = spaces.flatten(space, sample)
+    out = np.empty_like(flat)
+    samples = [space.sample() for _ in range(args.batch_size)]
+    batch = space.sample_batch(args.batch_size)
+    flat_batch = plan.flatten_batch(batch)
+    out_batch = np.empty_like(flat_batch)
+
+    functions = [
+        ('flatten', lambda: spaces.flatten(space, sample), 1),
+        ('FlattenPlan.flatten', lambda: plan.flatten(sample, out=out), 1),
+        ('unflatten', lambda: spaces.unflatten(space, flat), 1),
+        ('FlattenPlan.unflatten', lambda: plan.unflatten(flat), 1),
+        ('flatten (loop)', lambda: [spaces.flatten(space, x) for x in samples], args.batch_size),
+        ('FlattenPlan.flatten_batch', lambda: plan.flatten_batch(batch, out=out_batch), args.batch_size),
+        ('unflatten (loop)', lambda: [spaces.unflatten(space, x) for x in flat_batch], args.batch_size),
+        ('FlattenPlan.unflatten_batch', lambda: plan.unflatten_batch(flat_batch), args.batch_size)
+    ]
+    return [(name, 1e6 * min(timeit.repeat(function, number=args.number,
+        repeat=args.repeat)) / (args.number * n)) for (name, function, n) in functions]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--number', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    for space_name, space in SPACES.items():
+        for name, duration in benchmark(args, space):
+            print('{:>19s} {:>27s}: {:8.3f} us/sample'.format(space_name, name, duration))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""Measures the cost of `import gym` with `python -X importtime`, broken down
+by the modules imported at startup (the slowest ones are listed), and the
+cost of a failed `gym.spec` lookup, which reports the other registered
+versions of the environment.
+"""
+import argparse
+import subprocess
+import sys
+import timeit
+
+
+def import_times(args):
+    # Each line of `-X importtime` is "import time: self | cumulative | name",
+    # in microseconds; the best of `repeat` fresh interpreters is kept
+    times = {}
+    for _ in range(args.repeat):
+        output = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import gym'],
+            stderr=subprocess.PIPE, universal_newlines=True, check=True).stderr
+        for line in output.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = line.split('|')
+            name = name.strip()
+            cumulative = int(cumulative)
+            times[name] = min(times.get(name, cumulative), cumulative)
+    return times
+
+
+def missing_lookup(args):
+    import gym
+    from gym import error
+
+    def lookup():
+        try:
+            gym.spec('CartPole-v2')
+        except error.DeprecatedEnv:
+            pass
+    return 1e6 * min(timeit.repeat(lookup, number=args.number,
+        repeat=args.repeat)) / args.number
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=10000)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    times = import_times(args)
+    print('import gym: {:8.1f} ms'.format(1e-3 * times['gym']))
+    for name in sorted(times, key=times.get, reverse=True)[1:args.top + 1]:
+        print('  {:>44s}: {:8.1f} ms'.format(name, 1e-3 * times[name]))
+    print('gym.spec miss: {:8.2f} us'.format(missing_lookup(args)))
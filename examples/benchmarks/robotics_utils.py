@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""Compares the time spent per step applying actions with
+`gym.envs.robotics.utils.ctrl_set_action`/`mocap_set_action`, which use index
+arrays cached on the simulation, to the previous implementations looping over
+the actuators and the equality constraints in Python.
+"""
+import argparse
+import timeit
+
+import numpy as np
+import mujoco_py
+
+import gym
+from gym.envs.robotics import utils
+
+
+def ctrl_set_action_loop(sim, action):
+    if sim.model.nmocap > 0:
+        _, action = np.split(action, (sim.model.nmocap * 7, ))
+    if sim.data.ctrl is not None:
+        for i in range(action.shape[0]):
+            if sim.model.actuator_biastype[i] == 0:
+                sim.data.ctrl[i] = action[i]
+            else:
+                idx = sim.model.jnt_qposadr[sim.model.actuator_trnid[i, 0]]
+                sim.data.ctrl[i] = sim.data.qpos[idx] + action[i]
+
+
+def reset_mocap2body_xpos_loop(sim):
+    if (sim.model.eq_type is None or
+        sim.model.eq_obj1id is None or
+        sim.model.eq_obj2id is None):
+        return
+    for eq_type, obj1_id, obj2_id in zip(sim.model.eq_type,
+                                         sim.model.eq_obj1id,
+                                         sim.model.eq_obj2id):
+        if eq_type != mujoco_py.const.EQ_WELD:
+            continue
+        mocap_id = sim.model.body_mocapid[obj1_id]
+        if mocap_id != -1:
+            body_idx = obj2_id
+        else:
+            mocap_id = sim.model.body_mocapid[obj2_id]
+            body_idx = obj1_id
+        sim.data.mocap_pos[mocap_id][:] = sim.data.body_xpos[body_idx]
+        sim.data.mocap_quat[mocap_id][:] = sim.data.body_xquat[body_idx]
+
+
+def mocap_set_action_loop(sim, action):
+    if sim.model.nmocap > 0:
+        action, _ = np.split(action, (sim.model.nmocap * 7, ))
+        action = action.reshape(sim.model.nmocap, 7)
+        reset_mocap2body_xpos_loop(sim)
+        sim.data.mocap_pos[:] = sim.data.mocap_pos + action[:, :3]
+        sim.data.mocap_quat[:] = sim.data.mocap_quat + action[:, 3:]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--env-ids', nargs='+',
+                        default=['FetchPickAndPlace-v1', 'SIA7FARMPickAndPlace-v1'])
+    parser.add_argument('--number', type=int, default=10000)
+    args = parser.parse_args()
+
+    for env_id in args.env_ids:
+        env = gym.make(env_id).unwrapped
+        env.seed(0)
+        env.reset()
+        sim = env.sim
+        action = np.zeros(sim.model.nmocap * 7 + sim.model.nu)
+
+        def apply_loop():
+            ctrl_set_action_loop(sim, action)
+            mocap_set_action_loop(sim, action)
+
+        def apply_indexed():
+            utils.ctrl_set_action(sim, action)
+            utils.mocap_set_action(sim, action)
+
+        def step():
+            env.step(np.zeros(env.action_space.shape))
+
+        print(env_id)
+        for name, fn in [('loops', apply_loop), ('index arrays', apply_indexed), ('env.step', step)]:
+            duration = min(timeit.repeat(fn, number=args.number, repeat=3)) / args.number
+            print('    {:>12}: {:8.2f} us/step'.format(name, 1e6 * duration))
+        env.close()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Microbenchmark of the batched rotation functions of
+`gym.envs.robotics.rotations` for batch sizes from 1 to 1e6. `mat2quat` is
+compared to the previous implementation, which solved an eigenvalue problem
+per matrix (only up to `--max-loop-size` matrices, since it is slow).
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from gym.envs.robotics import rotations
+
+
+def mat2quat_eigh(mat):
+    mat = np.asarray(mat, dtype=np.float64)
+    Qxx, Qyx, Qzx = mat[..., 0, 0], mat[..., 0, 1], mat[..., 0, 2]
+    Qxy, Qyy, Qzy = mat[..., 1, 0], mat[..., 1, 1], mat[..., 1, 2]
+    Qxz, Qyz, Qzz = mat[..., 2, 0], mat[..., 2, 1], mat[..., 2, 2]
+    K = np.zeros(mat.shape[:-2] + (4, 4), dtype=np.float64)
+    K[..., 0, 0] = Qxx - Qyy - Qzz
+    K[..., 1, 0] = Qyx + Qxy
+    K[..., 1, 1] = Qyy - Qxx - Qzz
+    K[..., 2, 0] = Qzx + Qxz
+    K[..., 2, 1] = Qzy + Qyz
+    K[..., 2, 2] = Qzz - Qxx - Qyy
+    K[..., 3, 0] = Qyz - Qzy
+    K[..., 3, 1] = Qzx - Qxz
+    K[..., 3, 2] = Qxy - Qyx
+    K[..., 3, 3] = Qxx + Qyy + Qzz
+    K /= 3.0
+    q = np.empty(K.shape[:-2] + (4,))
+    it = np.nditer(q[..., 0], flags=['multi_index'])
+    while not it.finished:
+        vals, vecs = np.linalg.eigh(K[it.multi_index])
+        q[it.multi_index] = vecs[[3, 0, 1, 2], np.argmax(vals)]
+        if q[it.multi_index][0] < 0:
+            q[it.multi_index] *= -1
+        it.iternext()
+    return q
+
+
+def best_time(fn, min_duration=0.2):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_duration / 0.2))
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--max-size', type=int, default=10 ** 6)
+    parser.add_argument('--max-loop-size', type=int, default=10 ** 4)
+    args = parser.parse_args()
+
+    np_random = np.random.RandomState(0)
+    print('{:>8} {:>14} {:>14} {:>14} {:>14} {:>14}'.format(
+        'batch', 'mat2quat (eigh)', 'mat2quat', 'quat_mul', 'quat2mat', 'euler2quat'))
+    size = 1
+    while size <= args.max_size:
+        euler = np_random.uniform(-np.pi, np.pi, size=(size, 3))
+        mat = rotations.euler2mat(euler)
+        q0, q1 = rotations.euler2quat(euler), rotations.euler2quat(euler[::-1])
+        times = [
+            best_time(lambda: mat2quat_eigh(mat)) if size <= args.max_loop_size else float('nan'),
+            best_time(lambda: rotations.mat2quat(mat)),
+            best_time(lambda: rotations.quat_mul(q0, q1)),
+            best_time(lambda: rotations.quat2mat(q0)),
+            best_time(lambda: rotations.euler2quat(euler)),
+        ]
+        print('{:>8d} '.format(size) + ' '.join('{:>11.2f} us'.format(1e6 * t) for t in times))
+        size *= 10
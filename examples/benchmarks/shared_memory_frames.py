@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""Measures the time to write one frame into the shared memory of
+`AsyncVectorEnv`, with `write_to_shared_memory` and with the cached views of
+`SharedMemoryWritePlan`, for Atari-like frames (84x84x4 stacked frames and
+raw 210x160x3 frames). The frames are written either with the dtype of the
+space or as float64 arrays, which need a conversion.
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from gym.spaces import Box
+from gym.vector.utils import (create_shared_memory, write_to_shared_memory,
+                              SharedMemoryWritePlan)
+
+SHAPES = [(84, 84, 4), (210, 160, 3)]
+
+
+def benchmark(args, shape, dtype):
+    space = Box(low=0, high=255, shape=shape, dtype=np.uint8)
+    shared_memory = create_shared_memory(space, n=args.num_envs)
+    write = SharedMemoryWritePlan(shared_memory, space)
+    frame = space.sample().astype(dtype)
+    index = args.num_envs - 1
+
+    functions = [
+        ('write_to_shared_memory', lambda: write_to_shared_memory(index, frame,
+            shared_memory, space)),
+        ('SharedMemoryWritePlan', lambda: write(index, frame))
+    ]
+    return [(name, 1e6 * min(timeit.repeat(function, number=args.number,
+        repeat=args.repeat)) / args.number) for (name, function) in functions]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-envs', type=int, default=8)
+    parser.add_argument('--number', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for shape in SHAPES:
+        for dtype in (np.uint8, np.float64):
+            for name, duration in benchmark(args, shape, dtype):
+                print('{:>12s} {:>7s} {:>23s}: {:8.2f} us'.format('x'.join(map(str, shape)),
+                    np.dtype(dtype).name, name, duration))
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""Measures the throughput of clone/restore cycles on SIA7FARMPickAndPlace-v1,
+comparing `clone_state`/`restore_state` (with and without a preallocated
+buffer) to a deepcopy of `MjSim.get_state` followed by `MjSim.set_state`.
+"""
+import argparse
+import copy
+import time
+
+import numpy as np
+
+import gym
+
+
+def benchmark(env, num_cycles, clone, restore):
+    start = time.time()
+    for _ in range(num_cycles):
+        restore(clone())
+    return num_cycles / (time.time() - start)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-cycles', type=int, default=100000)
+    args = parser.parse_args()
+
+    env = gym.make('SIA7FARMPickAndPlace-v1').unwrapped
+    env.seed(0)
+    env.reset()
+    buffer = np.empty(env.state_size, dtype=np.float64)
+
+    def restore_sim_state(state):
+        env.sim.set_state(state)
+        env.sim.forward()
+
+    results = [
+        ('deepcopy(get_state)', lambda: copy.deepcopy(env.sim.get_state()), restore_sim_state),
+        ('clone_state', env.clone_state, env.restore_state),
+        ('clone_state(out)', lambda: env.clone_state(out=buffer), env.restore_state),
+        ('clone_state + bytes', lambda: env.clone_state(out=buffer).tobytes(), env.restore_state),
+    ]
+    for name, clone, restore in results:
+        print('{:>20}: {:10.1f} cycles/s'.format(name, benchmark(env, args.num_cycles, clone, restore)))
+    env.close()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""Measures the throughput and the tail latency of the control loop of
+SIA7FARMPickAndPlace-v1 on the real-robot code path, with the ROS interface
+replaced by a `SimulatedSIA7FARMROS` with configurable service latencies.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from gym.envs.robotics import SIA7FARMPickAndPlaceEnv
+from gym.envs.robotics.ros_interface.simulated_sia_7f_arm_ros import (
+    ServiceLatency, SimulatedSIA7FARMROS)
+
+
+def benchmark(args, asynchronous):
+    robot = SimulatedSIA7FARMROS(
+        SIA7FARMPickAndPlaceEnv(),
+        service_latency=ServiceLatency(args.latency, args.jitter, args.distribution),
+        joint_states_drop_rate=args.drop_rate,
+        object_target_delay=args.object_delay,
+        asynchronous=asynchronous, seed=0)
+    env = SIA7FARMPickAndPlaceEnv(use_real_robot=True, ros_interface=robot)
+    env.seed(0)
+    env.reset()
+    step_times = np.zeros(args.num_steps)
+    for i in range(args.num_steps):
+        start = time.time()
+        env.step(env.action_space.sample())
+        step_times[i] = time.time() - start
+    robot.arm_wait_for_commands()
+    stats = env.get_real_robot_latency_stats()
+    env.close()
+    return step_times, stats
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-steps', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.005,
+                        help='mean latency of every service call, in seconds')
+    parser.add_argument('--jitter', type=float, default=0.002)
+    parser.add_argument('--distribution', default='lognormal',
+                        choices=ServiceLatency.DISTRIBUTIONS)
+    parser.add_argument('--drop-rate', type=float, default=0.05,
+                        help='probability of dropping a /joint_states message')
+    parser.add_argument('--object-delay', type=int, default=2,
+                        help='number of steps by which /object_target lags behind')
+    args = parser.parse_args()
+
+    for asynchronous in [False, True]:
+        step_times, stats = benchmark(args, asynchronous)
+        print('{}: {:8.1f} steps/s, step latency p50 {:6.2f} ms, p99 {:6.2f} ms, max {:6.2f} ms'.format(
+            'async' if asynchronous else 'sync ', 1. / np.mean(step_times),
+            1e3 * np.percentile(step_times, 50), 1e3 * np.percentile(step_times, 99),
+            1e3 * np.max(step_times)))
+        for name, call_stats in sorted(stats.items()):
+            print('    {:>26}: {:5d} calls, p50 {:6.2f} ms, p99 {:6.2f} ms'.format(
+                name, call_stats['count'], 1e3 * call_stats['p50'], 1e3 * call_stats['p99']))
@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+"""Measures the time spent in `reset` by SIA7FARMPickAndPlace-v1, with and
+without a cache of settled initial states.
+"""
+import argparse
+import time
+
+import gym
+
+
+def benchmark(num_resets, **kwargs):
+    env = gym.make('SIA7FARMPickAndPlace-v1', **kwargs)
+    env.seed(0)
+    env.reset()  # fills the cache, if any
+    start = time.time()
+    for _ in range(num_resets):
+        env.reset()
+    elapsed = time.time() - start
+    env.close()
+    return 1e3 * elapsed / num_resets
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-resets', type=int, default=200)
+    parser.add_argument('--cache-size', type=int, default=64)
+    args = parser.parse_args()
+
+    print('no cache:          {:8.3f} ms/reset'.format(benchmark(args.num_resets)))
+    for refill in ['never', 'background']:
+        print('cache ({:>10}): {:8.3f} ms/reset'.format(refill, benchmark(args.num_resets,
+              reset_cache_size=args.cache_size, reset_cache_refill=refill)))
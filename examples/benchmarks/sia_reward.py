@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+"""Compares the cost per transition of `MobileSIA7FARMGymEnv.reward_pick`,
+which reads the simulation on every call, with `compute_reward_batch` on a
+batch of transitions.
+"""
+import argparse
+import time
+
+import numpy as np
+
+import gym
+from gym.envs.robotics.mobile_sia_7f_arm_gym_env import compute_reward_batch
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-transitions', type=int, default=1000000)
+    parser.add_argument('--num-steps', type=int, default=10000)
+    args = parser.parse_args()
+
+    env = gym.make('SIA7FARMPickAndPlace-v1').unwrapped
+    env.reset()
+    action = env.action_space.sample()
+    start = time.time()
+    for _ in range(args.num_steps):
+        env.reward_pick(action, env.goal)
+    per_step = (time.time() - start) / args.num_steps
+    env.close()
+
+    rng = np.random.RandomState(0)
+    grip_pos = rng.uniform(0., 1., size=(args.num_transitions, 3))
+    object_pos = grip_pos + rng.uniform(-0.1, 0.1, size=(args.num_transitions, 3))
+    actions = rng.uniform(-1., 1., size=(args.num_transitions, 4))
+    start = time.time()
+    compute_reward_batch(object_pos, grip_pos, actions)
+    batched = (time.time() - start) / args.num_transitions
+
+    print('reward_pick:          {:10.3f} us/transition'.format(1e6 * per_step))
+    print('compute_reward_batch: {:10.3f} us/transition'.format(1e6 * batched))
+    print('speedup:              {:10.1f}x'.format(per_step / batched))
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""Compares the stepping throughput of `MobileSIA7FARMVecEnv` with the
+`SyncVectorEnv` and `AsyncVectorEnv` backends on SIA7FARMPickAndPlace-v1.
+"""
+import argparse
+import time
+
+import numpy as np
+
+import gym
+from gym.vector import AsyncVectorEnv, SyncVectorEnv
+from gym.envs.robotics import MobileSIA7FARMVecEnv
+
+
+def make_env():
+    return gym.make('SIA7FARMPickAndPlace-v1')
+
+
+def benchmark(env, num_steps):
+    env.seed(0)
+    env.reset()
+    actions = np.random.uniform(-1., 1., size=(env.num_envs,) + env.single_action_space.shape)
+    start = time.time()
+    for _ in range(num_steps):
+        env.step(actions)
+    elapsed = time.time() - start
+    env.close()
+    return num_steps * env.num_envs / elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-envs', type=int, nargs='+', default=[1, 4, 8, 16])
+    parser.add_argument('--num-steps', type=int, default=200)
+    args = parser.parse_args()
+
+    backends = [('sync', SyncVectorEnv), ('async', AsyncVectorEnv),
+                ('batched', MobileSIA7FARMVecEnv)]
+    print('{:>8} {:>10} {:>14}'.format('num_envs', 'backend', 'steps/s'))
+    for num_envs in args.num_envs:
+        for name, cls in backends:
+            env = cls([make_env for _ in range(num_envs)])
+            print('{:>8} {:>10} {:>14.1f}'.format(num_envs, name,
+                  benchmark(env, args.num_steps)))
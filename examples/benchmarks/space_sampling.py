@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+"""Compares drawing `n` samples from a space with `n` calls to `sample` and
+with a single call to `sample_batch`, for n=1 and n=100000, on the spaces
+used by the random-policy baselines and the SIA7F arm environments.
+"""
+import argparse
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from gym.spaces import Box, Dict, Discrete, MultiDiscrete
+
+SPACES = OrderedDict([
+    ('discrete', Discrete(6)),
+    ('multi_discrete', MultiDiscrete([5, 2, 2])),
+    ('box_action', Box(low=-1., high=1., shape=(4,), dtype=np.float32)),
+    ('box_unbounded', Box(low=-np.inf, high=np.inf, shape=(25,), dtype=np.float32)),
+    ('goal_dict', Dict(OrderedDict([
+        ('observation', Box(low=-np.inf, high=np.inf, shape=(25,), dtype=np.float32)),
+        ('achieved_goal', Box(low=-np.inf, high=np.inf, shape=(3,), dtype=np.float32)),
+        ('desired_goal', Box(low=-np.inf, high=np.inf, shape=(3,), dtype=np.float32))
+    ])))
+])
+
+
+def benchmark(space, n, repeat):
+    durations = []
+    for function in (lambda: [space.sample() for _ in range(n)],
+                     lambda: space.sample_batch(n)):
+        start = time.time()
+        for _ in range(repeat):
+            function()
+        durations.append((time.time() - start) / repeat)
+    return durations
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--n', type=int, nargs='+', default=[1, 100000])
+    args = parser.parse_args()
+
+    for n in args.n:
+        repeat = max(1, 100000 // n)
+        for name, space in SPACES.items():
+            loop, batch = benchmark(space, n, repeat)
+            print('n={:6d} {:>14s}: sample {:12.2f} us, sample_batch {:12.2f} us '
+                  '({:6.1f}x)'.format(n, name, 1e6 * loop, 1e6 * batch, loop / batch))
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""Measures the cost of validating actions and observations: `CartPole-v1`
+steps under each mode of `gym.spaces.set_validation`, and `n` calls to
+`contains` against a single call to `contains_batch`.
+"""
+import argparse
+import time
+
+import numpy as np
+
+import gym
+from gym.spaces import Box, set_validation
+
+
+def benchmark_steps(args, mode):
+    set_validation(mode)
+    env = gym.make('CartPole-v1')
+    env.seed(0)
+    env.reset()
+    start = time.time()
+    for i in range(args.num_steps):
+        _, _, done, _ = env.step(i % 2)
+        if done:
+            env.reset()
+    duration = time.time() - start
+    env.close()
+    set_validation('full')
+    return 1e6 * duration / args.num_steps
+
+
+def benchmark_batch(args):
+    space = Box(low=-1., high=1., shape=(25,), dtype=np.float32)
+    batch = space.sample_batch(args.batch_size)
+    start = time.time()
+    [space.contains(x) for x in batch]
+    loop = time.time() - start
+    start = time.time()
+    space.contains_batch(batch)
+    return 1e6 * loop, 1e6 * (time.time() - start)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-steps', type=int, default=100000)
+    parser.add_argument('--batch-size', type=int, default=100000)
+    args = parser.parse_args()
+
+    for mode in ('full', 'sample', 'off'):
+        print('CartPole-v1 step, validation {:>6s}: {:6.2f} us'.format(mode,
+            benchmark_steps(args, mode)))
+    loop, batch = benchmark_batch(args)
+    print('{} samples: contains {:10.1f} us, contains_batch {:10.1f} us'.format(
+        args.batch_size, loop, batch))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""Compares the throughput of the 'sync', 'async' and 'thread' backends of
+`gym.vector.make`, on an environment stepping with a matrix product (`matmul`,
+which releases the GIL) and on registered environments of the repository,
+whose simulators hold the GIL. The environments whose dependencies are not
+installed are skipped.
+"""
+import argparse
+import time
+
+import numpy as np
+
+import gym
+from gym import error, spaces
+from gym.vector import AsyncVectorEnv, SyncVectorEnv, ThreadedVectorEnv
+
+BACKENDS = {
+    'sync': SyncVectorEnv,
+    'async': AsyncVectorEnv,
+    'thread': ThreadedVectorEnv
+}
+
+
+class MatmulEnv(gym.Env):
+    """Environment whose step is a product of `size x size` matrices."""
+    def __init__(self, size=256):
+        self.observation_space = spaces.Box(low=-np.inf, high=np.inf,
+            shape=(4,), dtype=np.float64)
+        self.action_space = spaces.Box(low=-1., high=1., shape=(4,), dtype=np.float64)
+        self._matrix = np.random.rand(size, size) / size
+        self._state = np.copy(self._matrix)
+
+    def reset(self):
+        self._state[:] = self._matrix
+        return self._state[0, :4].copy()
+
+    def step(self, action):
+        np.dot(self._matrix, self._state, out=self._state)
+        self._state[0, :4] += action
+        return self._state[0, :4].copy(), 0., False, {}
+
+
+def benchmark(args, env_id, backend):
+    if env_id == 'matmul':
+        env_fns = [lambda: MatmulEnv(args.size) for _ in range(args.num_envs)]
+    else:
+        env_fns = [lambda: gym.make(env_id) for _ in range(args.num_envs)]
+    env = BACKENDS[backend](env_fns)
+    env.seed(0)
+    env.reset()
+    actions = [env.action_space.sample() for _ in range(16)]
+    start = time.time()
+    for i in range(args.num_steps):
+        env.step(actions[i % len(actions)])
+    duration = time.time() - start
+    env.close()
+    return args.num_steps * args.num_envs / duration
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--env-ids', nargs='+', default=['matmul', 'CartPole-v1',
+                        'HalfCheetah-v3', 'SIA7FARMPickAndPlace-v1'])
+    parser.add_argument('--num-envs', type=int, default=8)
+    parser.add_argument('--num-steps', type=int, default=500)
+    parser.add_argument('--size', type=int, default=256,
+                        help='Size of the matrices of the `matmul` environment.')
+    parser.add_argument('--backends', nargs='+', default=sorted(BACKENDS),
+                        choices=sorted(BACKENDS))
+    args = parser.parse_args()
+
+    for env_id in args.env_ids:
+        if env_id != 'matmul':
+            try:
+                gym.make(env_id).close()
+            except error.DependencyNotInstalled as e:
+                print('{}: skipped ({})'.format(env_id, e))
+                continue
+        for backend in args.backends:
+            print('{:>24s} {:>6s}: {:10.1f} steps/s'.format(env_id, backend,
+                benchmark(args, env_id, backend)))
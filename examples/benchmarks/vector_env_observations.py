@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""Measures the step rate of `SyncVectorEnv` and `AsyncVectorEnv` with image
+observations, when the observations are returned as copies (`copy=True`) and
+as read-only views of rotating batches (`observation_buffers`).
+"""
+import argparse
+import time
+
+import numpy as np
+
+import gym
+from gym import spaces
+from gym.vector import AsyncVectorEnv, SyncVectorEnv
+
+
+class ImageEnv(gym.Env):
+    def __init__(self, shape):
+        self.observation_space = spaces.Box(low=0, high=255, shape=shape, dtype=np.uint8)
+        self.action_space = spaces.Discrete(4)
+        self._observation = np.zeros(shape, dtype=np.uint8)
+
+    def reset(self):
+        return self._observation
+
+    def step(self, action):
+        return self._observation, 0., False, {}
+
+
+def benchmark(args, vector_env_cls, **kwargs):
+    shape = tuple(args.shape)
+    env = vector_env_cls([lambda: ImageEnv(shape) for _ in range(args.num_envs)], **kwargs)
+    env.reset()
+    actions = np.zeros(args.num_envs, dtype=np.int64)
+    start = time.time()
+    for _ in range(args.num_steps):
+        env.step(actions)
+    elapsed = time.time() - start
+    env.close()
+    return args.num_steps / elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-envs', type=int, default=8)
+    parser.add_argument('--num-steps', type=int, default=1000)
+    parser.add_argument('--shape', type=int, nargs='+', default=[210, 160, 3])
+    parser.add_argument('--observation-buffers', type=int, default=2)
+    args = parser.parse_args()
+
+    for vector_env_cls in (SyncVectorEnv, AsyncVectorEnv):
+        for name, kwargs in [('copy', {'copy': True}),
+                             ('observation_buffers={}'.format(args.observation_buffers),
+                              {'observation_buffers': args.observation_buffers})]:
+            print('{:>14s} {:>22s}: {:8.1f} batch steps/s'.format(vector_env_cls.__name__,
+                name, benchmark(args, vector_env_cls, **kwargs)))
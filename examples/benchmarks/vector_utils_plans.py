@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""Microbenchmarks of `concatenate` and `write_to_shared_memory` against their
+compiled versions `ConcatenatePlan` and `SharedMemoryWritePlan`, on a flat Box
+space, on the goal Dict of the `RobotEnv` environments, and on a nested Dict.
+"""
+import argparse
+import timeit
+from collections import OrderedDict
+
+import numpy as np
+
+from gym.spaces import Box, Dict, Discrete, Tuple
+from gym.vector.utils import (concatenate, ConcatenatePlan, create_empty_array,
+                              create_shared_memory, write_to_shared_memory,
+                              SharedMemoryWritePlan)
+
+
+def _box(*shape):
+    return Box(low=-np.inf, high=np.inf, shape=shape, dtype=np.float32)
+
+SPACES = OrderedDict([
+    ('box', _box(25)),
+    ('goal_dict', Dict(OrderedDict([
+        ('observation', _box(25)),
+        ('achieved_goal', _box(3)),
+        ('desired_goal', _box(3))
+    ]))),
+    ('nested_dict', Dict(OrderedDict([
+        ('robot', Dict(OrderedDict([
+            ('position', _box(7)),
+            ('velocity', _box(7)),
+            ('gripper', Tuple((_box(2), Discrete(2))))
+        ]))),
+        ('object', Dict(OrderedDict([('position', _box(3)), ('rotation', _box(4))]))),
+        ('achieved_goal', _box(3)),
+        ('desired_goal', _box(3))
+    ])))
+])
+
+
+def benchmark(args, space):
+    items = [space.sample() for _ in range(args.num_envs)]
+    out = create_empty_array(space, n=args.num_envs)
+    plan = ConcatenatePlan(space)
+    shared_memory = create_shared_memory(space, n=args.num_envs)
+    write = SharedMemoryWritePlan(shared_memory, space)
+
+    def write_all():
+        for index, item in enumerate(items):
+            write_to_shared_memory(index, item, shared_memory, space)
+
+    def write_all_plan():
+        for index, item in enumerate(items):
+            write(index, item)
+
+    functions = [
+        ('concatenate', lambda: concatenate(items, out, space)),
+        ('ConcatenatePlan', lambda: plan(items, out)),
+        ('write_to_shared_memory', write_all),
+        ('SharedMemoryWritePlan', write_all_plan)
+    ]
+    return [(name, 1e6 * min(timeit.repeat(function, number=args.number,
+        repeat=args.repeat)) / args.number) for (name, function) in functions]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-envs', type=int, default=8)
+    parser.add_argument('--number', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for space_name, space in SPACES.items():
+        for name, duration in benchmark(args, space):
+            print('{:>12s} {:>23s}: {:8.2f} us'.format(space_name, name, duration))
@@ -1,4 +1,3 @@
-import distutils.version
 import os
 import sys
 import warnings
@@ -10,6 +9,16 @@ from gym.core import Env, GoalEnv, Wrapper, ObservationWrapper, ActionWrapper, R
 from gym.spaces import Space
 from gym.envs import make, spec, register
 from gym import logger
-from gym import vector
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        # `gym.vector` imports multiprocessing, so it is only loaded the first
+        # time it is accessed
+        if name == 'vector':
+            import gym.vector
+            return gym.vector
+        raise AttributeError("module 'gym' has no attribute '{}'".format(name))
+else:
+    from gym import vector
 
 __all__ = ["Env", "Space", "Wrapper", "make", "spec", "register"]
@@ -15,6 +15,32 @@ except ImportError as e:
 
 DEFAULT_SIZE = 500
 
+# Compiled models (as MJB buffers) by absolute path, with the modification
+# time of the file they have been parsed from
+_MODEL_CACHE = {}
+
+
+def load_model(fullpath):
+    """Loads the model at `fullpath`, parsing its XML file (and the meshes it
+    references) only once per process. The compiled model is cached by
+    absolute path and modification time, and every call returns a new `MjModel`
+    built from it, since environments write to their own model (to move the
+    target sites, for example). Changes to the files included by the model are
+    not tracked; call `clear_model_cache` after editing them.
+    """
+    fullpath = os.path.abspath(fullpath)
+    mtime = os.path.getmtime(fullpath)
+    cached = _MODEL_CACHE.get(fullpath)
+    if cached is not None and cached[0] == mtime:
+        return mujoco_py.load_model_from_mjb(cached[1])
+    model = mujoco_py.load_model_from_path(fullpath)
+    _MODEL_CACHE[fullpath] = (mtime, model.get_mjb())
+    return model
+
+
+def clear_model_cache():
+    _MODEL_CACHE.clear()
+
 
 def convert_observation_to_space(observation):
     if isinstance(observation, dict):
@@ -44,7 +70,7 @@ class MujocoEnv(gym.Env):
         if not path.exists(fullpath):
             raise IOError("File %s does not exist" % fullpath)
         self.frame_skip = frame_skip
-        self.model = mujoco_py.load_model_from_path(fullpath)
+        self.model = load_model(fullpath)
         self.sim = mujoco_py.MjSim(self.model)
         self.data = self.sim.data
         self.viewer = None
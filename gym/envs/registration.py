@@ -40,6 +40,8 @@ class EnvSpec(object):
         self.nondeterministic = nondeterministic
         self.max_episode_steps = max_episode_steps
         self._kwargs = {} if kwargs is None else kwargs
+        # The entry point loaded by the last call to `make`, with its name
+        self._entry_point_cache = (None, None)
 
         match = env_id_re.search(id)
         if not match:
@@ -55,7 +57,10 @@ class EnvSpec(object):
         if callable(self.entry_point):
             env = self.entry_point(**_kwargs)
         else:
-            cls = load(self.entry_point)
+            name, cls = self._entry_point_cache
+            if name != self.entry_point:
+                cls = load(self.entry_point)
+                self._entry_point_cache = (self.entry_point, cls)
             env = cls(**_kwargs)
 
         # Make the enviroment aware of which spec it came from.
@@ -77,6 +82,9 @@ class EnvRegistry(object):
 
     def __init__(self):
         self.env_specs = {}
+        # Maps the name of an env (without its version) to its registered ids,
+        # so that a failed lookup does not have to scan every spec
+        self._env_versions = {}
 
     def make(self, path, **kwargs):
         if len(kwargs) > 0:
@@ -120,8 +128,9 @@ class EnvRegistry(object):
             # Parse the env name and check to see if it matches the non-version
             # part of a valid env (could also check the exact number here)
             env_name = match.group(1)
-            matching_envs = [valid_env_name for valid_env_name, valid_env_spec in self.env_specs.items()
-                             if env_name == valid_env_spec._env_name]
+            # Ids removed from `env_specs` directly are no longer valid versions
+            matching_envs = [valid_env_name for valid_env_name in self._env_versions.get(env_name, [])
+                             if valid_env_name in self.env_specs]
             if matching_envs:
                 raise error.DeprecatedEnv('Env {} not found (valid versions include {})'.format(id, matching_envs))
             else:
@@ -130,7 +139,11 @@ class EnvRegistry(object):
     def register(self, id, **kwargs):
         if id in self.env_specs:
             raise error.Error('Cannot re-register id: {}'.format(id))
-        self.env_specs[id] = EnvSpec(id, **kwargs)
+        spec = EnvSpec(id, **kwargs)
+        self.env_specs[id] = spec
+        versions = self._env_versions.setdefault(spec._env_name, [])
+        if id not in versions:
+            versions.append(id)
 
 # Have a global registry
 registry = EnvRegistry()
@@ -16,6 +16,7 @@ from gym.envs.robotics.hand.manipulate_touch_sensors import HandPenTouchSensorsE
 # Husky
 from gym.envs.robotics.mobile_sia_7f_arm_gym_env import MobileSIA7FARMGymEnv
 from gym.envs.robotics.sia_7f_arm.sia_pick_and_place import SIA7FARMPickAndPlaceEnv
+from gym.envs.robotics.mobile_sia_7f_arm_vec_env import MobileSIA7FARMVecEnv
 
 # ROS Interface
 # from gym.envs.robotics.ros_interface.husky_ur_ros import HuskyUR5ROS
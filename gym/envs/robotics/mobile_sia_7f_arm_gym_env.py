@@ -2,6 +2,8 @@ import numpy as np
 
 from gym.envs.robotics import robot_gym_env, utils_sia
 from gym.envs.robotics import rotations, utils
+from gym.envs.robotics.reset_state_cache import ResetStateCache
+from gym.utils import seeding
 
 
 
@@ -10,6 +12,42 @@ def goal_distance(goal_a, goal_b):
     return np.linalg.norm(goal_a - goal_b, axis=-1)
 
 
+def compute_reward_batch(object_pos, grip_pos, action):
+    """Computes the reach and pick reward of `MobileSIA7FARMGymEnv` for a
+    batch of transitions. This function does not depend on the simulation,
+    so it can be used to recompute rewards offline (e.g. for hindsight
+    relabeling).
+
+    Args:
+        object_pos (array of shape (..., 3)): position of the object
+        grip_pos (array of shape (..., 3)): position of the gripper site
+        action (array of shape (..., n_actions)): the (clipped) actions
+    Returns:
+        reward (array of shape (...)): the rewards
+        is_success (array of shape (...)): whether the object is lifted, as int
+        gripper_close (array of shape (...)): whether the gripper should close
+            on the next step, i.e. whether it is close enough to the object
+    """
+    object_pos = np.asarray(object_pos, dtype=np.float64)
+    grip_pos = np.asarray(grip_pos, dtype=np.float64)
+    action = np.asarray(action, dtype=np.float64)
+    object_height = object_pos[..., 2]
+
+    reward_ctrl = -np.square(action).sum(axis=-1)
+    dist_object = np.linalg.norm(object_pos - grip_pos, axis=-1)
+
+    # stage 1: approaching and grasping/lifting
+    gripper_close = dist_object < 0.05
+    grasped = gripper_close & (object_height > 0.75)  # table hight + object hight + lift distance
+    is_success = grasped & (object_height > 0.8)
+    reward_grasping = 10.0 * grasped + 100.0 * is_success
+
+    reward = 0.01 * reward_ctrl - dist_object + reward_grasping
+    # penalize dropping the object off the table
+    reward = reward - 10.0 * (object_height < 0.1)
+    return reward, is_success.astype(np.int64), gripper_close
+
+
 class MobileSIA7FARMGymEnv(robot_gym_env.RobotGymEnv):
     """Superclass for environments.
     """
@@ -18,7 +56,8 @@ class MobileSIA7FARMGymEnv(robot_gym_env.RobotGymEnv):
         self, model_path, n_substeps, gripper_extra_height, block_gripper,
         has_object, target_in_the_air, target_offset, obj_range, target_range,
         distance_threshold, initial_qpos, reward_type, n_actions,
-        use_real_robot, debug_print
+        use_real_robot, debug_print, reset_cache_size=0, reset_cache_refill='never',
+        ros_asynchronous=False, ros_interface=None
     ):
         """Initializes a new environment.
         Args:
@@ -35,6 +74,13 @@ class MobileSIA7FARMGymEnv(robot_gym_env.RobotGymEnv):
             initial_qpos (dict): a dictionary of joint names and values that define the initial configuration
             reward_type ('sparse' or 'dense'): the reward type, i.e. sparse or dense
             n_actions : the number of actuator
+            reset_cache_size (int): number of settled initial states kept in a `ResetStateCache`;
+                if 0, the simulation is settled on every reset
+            reset_cache_refill ('never' or 'background'): the refill policy of the reset cache
+            ros_asynchronous (boolean): whether the ROS interface of the real robot sends the
+                arm motions in the background and reads the end effector pose from a topic
+            ros_interface (object): object with the interface of `SIA7FARMROS` used instead of
+                connecting to the real robot, e.g. a `SimulatedSIA7FARMROS`
         """
         self.gripper_extra_height = gripper_extra_height
         self.block_gripper = block_gripper
@@ -76,16 +122,46 @@ class MobileSIA7FARMGymEnv(robot_gym_env.RobotGymEnv):
 
         self._is_success = 0
 
+        self.reset_cache_size = reset_cache_size
+        self.reset_cache_refill = reset_cache_refill
+        self._reset_cache = None
+
         self._use_real_robot = use_real_robot
-        if self._use_real_robot:
+        if self._use_real_robot and ros_interface is not None:
+            self.sia_7f_arm_robot = ros_interface
+        elif self._use_real_robot:
             # import rospy
             from gym.envs.robotics.ros_interface import sia_7f_arm_ros
-            self.sia_7f_arm_robot = sia_7f_arm_ros.SIA7FARMROS(debug_print=debug_print)
+            self.sia_7f_arm_robot = sia_7f_arm_ros.SIA7FARMROS(
+                debug_print=debug_print, asynchronous=ros_asynchronous)
 
         super(MobileSIA7FARMGymEnv, self).__init__(
             model_path=model_path, n_substeps=n_substeps, n_actions=self.n_actions,
             initial_qpos=initial_qpos)
 
+    # Env methods
+    # ----------------------------
+
+    def seed(self, seed=None):
+        seeds = super(MobileSIA7FARMGymEnv, self).seed(seed)
+        if self._reset_cache is not None:
+            self._reset_cache.seed(seeding.hash_seed(seeds[0]))
+        return seeds
+
+    def close(self):
+        if self._reset_cache is not None:
+            self._reset_cache.close()
+        if self._use_real_robot:
+            self.sia_7f_arm_robot.close()
+        super(MobileSIA7FARMGymEnv, self).close()
+
+    def get_real_robot_latency_stats(self):
+        """Returns the latency statistics of the calls to the ROS services of
+        the real robot (see `SIA7FARMROS.get_latency_stats`).
+        """
+        assert self._use_real_robot
+        return self.sia_7f_arm_robot.get_latency_stats()
+
     # GoalEnv methods
     # ----------------------------
     
@@ -104,54 +180,16 @@ class MobileSIA7FARMGymEnv(robot_gym_env.RobotGymEnv):
         if self.debug_print:
             print("self.sim.data.get_site_xpos('grip_pos'): ", grip_pos)
 
-        grip_obj_pos = object_pos - grip_pos
-        obj_target_pos = goal - object_pos
-
-        reward_ctrl = 0
-        reward_dist_object = 0
-        reward_grasping = 0
-        reward_dist_target = 0
-        reward_target = 0
-        reward = 0
-        self._is_success = 0
-
-        reward_ctrl = -np.square(action).sum()
+        reward, is_success, gripper_close = compute_reward_batch(object_pos, grip_pos, action)
+        reward = float(reward)
+        self._is_success = int(is_success)
+        self.gripper_close = bool(gripper_close)
 
-        reward_dist_object = -np.linalg.norm(grip_obj_pos)
-        if self.debug_print:
-            print("distance between gripper and object: ", reward_dist_object)
-        reward_dist_target = -np.linalg.norm(obj_target_pos)
-
-        self.gripper_close = False
-        if np.linalg.norm(grip_obj_pos) < 0.1:
-            # reward_grasping += 0.5
-            if np.linalg.norm(grip_obj_pos) < 0.05:
-                # reward_grasping += 1.0
-                self.gripper_close = True
-                # stage 1: approaching and grasping/lifting
-                if object_pos[2] > 0.75: # table hight + object hight + lift distance
-                    # grasping success
-                    reward_grasping += 10.0
-                    if object_pos[2] > 0.8:
-                        reward_grasping += 100.0
-                        self._is_success = 1
-                        # if object_pos[2] > 0.5:
-                            # reward_grasping += 10.0
-        reward = 0.01 * reward_ctrl + reward_dist_object + reward_grasping
-            
-        # reward = 0.05 * reward_ctrl + reward_dist_object + reward_grasping + 10 * reward_dist_target + reward_target
         if self.debug_print:
             print("object_pose: ", object_pos)
-            print("reward_dist_object: ", reward_dist_object)
-            print("reward_ctrl: ", 0.05 * reward_ctrl)
-            print("reward_grasping: ", reward_grasping)
-            # print("reward_dist_target: ", reward_dist_target)
-            # print("reward_target: ", reward_target)
+            print("distance between gripper and object: ", np.linalg.norm(object_pos - grip_pos))
             print("total reward: ", reward)
         done = False
-        if object_pos[2] < 0.1:
-            # done = True
-            reward -= 10
         info = {
             'is_success': self._is_success,
         }
@@ -166,6 +204,14 @@ class MobileSIA7FARMGymEnv(robot_gym_env.RobotGymEnv):
             # self.sim.data.set_joint_qpos('robot0:r_gripper_finger_joint', 0.)
             self.sim.forward()
 
+    def _get_extra_state(self):
+        return (float(self.gripper_close), float(self._is_success))
+
+    def _set_extra_state(self, extra_state):
+        gripper_close, is_success = extra_state
+        self.gripper_close = bool(gripper_close)
+        self._is_success = int(is_success)
+
     def _set_action(self, action):
         # For real robot
         if self._use_real_robot:
@@ -190,10 +236,9 @@ class MobileSIA7FARMGymEnv(robot_gym_env.RobotGymEnv):
             # action = np.concatenate([pos_ctrl, rot_ctrl, base_ctrl, gripper_ctrl])
             action = np.concatenate([pos_ctrl, rot_ctrl, gripper_ctrl])
 
-            ee_pose = self.sia_7f_arm_robot.arm_get_ee_pose()
-
             arm_action = pos_ctrl
-            print("arm_action: ", arm_action)
+            if self.debug_print:
+                print("arm_action: ", arm_action)
 
             # Applay action to real robot
             self.sia_7f_arm_robot.arm_set_ee_pose_relative(arm_action)
@@ -227,7 +272,7 @@ class MobileSIA7FARMGymEnv(robot_gym_env.RobotGymEnv):
             utils.ctrl_set_action(self.sim, action) # base control + gripper control
             utils.mocap_set_action(self.sim, action) # arm control in cartesion (x, y, z)
 
-    def _get_obs(self):
+    def _get_obs(self, obs_out=None):
         # For real robot
         if self._use_real_robot:
             joint_angles = []
@@ -235,12 +280,15 @@ class MobileSIA7FARMGymEnv(robot_gym_env.RobotGymEnv):
             ee_position = []
             ee_orientation = []
 
-            joint_names_dict = self.sia_7f_arm_robot.arm_get_joint_angles()
-            joint_velocity_dict = self.sia_7f_arm_robot.arm_get_joint_velocity()
+            # Latest joint states, end effector pose and object position,
+            # read at once so that they are consistent with each other
+            snapshot = self.sia_7f_arm_robot.get_state_snapshot()
+            joint_names_dict = snapshot['joint_angles']
+            joint_velocity_dict = snapshot['joint_velocities']
             for i in self.arm_joint_names:
                 joint_angles.append(joint_names_dict[i])
                 joint_velocity.append(joint_velocity_dict[i])
-            ee_pose = self.sia_7f_arm_robot.arm_get_ee_pose()
+            ee_pose = snapshot['ee_pose']
             ee_position = [ee_pose.pose.position.x, 
                            ee_pose.pose.position.y,
                            ee_pose.pose.position.z]
@@ -250,8 +298,7 @@ class MobileSIA7FARMGymEnv(robot_gym_env.RobotGymEnv):
                               ee_pose.pose.orientation.z,]
 
             grip_pos = np.array(ee_position)
-            # TODO use the real object pose
-            object_pos = np.array(self.sia_7f_arm_robot.get_object_position())
+            object_pos = np.array(snapshot['target_position'])
             object_rel_pos = object_pos - grip_pos
             sia_qpos = np.array(joint_angles)
             sia_qvel = np.array(joint_velocity)
@@ -271,60 +318,54 @@ class MobileSIA7FARMGymEnv(robot_gym_env.RobotGymEnv):
             ])
             if self.debug_print:
                 print("observation: ", obs)
+            if obs_out is not None:
+                obs_out[:] = obs
+                return obs_out
             return obs
         # For simulation
         else:
-            # positions
-            grip_pos = self.sim.data.get_site_xpos('r_grip_site')
-            dt = self.sim.nsubsteps * self.sim.model.opt.timestep
-            grip_velp = self.sim.data.get_site_xvelp('r_grip_site') * dt
-            robot_qpos, robot_qvel = utils.robot_get_obs(self.sim)
-            sia_qpos, sia_qvel = utils_sia.robot_get_sia_joint_state_obs(self.sim)
+            # The observation is assembled in place, using the addresses resolved
+            # in `_env_setup`, either in `obs_out` or in a buffer allocated once.
+            obs = self._obs_buffer if obs_out is None else obs_out
+            site_xpos = self.sim.data.site_xpos
+            obs[self._obs_grip_pos] = site_xpos[self._grip_site_id]
             if self.has_object:
-                object_pos = self.sim.data.get_site_xpos('object0')
-                # rotations
-                object_rot = rotations.mat2euler(self.sim.data.get_site_xmat('object0'))
-                # velocities
-                object_velp = self.sim.data.get_site_xvelp('object0') * dt
-                object_velr = self.sim.data.get_site_xvelr('object0') * dt
-                # gripper state
-                object_rel_pos = object_pos - grip_pos
-                object_velp -= grip_velp
-            else:
-                object_pos = object_rot = object_velp = object_velr = object_rel_pos = np.zeros(0)
-            # gripper_state = robot_qpos[-2:]
-            # gripper_state = robot_qpos[-13:-1]
-            # gripper_vel = robot_qvel[-2:] * dt  # change to a scalar if the gripper is made symmetric
-
-            if not self.has_object:
-                achieved_goal = grip_pos.copy()
-            else:
-                achieved_goal = np.squeeze(object_pos.copy())
+                obs[self._obs_object_pos] = site_xpos[self._object_site_id]
+                np.subtract(obs[self._obs_object_pos], obs[self._obs_grip_pos],
+                            out=obs[self._obs_object_rel_pos])
+            np.take(self.sim.data.qpos, self._sia_qpos_addrs, out=obs[self._obs_sia_qpos])
+            np.take(self.sim.data.qvel, self._sia_qvel_addrs, out=obs[self._obs_sia_qvel])
+            obs[-1] = self._is_success
             if self.debug_print:
-                print("grip_pos: ", grip_pos)
-                print("object_pos: ", object_pos)
-                print("object_pos.ravel: ", object_pos.ravel())
-                print("object_rel_pos.ravel: ", object_rel_pos.ravel())
-                print("object_rel_pos: ", object_rel_pos)
-                print("sia_qpos: ", sia_qpos)
-                print("sia_qvel: ", sia_qvel)
-            obs = np.concatenate([
-                grip_pos, 
-                object_pos.ravel(), 
-                object_rel_pos.ravel(), 
-                sia_qpos,
-                sia_qvel,
-                #gripper_state, 
-                #object_rot.ravel(),
-                #object_velp.ravel(), 
-                #object_velr.ravel(), 
-                #grip_velp, 
-                #gripper_vel,
-                [self._is_success],
-            ])
-
-            return obs
-
+                print("grip_pos: ", obs[self._obs_grip_pos])
+                print("object_pos: ", obs[self._obs_object_pos])
+                print("object_rel_pos: ", obs[self._obs_object_rel_pos])
+                print("sia_qpos: ", obs[self._obs_sia_qpos])
+                print("sia_qvel: ", obs[self._obs_sia_qvel])
+
+            if obs_out is not None:
+                return obs_out
+            return obs.copy()
+
+    def _setup_obs_layout(self):
+        """Resolves the site ids and joint addresses used by `_get_obs` and
+        preallocates the observation buffer. The layout is
+        [grip_pos, object_pos, object_rel_pos, sia_qpos, sia_qvel, is_success],
+        where the object entries are empty if the environment has no object.
+        """
+        self._grip_site_id = self.sim.model.site_name2id('r_grip_site')
+        if self.has_object:
+            self._object_site_id = self.sim.model.site_name2id('object0')
+        self._sia_qpos_addrs, self._sia_qvel_addrs = utils_sia.robot_get_sia_joint_addrs(self.sim)
+
+        object_dim = 3 if self.has_object else 0
+        sizes = [3, object_dim, object_dim,
+                 len(self._sia_qpos_addrs), len(self._sia_qvel_addrs), 1]
+        offsets = np.cumsum([0] + sizes)
+        (self._obs_grip_pos, self._obs_object_pos, self._obs_object_rel_pos,
+         self._obs_sia_qpos, self._obs_sia_qvel, _) = [
+            slice(start, stop) for start, stop in zip(offsets[:-1], offsets[1:])]
+        self._obs_buffer = np.zeros(offsets[-1], dtype=np.float64)
 
     def _viewer_setup(self):
         body_id = self.sim.model.body_name2id('r_gripper_palm_link')
@@ -343,17 +384,27 @@ class MobileSIA7FARMGymEnv(robot_gym_env.RobotGymEnv):
         self.sim.forward()
 
     def _reset_sim(self):
-        self.sim.set_state(self.initial_state)
+        if self._reset_cache is not None:
+            self._reset_cache.reset(self.sim, self.np_random)
+        else:
+            self._settle_reset_state(self.sim, self.np_random)
+        return True
+
+    def _settle_reset_state(self, sim, np_random):
+        """Restores the initial state of `sim`, randomizes the object and the
+        gripper target with draws from `np_random`, and lets the arm settle.
+        """
+        sim.set_state(self.initial_state)
 
         # Randomize start position of object.
         if self.has_object:
             object_xpos = self.initial_gripper_xpos[:2]
             while np.linalg.norm(object_xpos - self.initial_gripper_xpos[:2]) < 0.1:
-                object_xpos = self.initial_gripper_xpos[:2] + self.np_random.uniform(-self.obj_range, self.obj_range, size=2)
+                object_xpos = self.initial_gripper_xpos[:2] + np_random.uniform(-self.obj_range, self.obj_range, size=2)
 
-            object_xpos = np.array([1.0, -0.5])  + self.np_random.uniform(-0.02, 0.07, size=2)
-            object_qpos = self.sim.data.get_joint_qpos('object0:joint')
-            # object_qpos1 = self.sim.data.get_joint_qpos('object1:joint')
+            object_xpos = np.array([1.0, -0.5])  + np_random.uniform(-0.02, 0.07, size=2)
+            object_qpos = sim.data.get_joint_qpos('object0:joint')
+            # object_qpos1 = sim.data.get_joint_qpos('object1:joint')
             assert object_qpos.shape == (7,)
             if self.debug_print:
                 print("object_xpos0: ", object_xpos)
@@ -364,26 +415,26 @@ class MobileSIA7FARMGymEnv(robot_gym_env.RobotGymEnv):
             # object_qpos[1] -= 0.1
             if self.debug_print:
                 print("set_joint_qpos object_qpos: ", object_qpos)
-            self.sim.data.set_joint_qpos('object0:joint', object_qpos)
-            # print("get_body_xquat: ", self.sim.data.get_body_xquat('r_gripper_palm_link'))
+            sim.data.set_joint_qpos('object0:joint', object_qpos)
+            # print("get_body_xquat: ", sim.data.get_body_xquat('r_gripper_palm_link'))
 
         # set random gripper position
         # for i in range(3):
-        #     gripper_target[i] += self.np_random.uniform(-0.2, 0.2)
+        #     gripper_target[i] += np_random.uniform(-0.2, 0.2)
         # print("gripper target random: ", gripper_target)
  
 
-        #gripper_control = self.np_random.uniform(-1.0, 1.0)
+        #gripper_control = np_random.uniform(-1.0, 1.0)
         #gripper_control = self.gripper_format_action(gripper_control)
 
         gripper_target = np.array([0.80326763, 0.01372008, 0.7910795])
         gripper_rotation = np.array([0.5, 0.5, -0.5, -0.5]) #(0, 0, -90)
         # for i in range(3):
-        gripper_target[0] += self.np_random.uniform(-0.0, 0.1) # x
-        gripper_target[1] += self.np_random.uniform(-0.1, 0.1) # y
-        gripper_target[2] += self.np_random.uniform(-0.1, 0.1) # z
-        self.sim.data.set_mocap_pos('gripper_r:mocap', gripper_target)
-        self.sim.data.set_mocap_quat('gripper_r:mocap', gripper_rotation)
+        gripper_target[0] += np_random.uniform(-0.0, 0.1) # x
+        gripper_target[1] += np_random.uniform(-0.1, 0.1) # y
+        gripper_target[2] += np_random.uniform(-0.1, 0.1) # z
+        sim.data.set_mocap_pos('gripper_r:mocap', gripper_target)
+        sim.data.set_mocap_quat('gripper_r:mocap', gripper_rotation)
 
         #action = np.concatenate([gripper_target, gripper_rotation, gripper_control])
         # Apply action to simulation.
@@ -391,10 +442,9 @@ class MobileSIA7FARMGymEnv(robot_gym_env.RobotGymEnv):
         # utils.mocap_set_action(self.sim, action) # arm control in cartesion (x, y, z)
 
         for _ in range(10):
-            self.sim.step()
+            sim.step()
 
-        self.sim.forward()
-        return True
+        sim.forward()
 
     def _sample_goal(self):
         if self.has_object:
@@ -412,6 +462,7 @@ class MobileSIA7FARMGymEnv(robot_gym_env.RobotGymEnv):
         return (d < self.distance_threshold).astype(np.float32)
 
     def _env_setup(self, initial_qpos):
+        self._setup_obs_layout()
         for name, value in initial_qpos.items():
             self.sim.data.set_joint_qpos(name, value)
         utils.reset_mocap_welds(self.sim)
@@ -458,6 +509,10 @@ class MobileSIA7FARMGymEnv(robot_gym_env.RobotGymEnv):
         if self.has_object:
             self.height_offset = self.sim.data.get_site_xpos('object0')[2]
 
+        if self.reset_cache_size > 0:
+            self._reset_cache = ResetStateCache(self.sim, self._settle_reset_state,
+                size=self.reset_cache_size, refill=self.reset_cache_refill)
+
     def render(self, mode='human', width=500, height=500):
         return super(MobileSIA7FARMGymEnv, self).render(mode, width, height)
 
@@ -0,0 +1,156 @@
+import numpy as np
+
+from gym import error
+from gym.vector.vector_env import VectorEnv
+from gym.envs.robotics import utils
+from gym.envs.robotics.mobile_sia_7f_arm_gym_env import MobileSIA7FARMGymEnv, compute_reward_batch
+
+try:
+    import mujoco_py
+except ImportError as e:
+    raise error.DependencyNotInstalled("{}. (HINT: you need to install mujoco_py, and also perform the setup instructions here: https://github.com/openai/mujoco-py/.)".format(e))
+
+__all__ = ['MobileSIA7FARMVecEnv']
+
+
+class MobileSIA7FARMVecEnv(VectorEnv):
+    """Vectorized version of `MobileSIA7FARMGymEnv` that runs all the
+    simulations in a single process. The actions of the whole batch are
+    converted to controls with array operations, and the simulations are
+    stepped together with a `mujoco_py.MjSimPool`, which runs `mj_step` on
+    OpenMP threads without holding the GIL.
+
+    Parameters
+    ----------
+    env_fns : iterable of callable
+        Functions that create the environments. All the environments must be
+        instances of `MobileSIA7FARMGymEnv` (possibly wrapped) built from the
+        same model, with an object and without the real robot.
+
+    max_episode_steps : int, optional
+        Number of steps after which an episode is ended and its environment
+        is reset. If `None`, the value from the spec of the first environment
+        is taken (if any).
+
+    copy : bool (default: `True`)
+        If `True`, then the `reset` and `step` methods return a copy of the
+        observations.
+    """
+    def __init__(self, env_fns, max_episode_steps=None, copy=True):
+        self.env_fns = env_fns
+        self.envs = [env_fn().unwrapped for env_fn in env_fns]
+        self.copy = copy
+        for env in self.envs:
+            if not isinstance(env, MobileSIA7FARMGymEnv):
+                raise error.Error('`MobileSIA7FARMVecEnv` only supports '
+                    '`MobileSIA7FARMGymEnv` environments, got `{0}`.'.format(
+                    type(env).__name__))
+            if env._use_real_robot or not env.has_object:
+                raise error.Error('`MobileSIA7FARMVecEnv` requires simulated '
+                    'environments with an object.')
+
+        env = self.envs[0]
+        super(MobileSIA7FARMVecEnv, self).__init__(num_envs=len(self.envs),
+            observation_space=env.observation_space, action_space=env.action_space)
+        self._check_observation_spaces()
+
+        if max_episode_steps is None and env.spec is not None:
+            max_episode_steps = env.spec.max_episode_steps
+        self.max_episode_steps = max_episode_steps
+
+        self._pool = mujoco_py.MjSimPool([env.sim for env in self.envs],
+            nsubsteps=env.sim.nsubsteps)
+
+        # Control vector [pos_ctrl, rot_ctrl, gripper_ctrl] of every env, as
+        # built by `MobileSIA7FARMGymEnv._set_action`.
+        self._ctrl = np.zeros((self.num_envs, 7 + env.gripper_actual_dof),
+                              dtype=np.float64)
+        self._ctrl[:, 3:7] = [0.5, 0.5, -0.5, -0.5]
+        self._gripper_ctrl_close = env.gripper_format_action(1.0)
+
+        self.observations = np.zeros((self.num_envs,) + self.single_observation_space.shape,
+                                     dtype=self.single_observation_space.dtype)
+        self._rewards = np.zeros((self.num_envs,), dtype=np.float64)
+        self._dones = np.zeros((self.num_envs,), dtype=np.bool_)
+        self._elapsed_steps = np.zeros((self.num_envs,), dtype=np.int64)
+        self._gripper_close = np.array([env.gripper_close for env in self.envs], dtype=np.bool_)
+        self._success = np.array([env._is_success for env in self.envs], dtype=np.int64)
+        self._actions = None
+
+    def seed(self, seeds=None):
+        if seeds is None:
+            seeds = [None for _ in range(self.num_envs)]
+        if isinstance(seeds, int):
+            seeds = [seeds + i for i in range(self.num_envs)]
+        assert len(seeds) == self.num_envs
+
+        for env, seed in zip(self.envs, seeds):
+            env.seed(seed)
+
+    def reset_wait(self):
+        for i, env in enumerate(self.envs):
+            env.reset(obs_out=self.observations[i])
+        self._elapsed_steps[:] = 0
+        self._dones[:] = False
+
+        return np.copy(self.observations) if self.copy else self.observations
+
+    def step_async(self, actions):
+        self._actions = actions
+
+    def step_wait(self):
+        env = self.envs[0]
+        actions = np.asarray(self._actions, dtype=np.float64)
+        assert actions.shape == (self.num_envs, env.n_actions)
+        actions = np.clip(actions, self.single_action_space.low,
+                          self.single_action_space.high)
+
+        np.multiply(actions[:, :3], 0.03, out=self._ctrl[:, :3])  # limit maximum change in position
+        if env.block_gripper:
+            self._ctrl[:, 7:] = 0.
+        else:
+            np.multiply(np.where(self._gripper_close, 1., -1.)[:, np.newaxis],
+                        self._gripper_ctrl_close, out=self._ctrl[:, 7:])
+        for env, ctrl in zip(self.envs, self._ctrl):
+            utils.ctrl_set_action(env.sim, ctrl)
+            utils.mocap_set_action(env.sim, ctrl)
+
+        self._pool.step()
+
+        for i, env in enumerate(self.envs):
+            env._step_callback()
+            env._get_obs(obs_out=self.observations[i])
+        env = self.envs[0]
+        self._rewards[:], self._success[:], self._gripper_close[:] = compute_reward_batch(
+            self.observations[:, env._obs_object_pos],
+            self.observations[:, env._obs_grip_pos], actions)
+        for env, gripper_close, success in zip(self.envs, self._gripper_close, self._success):
+            env.gripper_close = bool(gripper_close)
+            env._is_success = int(success)
+
+        infos = [{'is_success': int(success)} for success in self._success]
+        self._elapsed_steps += 1
+        self._dones[:] = False
+        if self.max_episode_steps is not None:
+            self._dones[:] = self._elapsed_steps >= self.max_episode_steps
+        for i in np.flatnonzero(self._dones):
+            infos[i]['TimeLimit.truncated'] = True
+            self.envs[i].reset(obs_out=self.observations[i])
+            self._elapsed_steps[i] = 0
+
+        return (np.copy(self.observations) if self.copy else self.observations,
+            np.copy(self._rewards), np.copy(self._dones), infos)
+
+    def close_extras(self, **kwargs):
+        [env.close() for env in self.envs]
+
+    def _check_observation_spaces(self):
+        for env in self.envs:
+            if not (env.observation_space == self.single_observation_space):
+                break
+        else:
+            return True
+        raise RuntimeError('Some environments have an observation space '
+            'different from `{0}`. In order to batch observations, the '
+            'observation spaces from all environments must be '
+            'equal.'.format(self.single_observation_space))
@@ -0,0 +1,123 @@
+import threading
+
+import numpy as np
+from six.moves import queue
+
+from gym import error
+from gym.utils import seeding
+
+try:
+    import mujoco_py
+except ImportError as e:
+    raise error.DependencyNotInstalled("{}. (HINT: you need to install mujoco_py, and also perform the setup instructions here: https://github.com/openai/mujoco-py/.)".format(e))
+
+
+class ResetStateCache(object):
+    """A pool of settled simulation states, used to turn a reset into a
+    `set_state` and a `forward` instead of settling the simulation again.
+
+    The states are settled on a private `MjSim` sharing the model of `sim`,
+    by `settle_fn(sim, np_random)`. This function must draw the randomized
+    initial conditions of an episode from `np_random` and settle the
+    simulation; the cache then snapshots the state and the mocap poses.
+
+    The snapshots are settled in the order of the draws from the random state
+    of the cache, so the initial states only depend on the seed passed to
+    `seed`, and not on when they have been settled.
+
+    Args:
+        sim (MjSim): the simulation whose model is used to settle the states
+        settle_fn (callable): function settling a simulation from a random state
+        size (int): the number of snapshots in the pool
+        refill ('never' or 'background'): with 'never', the pool is filled once
+            (after each call to `seed`) and resets sample snapshots from it with
+            replacement, so that no reset ever settles the simulation. With
+            'background', every snapshot is used once and a background thread
+            settles the next ones ahead of time. Since `MjSim.step` holds the
+            GIL, this only pays off if the main thread spends time outside of
+            Python between resets.
+    """
+    REFILL_POLICIES = ('never', 'background')
+
+    def __init__(self, sim, settle_fn, size, refill='never'):
+        if size <= 0:
+            raise ValueError('The size of the cache must be positive, got {}'.format(size))
+        if refill not in self.REFILL_POLICIES:
+            raise ValueError('refill is not in {}'.format(self.REFILL_POLICIES))
+        self.settle_fn = settle_fn
+        self.size = size
+        self.refill = refill
+        self._sim = mujoco_py.MjSim(sim.model, nsubsteps=sim.nsubsteps)
+        self._pool = []
+        self._snapshots = None
+        self._thread = None
+        self._stop = None
+        self.seed()
+
+    def seed(self, seed=None):
+        """Seeds the cache and drops the snapshots settled with the previous seed.
+        """
+        self.close()
+        self.np_random, seed = seeding.np_random(seed)
+        self._pool = []
+        return [seed]
+
+    def reset(self, sim, np_random):
+        """Restores a settled snapshot into `sim`. With the 'never' refill
+        policy, the snapshot is picked with a draw from `np_random`.
+        """
+        if self.refill == 'never':
+            if not self._pool:
+                self._pool = [self._settle() for _ in range(self.size)]
+            snapshot = self._pool[np_random.randint(self.size)]
+        else:
+            if self._thread is None:
+                self._start()
+            snapshot = self._snapshots.get()
+            if isinstance(snapshot, Exception):
+                self.close()
+                raise snapshot
+
+        state, mocap_pos, mocap_quat = snapshot
+        sim.set_state(state)
+        if sim.model.nmocap > 0:
+            sim.data.mocap_pos[:] = mocap_pos
+            sim.data.mocap_quat[:] = mocap_quat
+        sim.forward()
+
+    def close(self):
+        """Stops the background thread, if any.
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self._snapshots = None
+
+    def _settle(self):
+        self.settle_fn(self._sim, self.np_random)
+        return (self._sim.get_state(), np.copy(self._sim.data.mocap_pos),
+                np.copy(self._sim.data.mocap_quat))
+
+    def _start(self):
+        self._snapshots = queue.Queue(maxsize=self.size)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._refill,
+            args=(self._snapshots, self._stop), name='ResetStateCache')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _refill(self, snapshots, stop):
+        while not stop.is_set():
+            try:
+                snapshot = self._settle()
+            except Exception as e:
+                snapshot = e
+            while not stop.is_set():
+                try:
+                    snapshots.put(snapshot, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+            if isinstance(snapshot, Exception):
+                return
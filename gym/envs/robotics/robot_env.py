@@ -11,6 +11,8 @@ try:
 except ImportError as e:
     raise error.DependencyNotInstalled("{}. (HINT: you need to install mujoco_py, and also perform the setup instructions here: https://github.com/openai/mujoco-py/.)".format(e))
 
+from gym.envs.mujoco.mujoco_env import load_model
+
 DEFAULT_SIZE = 500
 
 class RobotEnv(gym.GoalEnv):
@@ -22,7 +24,7 @@ class RobotEnv(gym.GoalEnv):
         if not os.path.exists(fullpath):
             raise IOError('File {} does not exist'.format(fullpath))
 
-        model = mujoco_py.load_model_from_path(fullpath)
+        model = load_model(fullpath)
         self.sim = mujoco_py.MjSim(model, nsubsteps=n_substeps)
         self.viewer = None
         self._viewers = {}
@@ -11,6 +11,8 @@ try:
 except ImportError as e:
     raise error.DependencyNotInstalled("{}. (HINT: you need to install mujoco_py, and also perform the setup instructions here: https://github.com/openai/mujoco-py/.)".format(e))
 
+from gym.envs.mujoco.mujoco_env import load_model
+
 from collections import OrderedDict
 
 def convert_observation_to_space(observation):
@@ -30,6 +32,14 @@ def convert_observation_to_space(observation):
 
 DEFAULT_SIZE = 500
 
+# Layout of the header of the buffers returned by `RobotGymEnv.clone_state`:
+# [version, time, nq, nv, na, nmocap, goal size, extra state size].
+STATE_VERSION = 1
+STATE_HEADER_SIZE = 8
+# Size of the state of a `np.random.RandomState`: the 624 words of the
+# Mersenne Twister, the position in the key, and the cached Gaussian.
+RNG_STATE_SIZE = 624 + 3
+
 class RobotGymEnv(gym.Env):
     def __init__(self, model_path, initial_qpos, n_actions, n_substeps):
         if model_path.startswith('/'):
@@ -39,7 +49,7 @@ class RobotGymEnv(gym.Env):
         if not os.path.exists(fullpath):
             raise IOError('File {} does not exist'.format(fullpath))
 
-        model = mujoco_py.load_model_from_path(fullpath)
+        model = load_model(fullpath)
         self.sim = mujoco_py.MjSim(model, nsubsteps=n_substeps)
         self.viewer = None
         self._viewers = {}
@@ -76,12 +86,16 @@ class RobotGymEnv(gym.Env):
         self.np_random, seed = seeding.np_random(seed)
         return [seed]
 
-    def step(self, action):
+    def step(self, action, obs_out=None):
+        """Same as `gym.Env.step`. If `obs_out` is given, the observation is
+        written into this array (e.g. a slot of the buffer of a vector env)
+        and returned instead of a newly allocated one.
+        """
         action = np.clip(action, self.action_space.low, self.action_space.high)
         self._set_action(action)
         self.sim.step()
         self._step_callback()
-        obs = self._get_obs()
+        obs = self._get_obs(obs_out=obs_out)
 
         done = False
         # info = {
@@ -92,7 +106,7 @@ class RobotGymEnv(gym.Env):
         # reward = self.compute_reward(obs['achieved_goal'], self.goal, info)
         return obs, reward, done, info
 
-    def reset(self):
+    def reset(self, obs_out=None):
         # Attempt to reset the simulator. Since we randomize initial conditions, it
         # is possible to get into a state with numerical issues (e.g. due to penetration or
         # Gimbel lock) or we may not achieve an initial condition (e.g. an object is within the hand).
@@ -103,7 +117,7 @@ class RobotGymEnv(gym.Env):
         while not did_reset_sim:
             did_reset_sim = self._reset_sim()
         self.goal = self._sample_goal().copy()
-        obs = self._get_obs()
+        obs = self._get_obs(obs_out=obs_out)
         return obs
 
     def close(self):
@@ -123,6 +137,94 @@ class RobotGymEnv(gym.Env):
         elif mode == 'human':
             self._get_viewer(mode).render()
 
+    def clone_state(self, out=None):
+        """Returns a snapshot of the environment in a flat float64 buffer.
+
+        The buffer holds a header followed by qpos, qvel, act, the mocap
+        positions and quaternions, the goal, the state of `np_random` and the
+        state returned by `_get_extra_state`. Since it is a single contiguous
+        array, it can be serialized without a copy (e.g. `memoryview(state)`)
+        and read back with `np.frombuffer`.
+
+        Args:
+            out (np.ndarray): optional buffer of size `state_size` to write to,
+                so that no memory is allocated
+        """
+        extra = np.asarray(self._get_extra_state(), dtype=np.float64)
+        goal = np.asarray(self.goal, dtype=np.float64).ravel()
+        model, data = self.sim.model, self.sim.data
+        size = self._state_size(goal.size, extra.size)
+        if out is None:
+            out = np.empty(size, dtype=np.float64)
+        elif out.shape != (size,) or out.dtype != np.float64:
+            raise error.Error('The state buffer must be a float64 array of shape '
+                              '{}, got {} {}.'.format((size,), out.dtype, out.shape))
+
+        out[:STATE_HEADER_SIZE] = [STATE_VERSION, data.time, model.nq, model.nv,
+                                   model.na, model.nmocap, goal.size, extra.size]
+        keys, pos, has_gauss, cached_gaussian = self.np_random.get_state()[1:]
+        offset = STATE_HEADER_SIZE
+        for value in (data.qpos, data.qvel, data.act, data.mocap_pos,
+                      data.mocap_quat, goal, keys, (pos, has_gauss, cached_gaussian),
+                      extra):
+            if value is None:  # `act` is None when the model has no activations
+                continue
+            value = np.ravel(value)
+            out[offset:offset + value.size] = value
+            offset += value.size
+        return out
+
+    def restore_state(self, state):
+        """Restores a snapshot returned by `clone_state`.
+
+        Args:
+            state (np.ndarray or buffer): the snapshot; buffers such as `bytes`
+                are read without a copy
+        """
+        if not isinstance(state, np.ndarray):
+            state = np.frombuffer(state, dtype=np.float64)
+        model, data = self.sim.model, self.sim.data
+        header = state[:STATE_HEADER_SIZE]
+        if (header.size != STATE_HEADER_SIZE or header[0] != STATE_VERSION
+                or tuple(header[2:6]) != (model.nq, model.nv, model.na, model.nmocap)
+                or state.size != self._state_size(int(header[6]), int(header[7]))):
+            raise error.Error('The state does not match the model of this environment.')
+
+        goal_size, extra_size = int(header[6]), int(header[7])
+        sizes = [model.nq, model.nv, model.na, 3 * model.nmocap, 4 * model.nmocap,
+                 goal_size, RNG_STATE_SIZE - 3, 3, extra_size]
+        (qpos, qvel, act, mocap_pos, mocap_quat, goal, keys, rng_tail,
+         extra) = np.split(state[STATE_HEADER_SIZE:], np.cumsum(sizes)[:-1])
+
+        data.time = header[1]
+        data.qpos[:] = qpos
+        data.qvel[:] = qvel
+        if model.na > 0:
+            data.act[:] = act
+        if model.nmocap > 0:
+            data.mocap_pos[:] = mocap_pos.reshape(model.nmocap, 3)
+            data.mocap_quat[:] = mocap_quat.reshape(model.nmocap, 4)
+        if np.ndim(self.goal) == 0:
+            self.goal = goal[0]
+        else:
+            self.goal = goal.reshape(np.shape(self.goal)).copy()
+        pos, has_gauss, cached_gaussian = rng_tail
+        self.np_random.set_state(('MT19937', keys.astype(np.uint32), int(pos),
+                                  int(has_gauss), cached_gaussian))
+        self._set_extra_state(extra)
+        self.sim.forward()
+
+    @property
+    def state_size(self):
+        """The size of the buffers returned by `clone_state`.
+        """
+        return self._state_size(np.size(self.goal), np.size(self._get_extra_state()))
+
+    def _state_size(self, goal_size, extra_size):
+        model = self.sim.model
+        return (STATE_HEADER_SIZE + model.nq + model.nv + model.na + 7 * model.nmocap
+                + goal_size + RNG_STATE_SIZE + extra_size)
+
     def _get_viewer(self, mode):
         self.viewer = self._viewers.get(mode)
         if self.viewer is None:
@@ -147,8 +249,9 @@ class RobotGymEnv(gym.Env):
         self.sim.forward()
         return True
 
-    def _get_obs(self):
-        """Returns the observation.
+    def _get_obs(self, obs_out=None):
+        """Returns the observation. If `obs_out` is given, the observation is
+        written into it and `obs_out` is returned.
         """
         raise NotImplementedError()
 
@@ -167,6 +270,18 @@ class RobotGymEnv(gym.Env):
         """
         raise NotImplementedError()
 
+    def _get_extra_state(self):
+        """Returns the state of the environment that is not held by the simulation,
+        the goal or the random state, as a sequence of floats. It is saved by
+        `clone_state` and given back to `_set_extra_state` by `restore_state`.
+        """
+        return ()
+
+    def _set_extra_state(self, extra_state):
+        """Restores the state returned by `_get_extra_state`.
+        """
+        pass
+
     def _env_setup(self, initial_qpos):
         """Initial configuration of the environment. Can be used to configure initial state
         and extract information from the simulation.
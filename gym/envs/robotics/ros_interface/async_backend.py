@@ -0,0 +1,121 @@
+# Helpers used by SIA7FARMROS to take the ROS round-trips out of the control loop.
+# They do not depend on rospy, so that they can be tested against a fake robot.
+
+from __future__ import print_function
+
+import threading
+import time
+from collections import deque
+
+import numpy as np
+from six.moves import queue
+
+
+class LatencyStats(object):
+    """Latencies (in seconds) of the last `window` calls, grouped by name.
+
+    Args:
+        window (int): number of calls kept for every name
+    """
+    def __init__(self, window=1000):
+        self.window = window
+        self._latencies = dict()
+        self._lock = threading.Lock()
+
+    def record(self, name, latency):
+        with self._lock:
+            if name not in self._latencies:
+                self._latencies[name] = deque(maxlen=self.window)
+            self._latencies[name].append(latency)
+
+    def timed(self, name, fn, *args, **kwargs):
+        """Calls `fn(*args, **kwargs)` and records its latency under `name`.
+        """
+        start = time.time()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.record(name, time.time() - start)
+
+    def summary(self):
+        """Returns a dict mapping every name to the count, mean, median, 99th
+        percentile and maximum of its latencies.
+        """
+        with self._lock:
+            latencies = dict((name, np.array(values))
+                             for (name, values) in self._latencies.items())
+        return dict((name, {
+            'count': len(values),
+            'mean': float(np.mean(values)),
+            'p50': float(np.percentile(values, 50)),
+            'p99': float(np.percentile(values, 99)),
+            'max': float(np.max(values)),
+        }) for (name, values) in latencies.items())
+
+    def reset(self):
+        with self._lock:
+            self._latencies.clear()
+
+
+class AsyncCommandQueue(object):
+    """Sends commands (e.g. calls to `rospy.ServiceProxy`) from a background
+    thread, in the order in which they are submitted. The latency of every
+    command is recorded in `latency_stats`.
+
+    An exception raised by a command is re-raised by the next call to `submit`,
+    `join` or `close`, and the commands still pending until then are dropped.
+
+    Args:
+        latency_stats (LatencyStats): where to record the latencies of the commands
+        maxsize (int): maximum number of pending commands; `submit` blocks when
+            it is reached. If 0, the queue is unbounded.
+    """
+    def __init__(self, latency_stats=None, maxsize=0):
+        self.latency_stats = latency_stats if latency_stats is not None else LatencyStats()
+        self._commands = queue.Queue(maxsize=maxsize)
+        self._error = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._worker, name='AsyncCommandQueue')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def submit(self, name, fn, *args):
+        """Schedules `fn(*args)` and returns without waiting for it.
+        """
+        self._raise_if_errors()
+        if self._closed:
+            raise RuntimeError('Trying to submit a command to a closed AsyncCommandQueue.')
+        self._commands.put((name, fn, args))
+
+    def join(self):
+        """Waits until all the pending commands have been sent.
+        """
+        self._commands.join()
+        self._raise_if_errors()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._commands.put(None)
+        self._thread.join()
+        self._raise_if_errors()
+
+    def _worker(self):
+        while True:
+            command = self._commands.get()
+            try:
+                if command is None:
+                    break
+                if self._error is None:
+                    name, fn, args = command
+                    self.latency_stats.timed(name, fn, *args)
+            except Exception as e:
+                self._error = e
+            finally:
+                self._commands.task_done()
+
+    def _raise_if_errors(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
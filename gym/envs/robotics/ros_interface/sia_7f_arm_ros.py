@@ -22,7 +22,9 @@ from std_msgs.msg import Float64
 from geometry_msgs.msg import Twist, Pose
 from sensor_msgs.msg import JointState
 
-from sia_7f_arm_train.srv import EePose, EePoseRequest, EeRpy, EeRpyRequest, EeTraj, EeTrajRequest, JointTraj, JointTrajRequest, EeDelta, EeDeltaRequest
+from gym.envs.robotics.ros_interface.async_backend import AsyncCommandQueue, LatencyStats
+
+from sia_7f_arm_train.srv import EePose, EePoseRequest, EePoseResponse, EeRpy, EeRpyRequest, EeTraj, EeTrajRequest, JointTraj, JointTrajRequest, EeDelta, EeDeltaRequest
 
 
 class SIA7FARMROS(object):
@@ -33,12 +35,31 @@ class SIA7FARMROS(object):
                  use_camera=True,
                  use_gripper=True,
                  debug_print=True,
+                 asynchronous=False,
+                 ee_pose_topic='/ee_pose',
+                 command_queue_size=1,
                  ):
+        """
+        Args:
+            asynchronous (bool): if True, relative end effector motions are sent
+                from a background thread, and the end effector pose is read from
+                `ee_pose_topic` instead of being requested from `ee_pose_srv`
+            ee_pose_topic (str): topic publishing the end effector pose
+                (geometry_msgs/Pose), used in asynchronous mode
+            command_queue_size (int): maximum number of relative end effector motions
+                waiting to be sent in asynchronous mode. Sending a motion blocks when
+                it is reached, so that the motions are not replayed late when the arm
+                lags behind. If 0, the queue is unbounded.
+        """
 
         # Environment variable
         self.env = os.environ.copy()
 
         self.debug_print = debug_print
+        self.asynchronous = asynchronous
+
+        # Latencies of the service calls
+        self.latency_stats = LatencyStats()
 
         # run ROS core if not already running
         self.core = None # roscore
@@ -73,6 +94,8 @@ class SIA7FARMROS(object):
         self.arm_joint_efforts = dict()
 
         self.arm_joint_state_lock = threading.RLock()
+        # Latest end effector pose received on `ee_pose_topic` (asynchronous mode)
+        self.arm_ee_pose = None
 
         # Topics
         self.rostopic_arm_joint_states = '/joint_states'
@@ -91,6 +114,12 @@ class SIA7FARMROS(object):
         self.arm_ee_rpy_client = rospy.ServiceProxy('/ee_rpy_srv', EeRpy)
         self.arm_ee_delta_pose_client = rospy.ServiceProxy('/ee_delta_srv', EeDelta)
 
+        # Asynchronous mode
+        self.arm_commands = None
+        if self.asynchronous:
+            self.arm_commands = AsyncCommandQueue(self.latency_stats, maxsize=command_queue_size)
+            rospy.Subscriber(ee_pose_topic, Pose, self.arm_callback_ee_pose)
+
         ####### Gripper
         # Topics
         # self.rostopic_gripper_cmd = ''
@@ -167,14 +196,20 @@ class SIA7FARMROS(object):
         return self.arm_joint_names
 
     def arm_get_ee_pose(self):
+        # In asynchronous mode, use the pose published on the topic if any
+        with self.arm_joint_state_lock:
+            ee_pose = self.arm_ee_pose
+        if ee_pose is not None:
+            return ee_pose
+
         ee_pose_req = EePoseRequest()
-        ee_pose = self.arm_ee_pose_client(ee_pose_req)
+        ee_pose = self.latency_stats.timed('arm_get_ee_pose', self.arm_ee_pose_client, ee_pose_req)
 
         return ee_pose
 
     def arm_get_ee_rpy(self):
         ee_rpy_req = EeRpyRequest()
-        ee_rpy = self.arm_ee_rpy_client(ee_rpy_req)
+        ee_rpy = self.latency_stats.timed('arm_get_ee_rpy', self.arm_ee_rpy_client, ee_rpy_req)
 
         return ee_rpy
 
@@ -196,7 +231,7 @@ class SIA7FARMROS(object):
         for i in range(len(positions)):
             joint_positions.point.positions.append(positions[i])
 
-        result = self.arm_joint_traj_client(joint_positions)
+        result = self.latency_stats.timed('arm_set_joint_positions', self.arm_joint_traj_client, joint_positions)
 
         return result.success
 
@@ -219,7 +254,7 @@ class SIA7FARMROS(object):
         ee_target.pose.orientation.y = action[5]
         ee_target.pose.orientation.z = action[6]
 
-        result = self.arm_ee_traj_client(ee_target)
+        result = self.latency_stats.timed('arm_set_ee_pose', self.arm_ee_traj_client, ee_target)
 
         return True
 
@@ -228,7 +263,18 @@ class SIA7FARMROS(object):
         ee_delta_target.pose.position.x = action[0]
         ee_delta_target.pose.position.y = action[1]
         ee_delta_target.pose.position.z = action[2]
-        return self.arm_ee_delta_pose_client(ee_delta_target)
+        if self.asynchronous:
+            # The motion is sent in the background, there is no result to return
+            self.arm_commands.submit('arm_set_ee_pose_relative', self.arm_ee_delta_pose_client, ee_delta_target)
+            return None
+        return self.latency_stats.timed('arm_set_ee_pose_relative', self.arm_ee_delta_pose_client, ee_delta_target)
+
+    def arm_wait_for_commands(self):
+        """
+        Wait until the commands sent in the background have been executed
+        """
+        if self.arm_commands is not None:
+            self.arm_commands.join()
 
     def arm_move_ee_xyz(self, displacement, eef_step=0.005):
         """
@@ -267,6 +313,42 @@ class SIA7FARMROS(object):
         self.arm_joint_state_lock.release()
         # print("callback")
 
+    def arm_callback_ee_pose(self, msg):
+        """
+        ROS subscriber callback for the end effector pose (asynchronous mode)
+        :param msg: Contains message published in topic
+        :type msg: geometry_msgs/Pose
+        """
+        with self.arm_joint_state_lock:
+            self.arm_ee_pose = EePoseResponse(pose=msg)
+
+    def get_state_snapshot(self):
+        """
+        Return a consistent copy of the latest joint states, end effector pose
+        and object position, read under the lock of the subscriber callbacks
+        """
+        with self.arm_joint_state_lock:
+            snapshot = {
+                'joint_angles': dict(self.arm_joint_angles),
+                'joint_velocities': dict(self.arm_joint_velocities),
+                'ee_pose': self.arm_ee_pose,
+                'target_position': list(self.target_position),
+            }
+        if snapshot['ee_pose'] is None:
+            snapshot['ee_pose'] = self.arm_get_ee_pose()
+        return snapshot
+
+    def get_latency_stats(self):
+        """
+        Return the count, mean, median, 99th percentile and maximum latency
+        (in seconds) of every service call
+        """
+        return self.latency_stats.summary()
+
+    def close(self):
+        if self.arm_commands is not None:
+            self.arm_commands.close()
+
     ### Camera BB8 Stereo
     def camera_get_rgb(self):
 
@@ -280,6 +362,7 @@ class SIA7FARMROS(object):
             return NotImplementedError
 
     def object_callback(self, msg):
-        self.target_position[0] = msg.position.x
-        self.target_position[1] = msg.position.y
-        self.target_position[2] = msg.position.z
+        with self.arm_joint_state_lock:
+            self.target_position[0] = msg.position.x
+            self.target_position[1] = msg.position.y
+            self.target_position[2] = msg.position.z
@@ -0,0 +1,228 @@
+# Stand-in for SIA7FARMROS backed by a MuJoCo simulation, used to exercise and
+# benchmark the real-robot code path of MobileSIA7FARMGymEnv without ROS.
+
+from __future__ import print_function
+
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from gym.envs.robotics import utils
+from gym.envs.robotics.ros_interface.async_backend import AsyncCommandQueue, LatencyStats
+from gym.utils import seeding
+
+
+class _Message(object):
+    """Plain object standing for the ROS messages and service responses.
+    """
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+class ServiceLatency(object):
+    """Distribution of the latency (in seconds) of a service call.
+
+    Args:
+        mean (float): mean latency
+        jitter (float): standard deviation of the latency ('normal' and
+            'lognormal'), or mean of the exponential tail added to `mean`
+            ('exponential')
+        distribution ('normal', 'lognormal' or 'exponential'): the shape of
+            the distribution; 'lognormal' and 'exponential' have long tails
+    """
+    DISTRIBUTIONS = ('normal', 'lognormal', 'exponential')
+
+    def __init__(self, mean=0., jitter=0., distribution='normal'):
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError('distribution is not in {}'.format(self.DISTRIBUTIONS))
+        self.mean = mean
+        self.jitter = jitter
+        self.distribution = distribution
+
+    def sample(self, np_random):
+        if self.mean <= 0. and self.jitter <= 0.:
+            return 0.
+        if self.distribution == 'normal':
+            latency = np_random.normal(self.mean, self.jitter)
+        elif self.distribution == 'lognormal':
+            sigma2 = np.log1p((self.jitter / self.mean) ** 2)
+            latency = np_random.lognormal(np.log(self.mean) - sigma2 / 2., np.sqrt(sigma2))
+        else:
+            latency = self.mean + np_random.exponential(self.jitter)
+        return max(latency, 0.)
+
+
+class SimulatedSIA7FARMROS(object):
+    """Drop-in replacement for `SIA7FARMROS`, driving the simulation of a
+    `MobileSIA7FARMGymEnv` instead of the arm.
+
+    Every service call sleeps for a latency drawn from `service_latency`. The
+    simulation advances by one env step on every relative end effector motion,
+    after which the joint states, the end effector pose and the object position
+    are "published": the joint states are dropped with probability
+    `joint_states_drop_rate`, and the object position is the one from
+    `object_target_delay` steps before.
+
+    Args:
+        sim_env (MobileSIA7FARMGymEnv): simulated environment whose simulation
+            plays the role of the robot
+        service_latency (ServiceLatency or dict): latency of every service call,
+            or a dict mapping the names of the calls (e.g. 'arm_get_ee_pose',
+            'arm_set_ee_pose_relative', 'gripper_open', 'gripper_close') to
+            their latency; missing names have no latency
+        joint_states_drop_rate (float): probability that a `/joint_states`
+            message is dropped
+        object_target_delay (int): number of steps by which the `/object_target`
+            pose lags behind the simulation
+        asynchronous (bool): same as for `SIA7FARMROS`
+        command_queue_size (int): same as for `SIA7FARMROS`
+        seed (int): seed of the latencies and of the dropped messages
+    """
+    def __init__(self,
+                 sim_env,
+                 service_latency=None,
+                 joint_states_drop_rate=0.,
+                 object_target_delay=0,
+                 asynchronous=False,
+                 command_queue_size=1,
+                 seed=None,
+                 debug_print=False,
+                 ):
+        self.sim_env = sim_env.unwrapped
+        self.sim = self.sim_env.sim
+        self.service_latency = service_latency if service_latency is not None else ServiceLatency()
+        self.joint_states_drop_rate = joint_states_drop_rate
+        self.asynchronous = asynchronous
+        self.debug_print = debug_print
+        self.np_random, _ = seeding.np_random(seed)
+
+        self.arm_joint_names = list(self.sim_env.arm_joint_names)
+        self.arm_joint_angles = dict()
+        self.arm_joint_velocities = dict()
+        self.arm_ee_pose = None
+        self.target_position = [0, 0, 0]
+        self._object_positions = deque(maxlen=object_target_delay + 1)
+        self.arm_joint_state_lock = threading.RLock()
+
+        self._gripper_ctrl = self.sim_env.gripper_format_action(-1.0)
+        self.latency_stats = LatencyStats()
+        self.arm_commands = None
+        if asynchronous:
+            self.arm_commands = AsyncCommandQueue(self.latency_stats, maxsize=command_queue_size)
+
+        self.sim_env.reset()
+        self._publish(drop=False)
+
+    # Services
+    def arm_get_joint_name(self):
+        return self.arm_joint_names
+
+    def arm_get_ee_pose(self):
+        with self.arm_joint_state_lock:
+            ee_pose = self.arm_ee_pose
+        if self.asynchronous and ee_pose is not None:
+            return ee_pose
+        return self.latency_stats.timed('arm_get_ee_pose', self._call, 'arm_get_ee_pose', self._ee_pose)
+
+    def arm_get_joint_angles(self):
+        return self.arm_joint_angles
+
+    def arm_get_joint_velocity(self):
+        return self.arm_joint_velocities
+
+    def arm_set_ee_pose_relative(self, action):
+        pos_delta = np.array(action[:3], dtype=np.float64)
+        if self.asynchronous:
+            self.arm_commands.submit('arm_set_ee_pose_relative', self._call,
+                                     'arm_set_ee_pose_relative', self._move, pos_delta)
+            return None
+        return self.latency_stats.timed('arm_set_ee_pose_relative', self._call,
+                                        'arm_set_ee_pose_relative', self._move, pos_delta)
+
+    def arm_wait_for_commands(self):
+        if self.arm_commands is not None:
+            self.arm_commands.join()
+
+    def gripper_open(self):
+        return self.latency_stats.timed('gripper_open', self._call, 'gripper_open',
+                                        self._set_gripper, -1.0)
+
+    def gripper_close(self):
+        return self.latency_stats.timed('gripper_close', self._call, 'gripper_close',
+                                        self._set_gripper, 1.0)
+
+    # Topics
+    def get_state_snapshot(self):
+        with self.arm_joint_state_lock:
+            snapshot = {
+                'joint_angles': dict(self.arm_joint_angles),
+                'joint_velocities': dict(self.arm_joint_velocities),
+                'ee_pose': self.arm_ee_pose if self.asynchronous else None,
+                'target_position': list(self.target_position),
+            }
+        if snapshot['ee_pose'] is None:
+            snapshot['ee_pose'] = self.arm_get_ee_pose()
+        return snapshot
+
+    def get_object_position(self):
+        with self.arm_joint_state_lock:
+            return list(self.target_position)
+
+    def get_latency_stats(self):
+        return self.latency_stats.summary()
+
+    def close(self):
+        if self.arm_commands is not None:
+            self.arm_commands.close()
+        self.sim_env.close()
+
+    def _call(self, name, fn, *args):
+        if isinstance(self.service_latency, dict):
+            latency = self.service_latency.get(name)
+        else:
+            latency = self.service_latency
+        if latency is not None:
+            with self.arm_joint_state_lock:
+                delay = latency.sample(self.np_random)
+            time.sleep(delay)
+        return fn(*args)
+
+    def _ee_pose(self):
+        with self.arm_joint_state_lock:
+            return self._read_ee_pose()
+
+    def _read_ee_pose(self):
+        x, y, z = self.sim.data.get_site_xpos('r_grip_site')
+        w, qx, qy, qz = self.sim.data.get_mocap_quat('gripper_r:mocap')
+        return _Message(pose=_Message(
+            position=_Message(x=x, y=y, z=z),
+            orientation=_Message(w=w, x=qx, y=qy, z=qz)))
+
+    def _move(self, pos_delta):
+        with self.arm_joint_state_lock:
+            # Same control as the simulated branch of MobileSIA7FARMGymEnv._set_action
+            action = np.concatenate([pos_delta, [0.5, 0.5, -0.5, -0.5], self._gripper_ctrl])
+            utils.ctrl_set_action(self.sim, action)
+            utils.mocap_set_action(self.sim, action)
+            self.sim.step()
+            self.sim_env._step_callback()
+            self._publish()
+        return _Message(success=True)
+
+    def _set_gripper(self, action):
+        with self.arm_joint_state_lock:
+            self._gripper_ctrl = self.sim_env.gripper_format_action(action)
+        return _Message(success=True)
+
+    def _publish(self, drop=None):
+        if drop is None:
+            drop = self.np_random.uniform() < self.joint_states_drop_rate
+        if not drop:
+            for name in self.arm_joint_names:
+                self.arm_joint_angles[name] = float(self.sim.data.get_joint_qpos(name))
+                self.arm_joint_velocities[name] = float(self.sim.data.get_joint_qvel(name))
+        self.arm_ee_pose = self._read_ee_pose()
+        self._object_positions.append(self.sim.data.get_site_xpos('object0').copy())
+        self.target_position = list(self._object_positions[0])
@@ -99,7 +99,6 @@ TODO / Missing
     - Rotation integration or derivatives (e.g. velocity conversions)
     - More representations (SO3, etc)
     - Random sampling (e.g. sample uniform random rotation)
-    - Performance benchmarks/measurements
     - (Maybe) define everything as to/from matricies, for simplicity
 '''
 
@@ -171,40 +170,55 @@ def mat2euler(mat):
     return euler
 
 
+def _mat2quat_candidates():
+    # Linear map from [1, m00, m01, ..., m22] to the 4 candidate quaternions
+    # of Shepperd's method. Candidate i is 4 * q_i * q, so its i-th component
+    # is 4 * q_i ** 2 and the largest one is the best conditioned.
+    def m(i, j):
+        return 1 + 3 * i + j
+    terms = [
+        # w, x, y, z computed from the trace (w pivot)
+        [[(0, 1), (m(0, 0), 1), (m(1, 1), 1), (m(2, 2), 1)],
+         [(m(2, 1), 1), (m(1, 2), -1)], [(m(0, 2), 1), (m(2, 0), -1)], [(m(1, 0), 1), (m(0, 1), -1)]],
+        # x pivot
+        [[(m(2, 1), 1), (m(1, 2), -1)], [(0, 1), (m(0, 0), 1), (m(1, 1), -1), (m(2, 2), -1)],
+         [(m(0, 1), 1), (m(1, 0), 1)], [(m(0, 2), 1), (m(2, 0), 1)]],
+        # y pivot
+        [[(m(0, 2), 1), (m(2, 0), -1)], [(m(0, 1), 1), (m(1, 0), 1)],
+         [(0, 1), (m(0, 0), -1), (m(1, 1), 1), (m(2, 2), -1)], [(m(1, 2), 1), (m(2, 1), 1)]],
+        # z pivot
+        [[(m(1, 0), 1), (m(0, 1), -1)], [(m(0, 2), 1), (m(2, 0), 1)],
+         [(m(1, 2), 1), (m(2, 1), 1)], [(0, 1), (m(0, 0), -1), (m(1, 1), -1), (m(2, 2), 1)]],
+    ]
+    candidates = np.zeros((10, 4, 4), dtype=np.float64)
+    for i, candidate in enumerate(terms):
+        for j, component in enumerate(candidate):
+            for index, coefficient in component:
+                candidates[index, i, j] = coefficient
+    return candidates.reshape(10, 16)
+
+_MAT2QUAT_CANDIDATES = _mat2quat_candidates()
+
+
 def mat2quat(mat):
     """ Convert Rotation Matrix to Quaternion.  See rotation.py for notes """
     mat = np.asarray(mat, dtype=np.float64)
     assert mat.shape[-2:] == (3, 3), "Invalid shape matrix {}".format(mat)
 
-    Qxx, Qyx, Qzx = mat[..., 0, 0], mat[..., 0, 1], mat[..., 0, 2]
-    Qxy, Qyy, Qzy = mat[..., 1, 0], mat[..., 1, 1], mat[..., 1, 2]
-    Qxz, Qyz, Qzz = mat[..., 2, 0], mat[..., 2, 1], mat[..., 2, 2]
-    # Fill only lower half of symmetric matrix
-    K = np.zeros(mat.shape[:-2] + (4, 4), dtype=np.float64)
-    K[..., 0, 0] = Qxx - Qyy - Qzz
-    K[..., 1, 0] = Qyx + Qxy
-    K[..., 1, 1] = Qyy - Qxx - Qzz
-    K[..., 2, 0] = Qzx + Qxz
-    K[..., 2, 1] = Qzy + Qyz
-    K[..., 2, 2] = Qzz - Qxx - Qyy
-    K[..., 3, 0] = Qyz - Qzy
-    K[..., 3, 1] = Qzx - Qxz
-    K[..., 3, 2] = Qxy - Qyx
-    K[..., 3, 3] = Qxx + Qyy + Qzz
-    K /= 3.0
-    # TODO: vectorize this -- probably could be made faster
-    q = np.empty(K.shape[:-2] + (4,))
-    it = np.nditer(q[..., 0], flags=['multi_index'])
-    while not it.finished:
-        # Use Hermitian eigenvectors, values for speed
-        vals, vecs = np.linalg.eigh(K[it.multi_index])
-        # Select largest eigenvector, reorder to w,x,y,z quaternion
-        q[it.multi_index] = vecs[[3, 0, 1, 2], np.argmax(vals)]
-        # Prefer quaternion with positive w
-        # (q * -1 corresponds to same rotation as q)
-        if q[it.multi_index][0] < 0:
-            q[it.multi_index] *= -1
-        it.iternext()
+    # Closed form (Shepperd's method): the 4 candidate quaternions are linear
+    # in the entries of the matrix, and the one with the largest pivot is kept.
+    batch_shape = mat.shape[:-2]
+    entries = np.empty(batch_shape + (10,), dtype=np.float64)
+    entries[..., 0] = 1.0
+    entries[..., 1:] = mat.reshape(batch_shape + (9,))
+    candidates = np.dot(entries, _MAT2QUAT_CANDIDATES).reshape(batch_shape + (4, 4))
+    pivot = np.argmax(np.diagonal(candidates, axis1=-2, axis2=-1), axis=-1)
+    candidates = candidates.reshape(-1, 4, 4)
+    q = candidates[np.arange(len(candidates)), pivot.ravel()].reshape(batch_shape + (4,))
+
+    # Normalize, and prefer quaternion with positive w
+    # (q * -1 corresponds to same rotation as q)
+    q /= np.where(q[..., :1] < 0, -1.0, 1.0) * np.sqrt(np.sum(q * q, axis=-1, keepdims=True))
     return q
 
 
@@ -245,7 +259,10 @@ def quat2mat(quat):
     mat[..., 2, 0] = xZ - wY
     mat[..., 2, 1] = yZ + wX
     mat[..., 2, 2] = 1.0 - (xX + yY)
-    return np.where((Nq > _FLOAT_EPS)[..., np.newaxis, np.newaxis], mat, np.eye(3))
+    degenerate = Nq <= _FLOAT_EPS
+    if np.any(degenerate):
+        mat[degenerate] = np.eye(3)
+    return mat
 
 def quat_conjugate(q):
     inv_q = -q
@@ -253,28 +270,19 @@ def quat_conjugate(q):
     return inv_q
 
 def quat_mul(q0, q1):
-    assert q0.shape == q1.shape
+    q0 = np.asarray(q0)
+    q1 = np.asarray(q1)
     assert q0.shape[-1] == 4
     assert q1.shape[-1] == 4
 
-    w0 = q0[..., 0]
-    x0 = q0[..., 1]
-    y0 = q0[..., 2]
-    z0 = q0[..., 3]
-
-    w1 = q1[..., 0]
-    x1 = q1[..., 1]
-    y1 = q1[..., 2]
-    z1 = q1[..., 3]
-
-    w = w0 * w1 - x0 * x1 - y0 * y1 - z0 * z1
-    x = w0 * x1 + x0 * w1 + y0 * z1 - z0 * y1
-    y = w0 * y1 + y0 * w1 + z0 * x1 - x0 * z1
-    z = w0 * z1 + z0 * w1 + x0 * y1 - y0 * x1
-    q = np.array([w, x, y, z])
-    if q.ndim == 2:
-        q = q.swapaxes(0, 1)
-    assert q.shape == q0.shape
+    w0, x0, y0, z0 = q0[..., 0], q0[..., 1], q0[..., 2], q0[..., 3]
+    w1, x1, y1, z1 = q1[..., 0], q1[..., 1], q1[..., 2], q1[..., 3]
+
+    q = np.empty(np.broadcast(q0, q1).shape, dtype=np.result_type(q0, q1))
+    q[..., 0] = w0 * w1 - x0 * x1 - y0 * y1 - z0 * z1
+    q[..., 1] = w0 * x1 + x0 * w1 + y0 * z1 - z0 * y1
+    q[..., 2] = w0 * y1 + y0 * w1 + z0 * x1 - x0 * z1
+    q[..., 3] = w0 * z1 + z0 * w1 + x0 * y1 - y0 * x1
     return q
 
 def quat_rot_vec(q, v0):
@@ -8,7 +8,8 @@ MODEL_XML_PATH = os.path.join('sia_7f_arm', 'sia_7f_arm.xml')
 print(MODEL_XML_PATH)
 
 class SIA7FARMPickAndPlaceEnv(mobile_sia_7f_arm_gym_env.MobileSIA7FARMGymEnv, utils.EzPickle):
-    def __init__(self, reward_type='sparse'):
+    def __init__(self, reward_type='sparse', reset_cache_size=0, reset_cache_refill='never',
+                 use_real_robot=False, ros_interface=None):
         initial_qpos = {
             'robot0:slide0': 0.0,
             'robot0:slide1': 0.,
@@ -20,5 +21,9 @@ class SIA7FARMPickAndPlaceEnv(mobile_sia_7f_arm_gym_env.MobileSIA7FARMGymEnv, ut
             gripper_extra_height=0.2, target_in_the_air=True, target_offset=0.0,
             obj_range=0.1, target_range=0.1, distance_threshold=0.05,
             initial_qpos=initial_qpos, reward_type=reward_type, n_actions=4,
-            use_real_robot=False, debug_print=False)
-        utils.EzPickle.__init__(self)
+            use_real_robot=use_real_robot, debug_print=False,
+            reset_cache_size=reset_cache_size, reset_cache_refill=reset_cache_refill,
+            ros_interface=ros_interface)
+        utils.EzPickle.__init__(self, reward_type=reward_type, reset_cache_size=reset_cache_size,
+                                reset_cache_refill=reset_cache_refill, use_real_robot=use_real_robot,
+                                ros_interface=ros_interface)
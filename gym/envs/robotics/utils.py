@@ -1,3 +1,5 @@
+from collections import namedtuple
+
 import numpy as np
 
 from gym import error
@@ -20,19 +22,100 @@ def robot_get_obs(sim):
     return np.zeros(0), np.zeros(0)
 
 
+def robot_get_joint_addrs(sim, prefix='robot'):
+    """Returns the qpos and qvel addresses of all joints whose name starts
+    with `prefix`. The addresses can be used to read the joint state of a
+    robot with a single fancy-indexing operation on `sim.data.qpos` and
+    `sim.data.qvel`, instead of looking up every joint by name.
+    """
+    qpos_addrs, qvel_addrs = [], []
+    if sim.model.joint_names:
+        for name in sim.model.joint_names:
+            if not name.startswith(prefix):
+                continue
+            qpos_addrs.extend(_addr_range(sim.model.get_joint_qpos_addr(name)))
+            qvel_addrs.extend(_addr_range(sim.model.get_joint_qvel_addr(name)))
+    return np.array(qpos_addrs, dtype=np.intp), np.array(qvel_addrs, dtype=np.intp)
+
+
+def _addr_range(addr):
+    # Joints with more than one degree of freedom (free and ball joints)
+    # return a (start, end) tuple instead of a single address.
+    if isinstance(addr, tuple):
+        return range(addr[0], addr[1])
+    return [addr]
+
+
+# Key of the `_ActuationIndices` of a simulation in `MjSim.extras`.
+_ACTUATION_INDICES_KEY = 'gym.envs.robotics.utils.actuation_indices'
+
+_ActuationIndices = namedtuple('_ActuationIndices', [
+    'torque_actuators',     # ids of the actuators without bias (ctrl = action)
+    'position_actuators',   # ids of the position actuators (ctrl = qpos + action)
+    'position_qposadr',     # qpos addresses of the joints of the position actuators
+    'weld_eqs',             # ids of the weld equality constraints
+    'weld_mocaps',          # ids of the mocap bodies of the weld constraints
+    'weld_bodies',          # ids of the bodies welded to these mocap bodies
+])
+
+
+def _get_actuation_indices(sim):
+    """Returns the index arrays used to apply actions to `sim`. They only
+    depend on the model, so they are computed once and cached in `sim.extras`.
+    """
+    extras = getattr(sim, 'extras', None)
+    if extras is not None and _ACTUATION_INDICES_KEY in extras:
+        return extras[_ACTUATION_INDICES_KEY]
+
+    model = sim.model
+    torque_actuators = position_actuators = position_qposadr = np.zeros(0, dtype=np.intp)
+    if model.nu > 0:
+        biastype = np.asarray(model.actuator_biastype)
+        torque_actuators = np.flatnonzero(biastype == 0)
+        position_actuators = np.flatnonzero(biastype != 0)
+        position_qposadr = np.asarray(
+            model.jnt_qposadr)[np.asarray(model.actuator_trnid)[position_actuators, 0]]
+
+    weld_eqs = weld_mocaps = weld_bodies = np.zeros(0, dtype=np.intp)
+    if (model.eq_type is not None and
+        model.eq_obj1id is not None and
+        model.eq_obj2id is not None):
+        weld_eqs = np.flatnonzero(np.asarray(model.eq_type) == mujoco_py.const.EQ_WELD)
+        obj1_ids = np.asarray(model.eq_obj1id)[weld_eqs]
+        obj2_ids = np.asarray(model.eq_obj2id)[weld_eqs]
+        body_mocapid = np.asarray(model.body_mocapid)
+        # obj1 is the mocap and obj2 the welded body, or the other way around
+        obj1_is_mocap = body_mocapid[obj1_ids] != -1
+        weld_mocaps = np.where(obj1_is_mocap, body_mocapid[obj1_ids], body_mocapid[obj2_ids])
+        weld_bodies = np.where(obj1_is_mocap, obj2_ids, obj1_ids)
+        assert np.all(weld_mocaps != -1)
+
+    indices = _ActuationIndices(torque_actuators, position_actuators, position_qposadr,
+                                weld_eqs, weld_mocaps, weld_bodies)
+    if extras is not None:
+        extras[_ACTUATION_INDICES_KEY] = indices
+    return indices
+
+
 def ctrl_set_action(sim, action):
     """For torque actuators it copies the action into mujoco ctrl field.
     For position actuators it sets the target relative to the current qpos.
     """
     if sim.model.nmocap > 0:
-        _, action = np.split(action, (sim.model.nmocap * 7, ))
+        action = action[sim.model.nmocap * 7:]
     if sim.data.ctrl is not None:
-        for i in range(action.shape[0]):
-            if sim.model.actuator_biastype[i] == 0:
-                sim.data.ctrl[i] = action[i]
-            else:
-                idx = sim.model.jnt_qposadr[sim.model.actuator_trnid[i, 0]]
-                sim.data.ctrl[i] = sim.data.qpos[idx] + action[i]
+        indices = _get_actuation_indices(sim)
+        torque_actuators = indices.torque_actuators
+        position_actuators = indices.position_actuators
+        position_qposadr = indices.position_qposadr
+        if action.shape[0] < sim.model.nu:
+            # Only the first actuators are controlled
+            torque_actuators = torque_actuators[torque_actuators < action.shape[0]]
+            position_selected = position_actuators < action.shape[0]
+            position_actuators = position_actuators[position_selected]
+            position_qposadr = position_qposadr[position_selected]
+        sim.data.ctrl[torque_actuators] = action[torque_actuators]
+        sim.data.ctrl[position_actuators] = sim.data.qpos[position_qposadr] + action[position_actuators]
 
 
 def mocap_set_action(sim, action):
@@ -45,8 +128,7 @@ def mocap_set_action(sim, action):
     constraint optimizer tries to center the welded body on the mocap.
     """
     if sim.model.nmocap > 0:
-        action, _ = np.split(action, (sim.model.nmocap * 7, ))
-        action = action.reshape(sim.model.nmocap, 7)
+        action = action[:sim.model.nmocap * 7].reshape(sim.model.nmocap, 7)
 
         pos_delta = action[:, :3]
         quat_delta = action[:, 3:]
@@ -60,10 +142,8 @@ def reset_mocap_welds(sim):
     """Resets the mocap welds that we use for actuation.
     """
     if sim.model.nmocap > 0 and sim.model.eq_data is not None:
-        for i in range(sim.model.eq_data.shape[0]):
-            if sim.model.eq_type[i] == mujoco_py.const.EQ_WELD:
-                sim.model.eq_data[i, :] = np.array(
-                    [0., 0., 0., 1., 0., 0., 0.])
+        sim.model.eq_data[_get_actuation_indices(sim).weld_eqs, :] = np.array(
+            [0., 0., 0., 1., 0., 0., 0.])
     sim.forward()
 
 
@@ -71,26 +151,8 @@ def reset_mocap2body_xpos(sim):
     """Resets the position and orientation of the mocap bodies to the same
     values as the bodies they're welded to.
     """
-
-    if (sim.model.eq_type is None or
-        sim.model.eq_obj1id is None or
-        sim.model.eq_obj2id is None):
+    indices = _get_actuation_indices(sim)
+    if indices.weld_mocaps.size == 0:
         return
-    for eq_type, obj1_id, obj2_id in zip(sim.model.eq_type,
-                                         sim.model.eq_obj1id,
-                                         sim.model.eq_obj2id):
-        if eq_type != mujoco_py.const.EQ_WELD:
-            continue
-
-        mocap_id = sim.model.body_mocapid[obj1_id]
-        if mocap_id != -1:
-            # obj1 is the mocap, obj2 is the welded body
-            body_idx = obj2_id
-        else:
-            # obj2 is the mocap, obj1 is the welded body
-            mocap_id = sim.model.body_mocapid[obj2_id]
-            body_idx = obj1_id
-
-        assert (mocap_id != -1)
-        sim.data.mocap_pos[mocap_id][:] = sim.data.body_xpos[body_idx]
-        sim.data.mocap_quat[mocap_id][:] = sim.data.body_xquat[body_idx]
+    sim.data.mocap_pos[indices.weld_mocaps] = sim.data.body_xpos[indices.weld_bodies]
+    sim.data.mocap_quat[indices.weld_mocaps] = sim.data.body_xquat[indices.weld_bodies]
@@ -1,6 +1,7 @@
 import numpy as np
 
 from gym import error
+from gym.envs.robotics import utils
 try:
     import mujoco_py
 except ImportError as e:
@@ -18,3 +19,10 @@ def robot_get_sia_joint_state_obs(sim):
             np.array([sim.data.get_joint_qvel(name) for name in names]),
         )
     return np.zeros(0), np.zeros(0)
+
+
+def robot_get_sia_joint_addrs(sim):
+    """Returns the qpos and qvel addresses of the joints associated with
+    the sia_7f_arm, in the same order as `robot_get_sia_joint_state_obs`.
+    """
+    return utils.robot_get_joint_addrs(sim, prefix='sia_7f_arm')
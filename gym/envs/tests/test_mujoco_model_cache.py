@@ -0,0 +1,32 @@
+import os
+import shutil
+
+import pytest
+
+from gym.envs.tests.spec_list import skip_mujoco, SKIP_MUJOCO_WARNING_MESSAGE
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+def test_load_model(tmpdir):
+    from gym.envs.mujoco import mujoco_env
+    source = os.path.join(os.path.dirname(mujoco_env.__file__), 'assets', 'hopper.xml')
+    fullpath = str(tmpdir.join('hopper.xml'))
+    shutil.copy(source, fullpath)
+    mujoco_env.clear_model_cache()
+
+    model = mujoco_env.load_model(fullpath)
+    copy = mujoco_env.load_model(fullpath)
+    assert copy is not model
+    assert copy.nq == model.nq
+    assert copy.body_names == model.body_names
+
+    # Each environment gets its own model
+    copy.geom_rgba[0, 3] = 0.
+    assert model.geom_rgba[0, 3] != 0.
+
+    # The file is parsed again when it changes
+    stat = os.stat(fullpath)
+    os.utime(fullpath, (stat.st_atime, stat.st_mtime + 10))
+    mujoco_env.load_model(fullpath)
+    assert mujoco_env._MODEL_CACHE[fullpath][0] == stat.st_mtime + 10
+    mujoco_env.clear_model_cache()
@@ -1,4 +1,9 @@
 # -*- coding: utf-8 -*-
+import subprocess
+import sys
+
+import pytest
+
 import gym
 from gym import error, envs
 from gym.envs import registration
@@ -72,3 +77,53 @@ def test_malformed_lookup():
         assert 'malformed environment ID' in '{}'.format(e), 'Unexpected message: {}'.format(e)
     else:
         assert False
+
+def test_missing_lookup_versions():
+    registry = registration.EnvRegistry()
+    registry.register(id='Test-v0', entry_point=None)
+    registry.register(id='Test-v15', entry_point=None)
+    registry.register(id='user/Test-v9', entry_point=None)
+    registry.register(id='Other-v100', entry_point=None)
+    del registry.env_specs['Test-v15']
+    try:
+        registry.spec('Test-v1')
+    except error.DeprecatedEnv as e:
+        assert 'Test-v0' in '{}'.format(e)
+        assert 'user/Test-v9' in '{}'.format(e)
+        assert 'Test-v15' not in '{}'.format(e)
+        assert 'Other-v100' not in '{}'.format(e)
+    else:
+        assert False
+
+    del registry.env_specs['Other-v100']
+    try:
+        registry.spec('Other-v1')
+    except error.UnregisteredEnv:
+        pass
+    else:
+        assert False
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='gym.vector is imported eagerly')
+def test_import_does_not_load_vector():
+    code = ('import sys, gym; assert "gym.vector" not in sys.modules; '
+            'gym.vector.make; assert "gym.vector" in sys.modules')
+    subprocess.check_call([sys.executable, '-c', code])
+
+def test_make_caches_entry_point(monkeypatch):
+    calls = []
+    def load(name):
+        calls.append(name)
+        return ArgumentEnv
+    monkeypatch.setattr(registration, 'load', load)
+    spec = registration.EnvSpec('Cached-v0',
+        entry_point='gym.envs.tests.test_registration:ArgumentEnv',
+        kwargs={'arg1': 1, 'arg2': 2, 'arg3': 3})
+    env1, env2 = spec.make(), spec.make()
+    assert isinstance(env1, ArgumentEnv) and isinstance(env2, ArgumentEnv)
+    assert env1 is not env2
+    assert len(calls) == 1
+
+    spec.entry_point = 'gym.envs.classic_control:CartPoleEnv'
+    spec.make()
+    assert calls == ['gym.envs.tests.test_registration:ArgumentEnv',
+                     'gym.envs.classic_control:CartPoleEnv']
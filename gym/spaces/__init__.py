@@ -1,4 +1,4 @@
-from gym.spaces.space import Space
+from gym.spaces.space import Space, set_validation, get_validation
 from gym.spaces.box import Box
 from gym.spaces.discrete import Discrete
 from gym.spaces.multi_discrete import MultiDiscrete
@@ -9,5 +9,6 @@ from gym.spaces.dict import Dict
 from gym.spaces.utils import flatdim
 from gym.spaces.utils import flatten
 from gym.spaces.utils import unflatten
+from gym.spaces.utils import FlattenPlan
 
-__all__ = ["Space", "Box", "Discrete", "MultiDiscrete", "MultiBinary", "Tuple", "Dict", "flatdim", "flatten", "unflatten"]
+__all__ = ["Space", "Box", "Discrete", "MultiDiscrete", "MultiBinary", "Tuple", "Dict", "flatdim", "flatten", "unflatten", "FlattenPlan", "set_validation", "get_validation"]
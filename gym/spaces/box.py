@@ -1,8 +1,12 @@
 import numpy as np
 
-from .space import Space
+from .space import Space, _invalid_batch
 from gym import logger
 
+_SAMPLING_MASKS = ('_unbounded', '_upp_bounded', '_low_bounded', '_bounded',
+    '_num_unbounded', '_num_upp_bounded', '_num_low_bounded', '_num_bounded',
+    '_sample_high', '_low_bounded_low', '_upp_bounded_high', '_bounded_low',
+    '_bounded_high')
 
 class Box(Space):
     """
@@ -53,8 +57,39 @@ class Box(Space):
         self.bounded_below = -np.inf < self.low
         self.bounded_above = np.inf > self.high
 
+        self._set_sampling_masks()
+
         super(Box, self).__init__(self.shape, self.dtype)
 
+    def _set_sampling_masks(self):
+        # Masking arrays which classify the coordinates according to interval
+        # type, and the bounds they select, precomputed for `sample`
+        self._unbounded   = ~self.bounded_below & ~self.bounded_above
+        self._upp_bounded = ~self.bounded_below &  self.bounded_above
+        self._low_bounded =  self.bounded_below & ~self.bounded_above
+        self._bounded     =  self.bounded_below &  self.bounded_above
+        self._num_unbounded = int(np.sum(self._unbounded))
+        self._num_upp_bounded = int(np.sum(self._upp_bounded))
+        self._num_low_bounded = int(np.sum(self._low_bounded))
+        self._num_bounded = int(np.sum(self._bounded))
+        high = self.high if self.dtype.kind == 'f' \
+                else self.high.astype('int64') + 1
+        self._sample_high = high
+        self._low_bounded_low = self.low[self._low_bounded]
+        self._upp_bounded_high = self.high[self._upp_bounded]
+        self._bounded_low = self.low[self._bounded]
+        self._bounded_high = high[self._bounded]
+
+    def __getstate__(self):
+        # The sampling masks are recomputed when unpickling, which keeps the
+        # pickled space (e.g. sent to the workers of `AsyncVectorEnv`) small
+        return {key: value for (key, value) in self.__dict__.items()
+            if key not in _SAMPLING_MASKS}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._set_sampling_masks()
+
     def is_bounded(self, manner="both"):
         below = np.all(self.bounded_below)
         above = np.all(self.bounded_above)
@@ -79,40 +114,59 @@ class Box(Space):
         * (-oo, b] : shifted negative exponential distribution
         * (-oo, oo) : normal distribution
         """
-        high = self.high if self.dtype.kind == 'f' \
-                else self.high.astype('int64') + 1
-        sample = np.empty(self.shape)
+        return self._sample(())
 
-        # Masking arrays which classify the coordinates according to interval
-        # type
-        unbounded   = ~self.bounded_below & ~self.bounded_above
-        upp_bounded = ~self.bounded_below &  self.bounded_above
-        low_bounded =  self.bounded_below & ~self.bounded_above
-        bounded     =  self.bounded_below &  self.bounded_above
-        
+    def sample_batch(self, n):
+        """
+        Generates `n` random samples inside of the Box, stacked in an array of
+        shape `(n,) + shape`, with one call to the random number generator per
+        interval type (see `sample`).
+        """
+        return self._sample((n,))
 
-        # Vectorized sampling by interval type
-        sample[unbounded] = self.np_random.normal(
-                size=unbounded[unbounded].shape)
+    def _sample(self, batch_shape):
+        if self._num_bounded == self._bounded.size:
+            sample = self.np_random.uniform(low=self.low, high=self._sample_high,
+                size=batch_shape + self.shape)
+            if self.dtype.kind == 'i':
+                sample = np.floor(sample)
+            return sample.astype(self.dtype)
 
-        sample[low_bounded] = self.np_random.exponential(
-            size=low_bounded[low_bounded].shape) + self.low[low_bounded]
-        
-        sample[upp_bounded] = -self.np_random.exponential(
-            size=upp_bounded[upp_bounded].shape) - self.high[upp_bounded]
-        
-        sample[bounded] = self.np_random.uniform(low=self.low[bounded], 
-                                            high=high[bounded],
-                                            size=bounded[bounded].shape)
+        sample = np.empty(batch_shape + self.shape)
+
+        # Vectorized sampling by interval type
+        if self._num_unbounded:
+            sample[..., self._unbounded] = self.np_random.normal(
+                size=batch_shape + (self._num_unbounded,))
+
+        if self._num_low_bounded:
+            sample[..., self._low_bounded] = self.np_random.exponential(
+                size=batch_shape + (self._num_low_bounded,)) + self._low_bounded_low
+
+        if self._num_upp_bounded:
+            sample[..., self._upp_bounded] = -self.np_random.exponential(
+                size=batch_shape + (self._num_upp_bounded,)) - self._upp_bounded_high
+
+        if self._num_bounded:
+            sample[..., self._bounded] = self.np_random.uniform(
+                low=self._bounded_low, high=self._bounded_high,
+                size=batch_shape + (self._num_bounded,))
         if self.dtype.kind == 'i':
             sample = np.floor(sample)
 
         return sample.astype(self.dtype)
         
-    def contains(self, x):
+    def _contains(self, x):
         if isinstance(x, list):
             x = np.array(x)  # Promote list to array for contains check
-        return x.shape == self.shape and np.all(x >= self.low) and np.all(x <= self.high)
+        return x.shape == self.shape and (x >= self.low).all() and (x <= self.high).all()
+
+    def contains_batch(self, x):
+        x = np.asarray(x)
+        if (x.ndim < 1) or (x.shape[1:] != self.shape):
+            return _invalid_batch(x)
+        inside = (x >= self.low) & (x <= self.high)
+        return np.all(inside, axis=tuple(range(1, inside.ndim)))
 
     def to_jsonable(self, sample_n):
         return np.array(sample_n).tolist()
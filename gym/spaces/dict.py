@@ -1,5 +1,6 @@
+import numpy as np
 from collections import OrderedDict
-from .space import Space
+from .space import Space, _invalid_batch
 
 
 class Dict(Space):
@@ -50,16 +51,29 @@ class Dict(Space):
     def sample(self):
         return OrderedDict([(k, space.sample()) for k, space in self.spaces.items()])
 
-    def contains(self, x):
+    def sample_batch(self, n):
+        return OrderedDict([(k, space.sample_batch(n)) for k, space in self.spaces.items()])
+
+    def _contains(self, x):
         if not isinstance(x, dict) or len(x) != len(self.spaces):
             return False
         for k, space in self.spaces.items():
             if k not in x:
                 return False
-            if not space.contains(x[k]):
+            if not space._contains(x[k]):
                 return False
         return True
 
+    def contains_batch(self, x):
+        # A batch of Dict samples is a dict of batches, one per subspace
+        if not isinstance(x, dict):
+            return _invalid_batch(x)
+        if set(x.keys()) != set(self.spaces.keys()):
+            n = len(next(iter(x.values()))) if x else 0
+            return np.zeros((n,), dtype=np.bool_)
+        return np.logical_and.reduce([space.contains_batch(x[k])
+            for k, space in self.spaces.items()])
+
     def __getitem__(self, key):
         return self.spaces[key]
 
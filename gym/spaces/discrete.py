@@ -1,5 +1,5 @@
 import numpy as np
-from .space import Space
+from .space import Space, _invalid_batch
 
 
 class Discrete(Space):
@@ -18,7 +18,10 @@ class Discrete(Space):
     def sample(self):
         return self.np_random.randint(self.n)
 
-    def contains(self, x):
+    def sample_batch(self, n):
+        return self.np_random.randint(self.n, size=n).astype(self.dtype)
+
+    def _contains(self, x):
         if isinstance(x, int):
             as_int = x
         elif isinstance(x, (np.generic, np.ndarray)) and (x.dtype.kind in np.typecodes['AllInteger'] and x.shape == ()):
@@ -27,6 +30,12 @@ class Discrete(Space):
             return False
         return as_int >= 0 and as_int < self.n
 
+    def contains_batch(self, x):
+        x = np.asarray(x)
+        if x.ndim != 1 or x.dtype.kind not in np.typecodes['AllInteger']:
+            return _invalid_batch(x)
+        return (x >= 0) & (x < self.n)
+
     def __repr__(self):
         return "Discrete(%d)" % self.n
 
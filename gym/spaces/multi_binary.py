@@ -1,5 +1,5 @@
 import numpy as np
-from .space import Space
+from .space import Space, _invalid_batch
 
 
 class MultiBinary(Space):
@@ -10,11 +10,20 @@ class MultiBinary(Space):
     def sample(self):
         return self.np_random.randint(low=0, high=2, size=self.n, dtype=self.dtype)
 
-    def contains(self, x):
+    def sample_batch(self, n):
+        return self.np_random.randint(low=0, high=2, size=(n, self.n), dtype=self.dtype)
+
+    def _contains(self, x):
         if isinstance(x, list):
             x = np.array(x)  # Promote list to array for contains check
         return ((x==0) | (x==1)).all()
 
+    def contains_batch(self, x):
+        x = np.asarray(x)
+        if x.ndim < 1:
+            return _invalid_batch(x)
+        return ((x==0) | (x==1)).all(axis=tuple(range(1, x.ndim)))
+
     def to_jsonable(self, sample_n):
         return np.array(sample_n).tolist()
 
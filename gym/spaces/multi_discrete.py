@@ -1,5 +1,5 @@
 import numpy as np
-from .space import Space
+from .space import Space, _invalid_batch
 
 
 class MultiDiscrete(Space):
@@ -35,13 +35,22 @@ class MultiDiscrete(Space):
     def sample(self):
         return (self.np_random.random_sample(self.nvec.shape)*self.nvec).astype(self.dtype)
 
-    def contains(self, x):
+    def sample_batch(self, n):
+        return (self.np_random.random_sample((n,) + self.nvec.shape)*self.nvec).astype(self.dtype)
+
+    def _contains(self, x):
         if isinstance(x, list):
             x = np.array(x)  # Promote list to array for contains check
         # if nvec is uint32 and space dtype is uint32, then 0 <= x < self.nvec guarantees that x
         # is within correct bounds for space dtype (even though x does not have to be unsigned)
         return x.shape == self.shape and (0 <= x).all() and (x < self.nvec).all()
 
+    def contains_batch(self, x):
+        x = np.asarray(x)
+        if (x.ndim < 1) or (x.shape[1:] != self.shape):
+            return _invalid_batch(x)
+        return ((0 <= x) & (x < self.nvec)).all(axis=tuple(range(1, x.ndim)))
+
     def to_jsonable(self, sample_n):
         return [sample.tolist() for sample in sample_n]
 
@@ -1,5 +1,78 @@
+import threading
+
 from gym.utils import seeding
 
+_VALIDATION_MODES = ('off', 'sample', 'full')
+# `generation` is incremented by every call to `set_validation`, so that the
+# counts of the calls to `contains` of each space start again from zero
+_validation = {'mode': 'full', 'sample_every': 100, 'generation': 0}
+_validation_lock = threading.Lock()
+
+
+def set_validation(mode, sample_every=100):
+    """Set how `Space.contains` validates its argument, e.g. in the checks
+    `assert self.action_space.contains(action)` done by the environments at
+    every step. `contains_batch` always validates.
+
+    * 'full' : every call to `contains` is validated (default)
+    * 'sample' : only one call to `contains` out of `sample_every` is
+      validated, and the others return `True`. The calls are counted for
+      each space separately.
+    * 'off' : `contains` always returns `True`
+
+    The mode applies to every use of `contains`, including `x in space`
+    outside of assertions: with 'sample' and 'off', code relying on
+    `contains` to reject invalid values (e.g. `if x not in space`) no longer
+    does, so these modes are only meant for trusted inputs.
+
+    Example::
+
+        >>> gym.spaces.set_validation('off')
+    """
+    if mode not in _VALIDATION_MODES:
+        raise ValueError('Invalid validation mode {0!r}, must be one of '
+            '{1}.'.format(mode, _VALIDATION_MODES))
+    if sample_every < 1:
+        raise ValueError('`sample_every` must be at least 1, got '
+            '{0}.'.format(sample_every))
+    with _validation_lock:
+        _validation.update(mode=mode, sample_every=sample_every,
+            generation=_validation['generation'] + 1)
+
+
+def get_validation():
+    """Return the validation mode set by `set_validation`."""
+    return _validation['mode']
+
+
+def _invalid_batch(x):
+    # All-False mask for the batch `x`, which is not valid. An input which is
+    # not a batch at all counts as a single invalid sample, so that the mask
+    # is never vacuously all-True
+    import numpy as np
+    try:
+        n = len(x)
+    except TypeError:
+        n = 1
+    return np.zeros((n,), dtype=np.bool_)
+
+
+def _skip_validation(space):
+    mode = _validation['mode']
+    if mode == 'full':
+        return False
+    elif mode == 'off':
+        return True
+    # Calls to `contains` of `space` since the last call to `set_validation`,
+    # counted under a lock since spaces are shared by threads
+    with _validation_lock:
+        generation, count = getattr(space, '_validation_count', (None, 0))
+        if generation != _validation['generation']:
+            count = 0
+        count = (count + 1) % _validation['sample_every']
+        space._validation_count = (_validation['generation'], count)
+    return count != 0
+
 
 class Space(object):
     """Defines the observation and action spaces, so you can write generic
@@ -18,6 +91,12 @@ class Space(object):
         uniform or non-uniform sampling based on boundedness of space."""
         raise NotImplementedError
 
+    def sample_batch(self, n):
+        """Randomly sample `n` elements of this space at once. The samples
+        are stacked along a first axis of size `n` (for each of the subspaces
+        of `Tuple` and `Dict` spaces)."""
+        raise NotImplementedError
+
     def seed(self, seed=None):
         """Seed the PRNG of this space. """
         self.np_random, seed = seeding.np_random(seed)
@@ -26,9 +105,29 @@ class Space(object):
     def contains(self, x):
         """
         Return boolean specifying if x is a valid
-        member of this space
+        member of this space. Depending on the mode set by
+        `gym.spaces.set_validation`, the check may be skipped (and `True`
+        returned).
         """
-        raise NotImplementedError
+        if type(self)._contains == Space._contains:
+            raise NotImplementedError
+        if _skip_validation(self):
+            return True
+        return self._contains(x)
+
+    def contains_batch(self, x):
+        """
+        Return a boolean vector specifying, for each of the `n` elements of
+        the batch `x` (as returned by `sample_batch(n)`), if it is a valid
+        member of this space.
+        """
+        import numpy as np
+        return np.array([self._contains(item) for item in x], dtype=np.bool_)
+
+    def _contains(self, x):
+        # Check done by `contains`, implemented by the subclasses. Spaces
+        # overriding `contains` itself are always validated.
+        return self.contains(x)
 
     def __contains__(self, x):
         return self.contains(x)
@@ -1,10 +1,13 @@
 import json  # note: ujson fails this test due to float equality
+import pickle
 from copy import copy
 
 import numpy as np
 import pytest
 
+from gym import spaces as gym_spaces
 from gym.spaces import Tuple, Box, Discrete, MultiDiscrete, MultiBinary, Dict
+from gym.spaces import flatdim, flatten, unflatten, FlattenPlan
 
 
 @pytest.mark.parametrize("space", [
@@ -125,3 +128,191 @@ def test_class_inequality(spaces):
 def test_bad_space_calls(space_fn):
     with pytest.raises(AssertionError):
         space_fn()
+
+
+@pytest.mark.parametrize("space", [
+    Discrete(5),
+    Box(low=0, high=255, shape=(2,), dtype='uint8'),
+    Box(low=-np.inf, high=np.inf, shape=(3,3)),
+    Box(low=np.array([0., -np.inf, -1.]), high=np.array([np.inf, 1., 1.])),
+    MultiDiscrete([2, 2, 100]),
+    MultiBinary(6),
+    Tuple([Discrete(5), Box(low=np.array([0, 0]), high=np.array([1, 5]), dtype=np.float32)]),
+    Dict({"position": Discrete(5),
+          "sensors": Dict({"velocity": Box(low=-1, high=1, shape=(2,), dtype=np.float32)})}),
+])
+def test_sample_batch(space):
+    space.seed(0)
+    n = 50
+    batch = space.sample_batch(n)
+
+    def check(batch, space):
+        if isinstance(space, Tuple):
+            assert isinstance(batch, tuple)
+            for subbatch, subspace in zip(batch, space.spaces):
+                check(subbatch, subspace)
+        elif isinstance(space, Dict):
+            assert list(batch.keys()) == list(space.spaces.keys())
+            for key, subspace in space.spaces.items():
+                check(batch[key], subspace)
+        else:
+            assert isinstance(batch, np.ndarray)
+            assert batch.shape == (n,) + space.shape
+            assert batch.dtype == space.dtype
+            assert all(space.contains(batch[i]) for i in range(n))
+
+    check(batch, space)
+
+
+def test_sample_batch_box_distribution():
+    space = Box(low=np.array([-1., 1., -np.inf]), high=np.array([1., np.inf, 2.]))
+    space.seed(0)
+    samples = space.sample_batch(10000)
+    single_samples = np.array([space.sample() for _ in range(10000)])
+    np.testing.assert_allclose(samples.mean(axis=0), single_samples.mean(axis=0), atol=0.1)
+
+
+def test_pickle_box():
+    space = Box(low=np.array([0., -np.inf]), high=np.array([1., np.inf]), dtype=np.float32)
+    space_prime = pickle.loads(pickle.dumps(space))
+    assert space == space_prime
+    space.seed(0)
+    space_prime.seed(0)
+    assert np.all(space.sample_batch(4) == space_prime.sample_batch(4))
+
+
+@pytest.mark.parametrize("space", [
+    Discrete(5),
+    Box(low=0, high=255, shape=(2,), dtype='uint8'),
+    Box(low=-1., high=1., shape=(), dtype=np.float32),
+    Box(low=np.array([0., -np.inf, -1.]), high=np.array([np.inf, 1., 1.])),
+    MultiDiscrete([2, 2, 100]),
+    MultiBinary(6),
+    Tuple([Discrete(5), Box(low=np.array([0, 0]), high=np.array([1, 5]), dtype=np.float32)]),
+    Dict({"position": Discrete(5),
+          "sensors": Dict({"velocity": Box(low=-1, high=1, shape=(2,), dtype=np.float32)})}),
+])
+def test_contains_batch(space):
+    space.seed(0)
+    for n in [20, 0]:
+        batch = space.sample_batch(n)
+        valid = space.contains_batch(batch)
+        assert valid.dtype == np.bool_
+        assert valid.shape == (n,)
+        assert np.all(valid)
+
+
+def test_contains_batch_invalid():
+    space = Box(low=-1., high=1., shape=(2,), dtype=np.float32)
+    batch = np.zeros((4, 2), dtype=np.float32)
+    batch[1, 0], batch[3, 1] = 2., -2.
+    assert list(space.contains_batch(batch)) == [True, False, True, False]
+    assert not np.any(space.contains_batch(np.zeros((4, 3))))
+
+    box = space
+    space = Dict({"position": Discrete(3), "velocity": box})
+    batch = {"position": np.array([0, 3, 1, 2]), "velocity": batch}
+    assert list(space.contains_batch(batch)) == [True, False, True, False]
+    # Batches with the wrong structure are not valid
+    assert list(space.contains_batch({"position": np.array([0, 1])})) == [False, False]
+    assert list(space.contains_batch([0, 1, 2])) == [False] * 3
+
+    space = Tuple([Discrete(3), box])
+    assert list(space.contains_batch((np.array([0, 1]),))) == [False, False]
+    assert list(space.contains_batch(np.zeros((3, 2)))) == [False] * 3
+
+
+@pytest.mark.parametrize("space", [
+    Discrete(3),
+    Box(low=-1., high=1., shape=(), dtype=np.float32),
+    MultiDiscrete([2, 3]),
+    MultiBinary(2),
+])
+def test_contains_batch_scalar(space):
+    # A 0-d input is not a batch, and counts as a single invalid sample
+    assert list(space.contains_batch(np.int64(1))) == [False]
+    assert list(space.contains_batch(1)) == [False]
+
+
+def test_set_validation():
+    space = Tuple([Discrete(2), Box(low=-1., high=1., shape=(2,), dtype=np.float32)])
+    invalid = (3, np.zeros(2, dtype=np.float32))
+    try:
+        gym_spaces.set_validation('off')
+        assert gym_spaces.get_validation() == 'off'
+        assert space.contains(invalid)
+        # Batches are always validated
+        assert not np.any(space.contains_batch((np.array([3]), np.zeros((1, 2)))))
+
+        gym_spaces.set_validation('sample', sample_every=4)
+        assert [space.contains(invalid) for _ in range(8)] == [True, True, True, False] * 2
+        # Calls are counted per space, so that other spaces do not shift the sampling
+        other = Discrete(2)
+        assert [other.contains(3) for _ in range(3)] == [True] * 3
+        assert [space.contains(invalid) for _ in range(4)] == [True, True, True, False]
+
+        gym_spaces.set_validation('full')
+        assert not space.contains(invalid)
+        assert space.contains((1, np.zeros(2, dtype=np.float32)))
+
+        with pytest.raises(ValueError):
+            gym_spaces.set_validation('partial')
+    finally:
+        gym_spaces.set_validation('full')
+
+
+@pytest.mark.parametrize("space", [
+    Discrete(5),
+    Box(low=-1., high=1., shape=(2, 3), dtype=np.float32),
+    MultiDiscrete([2, 2, 100]),
+    MultiBinary(6),
+    Tuple([Discrete(5), Box(low=np.array([0, 0]), high=np.array([1, 5]), dtype=np.float32)]),
+    Dict({"observation": Box(low=-np.inf, high=np.inf, shape=(10,), dtype=np.float32),
+          "achieved_goal": Box(low=-np.inf, high=np.inf, shape=(3,), dtype=np.float32),
+          "desired_goal": Box(low=-np.inf, high=np.inf, shape=(3,), dtype=np.float32)}),
+    Dict({"position": Discrete(5),
+          "sensors": Tuple([MultiBinary(2), Box(low=-1, high=1, shape=(), dtype=np.float32)])}),
+])
+def test_flatten_plan(space):
+    space.seed(0)
+    plan = FlattenPlan(space)
+    assert plan.dim == flatdim(space)
+    for _ in range(3):
+        sample = space.sample()
+        flattened = flatten(space, sample)
+        flattened_plan = plan.flatten(sample)
+        assert flattened_plan.dtype == flattened.dtype
+        assert np.all(flattened_plan == flattened)
+        assert repr(plan.unflatten(flattened)) == repr(unflatten(space, flattened))
+
+    out = np.zeros((8, plan.dim), dtype=plan.dtype)
+    batch = space.sample_batch(8)
+    assert plan.flatten_batch(batch, out=out) is out
+    for getter, subspace, offset, size, _ in plan.leaves:
+        for i in range(8):
+            assert np.all(out[i, offset:offset + size] == flatten(subspace, getter(batch)[i]))
+    assert np.all(plan.flatten_batch(plan.unflatten_batch(out)) == out)
+
+
+def test_flatten_plan_invalid_one_hot():
+    space = Tuple([Discrete(3), Box(low=-1., high=1., shape=(2,), dtype=np.float32)])
+    plan = FlattenPlan(space)
+    flattened = np.zeros((5,), dtype=np.float32)
+    with pytest.raises(IndexError):
+        unflatten(space, flattened)
+    with pytest.raises(IndexError):
+        plan.unflatten(flattened)
+    batch = np.zeros((2, 5), dtype=np.float32)
+    batch[0, 1] = 1.
+    with pytest.raises(IndexError):
+        plan.unflatten_batch(batch)
+
+
+@pytest.mark.parametrize("space", [Tuple([]), Dict({})])
+def test_flatten_plan_no_leaves(space):
+    plan = FlattenPlan(space)
+    assert plan.dim == 0
+    assert plan.flatten(space.sample()).shape == (0,)
+    assert plan.flatten_batch(space.sample_batch(4)).shape == (0, 0)
+    out = np.zeros((4, 0), dtype=plan.dtype)
+    assert plan.flatten_batch(space.sample_batch(4), out=out) is out
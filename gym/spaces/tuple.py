@@ -1,5 +1,5 @@
 import numpy as np
-from .space import Space
+from .space import Space, _invalid_batch
 
 
 class Tuple(Space):
@@ -21,11 +21,26 @@ class Tuple(Space):
     def sample(self):
         return tuple([space.sample() for space in self.spaces])
 
-    def contains(self, x):
+    def sample_batch(self, n):
+        return tuple([space.sample_batch(n) for space in self.spaces])
+
+    def _contains(self, x):
         if isinstance(x, list):
             x = tuple(x)  # Promote list to tuple for contains check
         return isinstance(x, tuple) and len(x) == len(self.spaces) and all(
-            space.contains(part) for (space,part) in zip(self.spaces,x))
+            space._contains(part) for (space,part) in zip(self.spaces,x))
+
+    def contains_batch(self, x):
+        if isinstance(x, list):
+            x = tuple(x)
+        # A batch of Tuple samples is a tuple of batches, one per subspace
+        if not isinstance(x, tuple):
+            return _invalid_batch(x)
+        if len(x) != len(self.spaces):
+            n = len(x[0]) if x else 0
+            return np.zeros((n,), dtype=np.bool_)
+        return np.logical_and.reduce([space.contains_batch(part)
+            for (space, part) in zip(self.spaces, x)])
 
     def __repr__(self):
         return "Tuple(" + ", ". join([str(s) for s in self.spaces]) + ")"
@@ -1,4 +1,5 @@
 import numpy as np
+from operator import itemgetter
 
 from gym.spaces import Box
 from gym.spaces import Discrete
@@ -67,3 +68,124 @@ def unflatten(space, x):
         return np.asarray(x).reshape(space.shape)
     else:
         raise NotImplementedError
+
+
+class FlattenPlan(object):
+    """`flatten` and `unflatten` compiled once for a given space. The offsets,
+    sizes, shapes and one-hot sizes of the (possibly nested) space are
+    computed at construction, so that flattening neither dispatches on the
+    type of the space nor concatenates intermediate arrays, and unflattening
+    neither recomputes `flatdim` nor splits its input. The plan also flattens
+    and unflattens batches of samples, as returned by `space.sample_batch(n)`.
+
+    Example::
+
+        >>> space = Dict({'position': Box(low=-1, high=1, shape=(3,)),
+        ...               'gripper': Discrete(2)})
+        >>> plan = FlattenPlan(space)
+        >>> plan.flatten(space.sample()).shape
+        (5,)
+        >>> plan.flatten_batch(space.sample_batch(4)).shape
+        (4, 5)
+    """
+    def __init__(self, space):
+        self.space = space
+        self.leaves = []
+        self._unflatten = self._compile(space, ())
+        # Leaves as `(getter, index, offset)`, where `offset` is only set for
+        # the one-hot encoded `Discrete` spaces
+        self._flatten_leaves = [(getter, slice(offset, offset + size),
+            offset if isinstance(leaf, Discrete) else None)
+            for (getter, leaf, offset, size, _) in self.leaves]
+        self.dim = sum(size for (_, _, _, size, _) in self.leaves)
+        dtypes = [np.float32 if isinstance(leaf, (Box, Discrete)) else leaf.dtype
+            for (_, leaf, _, _, _) in self.leaves]
+        self.dtype = np.result_type(*dtypes) if dtypes else np.dtype(np.float32)
+
+    def _compile(self, space, path):
+        # Registers the leaves of `space` as `(getter, space, offset, size,
+        # shape)`, and returns the function unflattening `space`
+        if isinstance(space, Tuple):
+            functions = [self._compile(s, path + (i,)) for (i, s) in enumerate(space.spaces)]
+            return lambda x: tuple([function(x) for function in functions])
+        elif isinstance(space, Dict):
+            functions = [(key, self._compile(s, path + (key,)))
+                for (key, s) in space.spaces.items()]
+            return lambda x: dict([(key, function(x)) for (key, function) in functions])
+        elif not isinstance(space, (Box, Discrete, MultiBinary, MultiDiscrete)):
+            raise NotImplementedError
+
+        offset = sum(size for (_, _, _, size, _) in self.leaves)
+        size = flatdim(space)
+        self.leaves.append((_path_getter(path), space, offset, size, space.shape))
+        index = slice(offset, offset + size)
+        if isinstance(space, Discrete):
+            return lambda x: _first_nonzero(x[..., index])
+        elif isinstance(space, Box):
+            return lambda x: np.asarray(x[..., index], dtype=np.float32).reshape(
+                x.shape[:-1] + space.shape)
+        return lambda x: x[..., index].reshape(x.shape[:-1] + space.shape)
+
+    def flatten(self, x, out=None):
+        """Flattens the sample `x` into `out` (allocated if `None`), of shape
+        `(dim,)`, like `flatten(space, x)`."""
+        if out is None:
+            out = np.empty((self.dim,), dtype=self.dtype)
+        for getter, index, offset in self._flatten_leaves:
+            if offset is None:
+                out[index] = np.ravel(getter(x))
+            else:
+                out[index] = 0
+                out[offset + getter(x)] = 1
+        return out
+
+    def flatten_batch(self, x, out=None):
+        """Flattens the batch of `n` samples `x` into `out` (allocated if
+        `None`), of shape `(n, dim)`. A space without any leaf has no
+        batch size, which is then taken from `out` (or is 0)."""
+        values = [np.asarray(getter(x)) for (getter, _, _, _, _) in self.leaves]
+        if values:
+            n = len(values[0])
+        else:
+            n = 0 if out is None else len(out)
+        if out is None:
+            out = np.empty((n, self.dim), dtype=self.dtype)
+        for value, (_, space, offset, size, _) in zip(values, self.leaves):
+            if isinstance(space, Discrete):
+                out[:, offset:offset + size] = 0
+                out[np.arange(n), offset + value] = 1
+            else:
+                out[:, offset:offset + size] = value.reshape((n, size))
+        return out
+
+    def unflatten(self, x):
+        """Unflattens the array `x` of shape `(dim,)`, like
+        `unflatten(space, x)`."""
+        return self._unflatten(np.asarray(x))
+
+    def unflatten_batch(self, x):
+        """Unflattens the array `x` of shape `(n, dim)` into a batch of `n`
+        samples, as returned by `space.sample_batch(n)`."""
+        return self._unflatten(np.asarray(x))
+
+
+def _path_getter(path):
+    # Function returning the element at `path` of a (possibly nested) sample
+    if len(path) == 1:
+        return itemgetter(path[0])
+    def getter(x):
+        for key in path:
+            x = x[key]
+        return x
+    return getter
+
+
+def _first_nonzero(x):
+    # Like `np.nonzero(x)[0][0]` in `unflatten`, along the last axis, raising
+    # an IndexError if a one-hot encoding has no nonzero element
+    nonzero = (x != 0)
+    if not np.all(np.any(nonzero, axis=-1)):
+        raise IndexError('The one-hot encoding of a Discrete space has no '
+            'nonzero element.')
+    index = np.argmax(nonzero, axis=-1)
+    return int(index) if np.ndim(index) == 0 else index
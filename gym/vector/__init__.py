@@ -5,11 +5,19 @@ except ImportError:
 
 from gym.vector.async_vector_env import AsyncVectorEnv
 from gym.vector.sync_vector_env import SyncVectorEnv
+from gym.vector.threaded_vector_env import ThreadedVectorEnv
 from gym.vector.vector_env import VectorEnv
 
-__all__ = ['AsyncVectorEnv', 'SyncVectorEnv', 'VectorEnv', 'make']
+__all__ = ['AsyncVectorEnv', 'SyncVectorEnv', 'ThreadedVectorEnv', 'VectorEnv',
+           'make']
 
-def make(id, num_envs=1, asynchronous=True, wrappers=None, **kwargs):
+_BACKENDS = {
+    'sync': SyncVectorEnv,
+    'async': AsyncVectorEnv,
+    'thread': ThreadedVectorEnv
+}
+
+def make(id, num_envs=1, asynchronous=True, wrappers=None, backend=None, **kwargs):
     """Create a vectorized environment from multiple copies of an environment,
     from its id
 
@@ -30,6 +38,13 @@ def make(id, num_envs=1, asynchronous=True, wrappers=None, **kwargs):
         If not `None`, then apply the wrappers to each internal 
         environment during creation. 
 
+    backend : {'sync', 'async', 'thread'}, optional
+        The vectorized environment to wrap the environments in:
+        `SyncVectorEnv` ('sync'), `AsyncVectorEnv` ('async'), or
+        `ThreadedVectorEnv` ('thread', which steps the environments on a pool
+        of threads, for simulators that release the GIL). If `None`, it is
+        chosen from `asynchronous`.
+
     Returns
     -------
     env : `gym.vector.VectorEnv` instance
@@ -45,6 +60,12 @@ def make(id, num_envs=1, asynchronous=True, wrappers=None, **kwargs):
            [ 0.03468829,  0.01500225,  0.01230312,  0.01825218]],
           dtype=float32)
     """
+    if backend is None:
+        backend = 'async' if asynchronous else 'sync'
+    if backend not in _BACKENDS:
+        raise ValueError('Invalid `backend` {0!r}, must be one of '
+            '{1}.'.format(backend, sorted(_BACKENDS)))
+
     from gym.envs import make as make_
     def _make_env():
         env = make_(id, **kwargs)
@@ -58,4 +79,4 @@ def make(id, num_envs=1, asynchronous=True, wrappers=None, **kwargs):
                 raise NotImplementedError
         return env
     env_fns = [_make_env for _ in range(num_envs)]
-    return AsyncVectorEnv(env_fns) if asynchronous else SyncVectorEnv(env_fns)
+    return _BACKENDS[backend](env_fns)
@@ -1,7 +1,11 @@
 import numpy as np
 import multiprocessing as mp
+import os
+import pickle
 import time
 import sys
+from collections import namedtuple
+from ctypes import c_bool
 from enum import Enum
 from copy import deepcopy
 
@@ -10,12 +14,63 @@ from gym.vector.vector_env import VectorEnv
 from gym.error import (AlreadyPendingCallError, NoAsyncCallError,
                        ClosedEnvironmentError)
 from gym.vector.utils import (create_shared_memory, create_empty_array,
-                              write_to_shared_memory, read_from_shared_memory,
-                              concatenate, CloudpickleWrapper, clear_mpi_env_vars)
+                              read_from_shared_memory, SharedMemoryWritePlan,
+                              ConcatenatePlan, CloudpickleWrapper, clear_mpi_env_vars,
+                              limit_threads, numa_nodes, ObservationRing, _BaseGymSpaces)
+
+try:
+    from multiprocessing.connection import wait as _wait_for_connections
+except ImportError:
+    # Python 2
+    def _wait_for_connections(connections, timeout=None):
+        end_time = None if timeout is None else time.time() + timeout
+        while not any(connection.poll() for connection in connections):
+            if (end_time is not None) and (time.time() >= end_time):
+                break
+            time.sleep(1e-4)
 
 __all__ = ['AsyncVectorEnv']
 
 
+# Shared buffers of the batches of observations, actions, rewards and dones,
+# given to `_worker_shared_memory`. `actions` is `None` if the action space
+# is not supported, in which case the actions are sent through the pipes.
+# `observations` holds the batches of an `ObservationRing`, and
+# `buffer_indices[index]` is the batch the worker `index` must write into.
+# `sync` is `None` with the 'pipe' synchronization backend.
+_SharedMemory = namedtuple('_SharedMemory', ['observations', 'buffer_indices',
+    'actions', 'rewards', 'dones', 'sync'])
+
+# Shared state of the 'flag' synchronization backend. The parent starts a step
+# by incrementing the counter `steps[index]` of every worker, and a worker
+# signals the end of a step by setting `dones[index]` to the same value (and
+# `statuses[index]` to 1 if it has sent a message through its pipe, e.g. its
+# infos). Both sides busy-wait on these counters for `spin_count` iterations,
+# then block on the semaphores, which are released after every update of the
+# counters (as well as after every command sent through the pipes, to wake up
+# the worker). The semaphores also order the accesses to the shared memory.
+_FlagSync = namedtuple('_FlagSync', ['steps', 'dones', 'statuses',
+    'command_semaphores', 'done_semaphores', 'spin_count'])
+_FLAG_COUNTER_MASK = 0xffffffff
+# Interval (in seconds) at which `recv_ready` polls the counters of the 'flag'
+# backend once it is done busy-waiting
+_FLAG_POLL_INTERVAL = 1e-5
+
+# Raw messages exchanged on the pipes for `step` in shared memory mode: the
+# command (the actions are in shared memory), and the reply of a worker whose
+# environments all returned an empty `info` (the other results are in shared
+# memory). Other messages are pickled, and never start with these bytes.
+_STEP_COMMAND = b'step'
+_STEP_DONE = b''
+
+
+# Placement of a worker process: the cores it is pinned to (or `None`), the
+# number of threads of its BLAS and OpenMP libraries (or `None`), and whether
+# it first-touches its slices of the `num_buffers` batches of observations.
+_WorkerPlacement = namedtuple('_WorkerPlacement', ['cores', 'num_threads',
+    'first_touch', 'num_buffers'])
+
+
 class AsyncState(Enum):
     DEFAULT = 'default'
     WAITING_RESET = 'reset'
@@ -42,12 +97,51 @@ class AsyncVectorEnv(VectorEnv):
     shared_memory : bool (default: `True`)
         If `True`, then the observations from the worker processes are
         communicated back through shared variables. This can improve the
-        efficiency if the observations are large (e.g. images).
+        efficiency if the observations are large (e.g. images). The actions
+        (for `Box`, `Discrete`, `MultiDiscrete` and `MultiBinary` action
+        spaces), rewards and dones are also communicated through shared
+        variables, and the infos are only sent when they are not empty.
 
     copy : bool (default: `True`)
         If `True`, then the `reset` and `step` methods return a copy of the
         observations.
 
+    observation_buffers : int, optional
+        If not `None`, then the observations are written in turn into
+        `observation_buffers` batches (in shared memory if `shared_memory=True`),
+        and the `reset` and `step` methods return a read-only view of the batch
+        just written instead of a copy. This view is valid until the batch is
+        written again, `observation_buffers` calls to `reset` or `step` later.
+        `copy` is then ignored.
+
+    restart_workers : bool (default: `False`)
+        If `True`, then a worker raising an error during a step is restarted,
+        instead of the error being raised. Its environments are created again
+        from `env_fns`, seeded (with the seeds from the last call to `seed`,
+        offset by `num_envs` times the number of restarts of the worker), and
+        reset. The step of these environments then returns the first
+        observation of the new episode, a reward of 0, `done=True`, and
+        `info['worker_restarted'] = True`. The number of restarts of each
+        worker is counted in `worker_restart_counts`.
+
+    worker_affinity : 'auto' or list of iterables of int, optional
+        If not `None`, then each worker process is pinned to a set of cores
+        with `os.sched_setaffinity` (Linux only). With `'auto'`, the workers
+        are pinned to a single core each, among the cores available to the
+        main process, and spread in turn over the NUMA nodes of the machine
+        (see `gym.vector.utils.numa_nodes`). Otherwise, `worker_affinity[i]`
+        is the set of cores of the `i`-th worker. With `shared_memory=True`,
+        the observation buffers are not zero-filled at allocation: once
+        pinned, and before creating its environments, each worker writes its
+        slices of the buffers first, so that their pages are allocated on its
+        NUMA node (at the granularity of a page).
+
+    worker_threads : int, optional
+        Number of threads of the BLAS and OpenMP libraries in each worker (see
+        `gym.vector.utils.limit_threads`). If `None`, then it is the number of
+        cores of the worker if `worker_affinity` is set, and it is not limited
+        otherwise.
+
     context : str, optional
         Context for multiprocessing. If `None`, then the default context is used.
         Only available in Python 3.
@@ -64,10 +158,37 @@ class AsyncVectorEnv(VectorEnv):
         logic, for instance, how resets on done are handled. Provides high
         degree of flexibility and a high chance to shoot yourself in the foot; thus,
         if you are writing your own worker, it is recommended to start from the code
-        for `_worker` (or `_worker_shared_memory`) method below, and add changes
+        for `_worker` (or `_worker_shared_memory`) method below, and add changes.
+        Note that a worker hosts a list of environments, and receives the
+        commands for all of them in a single message.
+
+    envs_per_worker : int (default: `1`)
+        Number of environments hosted by each worker process. The commands are
+        sent to a worker once for all its environments (e.g. the actions of all
+        its environments in a single message), and the worker runs them on its
+        environments serially. This reduces the communication overhead when
+        the environments are cheap to step.
+
+    sync_backend : {'pipe', 'flag'} (default: `'pipe'`)
+        How the workers are told to step, and how they signal that they are
+        done. With `'pipe'`, a message is exchanged through the pipe of every
+        worker. With `'flag'`, counters in shared memory are used instead,
+        which the worker processes and `step_wait` busy-wait on for
+        `spin_count` iterations before blocking on a semaphore. This saves the
+        system calls of the pipes, and the cost of waking up a sleeping
+        process if the steps are short. Requires `shared_memory=True`, and an
+        action space supported by the shared memory.
+
+    spin_count : int, optional
+        Number of iterations of the busy-wait with the `'flag'` backend. If
+        `None`, it is 1000 if there are more CPUs than worker processes, and 0
+        otherwise (busy-waiting processes would then delay the others).
     """
     def __init__(self, env_fns, observation_space=None, action_space=None,
-                 shared_memory=True, copy=True, context=None, daemon=True, worker=None):
+                 shared_memory=True, copy=True, context=None, daemon=True, worker=None,
+                 envs_per_worker=1, sync_backend='pipe', spin_count=None,
+                 observation_buffers=None, restart_workers=False,
+                 worker_affinity=None, worker_threads=None):
         try:
             ctx = mp.get_context(context)
         except AttributeError:
@@ -77,6 +198,15 @@ class AsyncVectorEnv(VectorEnv):
         self.env_fns = env_fns
         self.shared_memory = shared_memory
         self.copy = copy
+        self.observation_buffers = observation_buffers
+        if envs_per_worker < 1:
+            raise ValueError('`envs_per_worker` must be at least 1, got '
+                '{0}.'.format(envs_per_worker))
+        self.envs_per_worker = envs_per_worker
+        if sync_backend not in ('pipe', 'flag'):
+            raise ValueError('`sync_backend` must be one of {{`pipe`, `flag`}}, '
+                'got `{0}`.'.format(sync_backend))
+        self.sync_backend = sync_backend
 
         if (observation_space is None) or (action_space is None):
             dummy_env = env_fns[0]()
@@ -87,35 +217,91 @@ class AsyncVectorEnv(VectorEnv):
         super(AsyncVectorEnv, self).__init__(num_envs=len(env_fns),
             observation_space=observation_space, action_space=action_space)
 
+        num_buffers = observation_buffers or 1
         if self.shared_memory:
+            # The pinned workers first-touch the observations of their
+            # environments, so these pages are left untouched here
             _obs_buffer = create_shared_memory(self.single_observation_space,
-                n=self.num_envs, ctx=ctx)
-            self.observations = read_from_shared_memory(_obs_buffer,
-                self.single_observation_space, n=self.num_envs)
+                n=num_buffers * self.num_envs, ctx=ctx,
+                zero_fill=(worker_affinity is None))
+            self._observation_ring = ObservationRing(self.single_observation_space,
+                self.num_envs, num_buffers, flat=read_from_shared_memory(_obs_buffer,
+                self.single_observation_space, n=num_buffers * self.num_envs))
+            _actions_buffer, self._actions = None, None
+            if isinstance(self.single_action_space, _BaseGymSpaces):
+                _actions_buffer = create_shared_memory(self.single_action_space,
+                    n=self.num_envs, ctx=ctx)
+                self._actions = read_from_shared_memory(_actions_buffer,
+                    self.single_action_space, n=self.num_envs)
+            _rewards_buffer = ctx.Array('d', self.num_envs)
+            _dones_buffer = ctx.Array(c_bool, self.num_envs)
+            self._rewards = np.frombuffer(_rewards_buffer.get_obj(), dtype=np.float64)
+            self._dones = np.frombuffer(_dones_buffer.get_obj(), dtype=np.bool_)
+        else:
+            if self.sync_backend == 'flag':
+                raise ValueError('The `flag` synchronization backend requires '
+                    '`shared_memory=True`.')
+            self._observation_ring = ObservationRing(self.single_observation_space,
+                self.num_envs, num_buffers)
+        self.observations = self._observation_ring.current
+        self._concatenate_observations = ConcatenatePlan(self.single_observation_space)
+        self._concatenate_actions = ConcatenatePlan(self.single_action_space)
+        # Batch of the observation ring holding the last observation of each
+        # environment
+        self._env_buffers = np.zeros((self.num_envs,), dtype=np.int64)
+
+        # Slices and indices of the environments hosted by each worker, and
+        # the worker hosting each environment
+        self._worker_slices = [slice(start, min(start + envs_per_worker, self.num_envs))
+            for start in range(0, self.num_envs, envs_per_worker)]
+        self._worker_env_indices = [list(range(self.num_envs))[env_slice]
+            for env_slice in self._worker_slices]
+        self._env_workers = np.arange(self.num_envs) // envs_per_worker
+        self._pending_workers = set()
+        # Pending workers whose 'done' semaphore (of the 'flag' backend) has
+        # already been acquired, by a call to `step_wait` which timed out
+        self._acquired_workers = set()
+
+        self._sync = None
+        if self.sync_backend == 'flag':
+            if self._actions is None:
+                raise ValueError('The `flag` synchronization backend does not '
+                    'support the action space `{0}`.'.format(self.single_action_space))
+            num_workers = len(self._worker_slices)
+            if spin_count is None:
+                spin_count = 1000 if mp.cpu_count() > num_workers else 0
+            self._sync = _FlagSync(steps=ctx.RawArray('I', num_workers),
+                dones=ctx.RawArray('I', num_workers),
+                statuses=ctx.RawArray('b', num_workers),
+                command_semaphores=[ctx.Semaphore(0) for _ in range(num_workers)],
+                done_semaphores=[ctx.Semaphore(0) for _ in range(num_workers)],
+                spin_count=spin_count)
+            self._step_counts = [0] * num_workers
+
+        self._buffer_indices = None
+        if self.shared_memory:
+            self._buffer_indices = ctx.RawArray('i', len(self._worker_slices))
+            _shared_memory = _SharedMemory(_obs_buffer, self._buffer_indices,
+                _actions_buffer, _rewards_buffer, _dones_buffer, self._sync)
         else:
-            _obs_buffer = None
-            self.observations = create_empty_array(
-            	self.single_observation_space, n=self.num_envs, fn=np.zeros)
+            _shared_memory = None
 
         self.parent_pipes, self.processes = [], []
         self.error_queue = ctx.Queue()
         target = _worker_shared_memory if self.shared_memory else _worker
-        target = worker or target
-        with clear_mpi_env_vars():
-            for idx, env_fn in enumerate(self.env_fns):
-                parent_pipe, child_pipe = ctx.Pipe()
-                process = ctx.Process(target=target,
-                    name='Worker<{0}>-{1}'.format(type(self).__name__, idx),
-                    args=(idx, CloudpickleWrapper(env_fn), child_pipe,
-                    parent_pipe, _obs_buffer, self.error_queue))
-
-                self.parent_pipes.append(parent_pipe)
-                self.processes.append(process)
-
-                process.daemon = daemon
-                process.start()
-                child_pipe.close()
+        self._ctx, self._daemon = ctx, daemon
+        self._worker_target = worker or target
+        self._shared_memory_buffers = _shared_memory
+        self._worker_placements = self._get_worker_placements(worker_affinity,
+            worker_threads, num_buffers)
+        for idx in range(len(self._worker_slices)):
+            parent_pipe, process = self._start_worker(idx)
+            self.parent_pipes.append(parent_pipe)
+            self.processes.append(process)
 
+        self.restart_workers = restart_workers
+        self.worker_restart_counts = [0] * len(self._worker_slices)
+        self._seeds = [None] * self.num_envs
         self._state = AsyncState.DEFAULT
         self._check_observation_spaces()
 
@@ -132,8 +318,10 @@ class AsyncVectorEnv(VectorEnv):
                 'for a pending call to `{0}` to complete.'.format(
                 self._state.value), self._state.value)
 
-        for pipe, seed in zip(self.parent_pipes, seeds):
-            pipe.send(('seed', seed))
+        self._seeds = list(seeds)
+        self._wake_workers()
+        for pipe, env_slice in zip(self.parent_pipes, self._worker_slices):
+            pipe.send(('seed', seeds[env_slice]))
         _, successes = zip(*[pipe.recv() for pipe in self.parent_pipes])
         self._raise_if_errors(successes)
 
@@ -144,6 +332,8 @@ class AsyncVectorEnv(VectorEnv):
                 'for a pending call to `{0}` to complete'.format(
                 self._state.value), self._state.value)
 
+        self._rotate_observations(range(len(self.parent_pipes)))
+        self._wake_workers()
         for pipe in self.parent_pipes:
             pipe.send(('reset', None))
         self._state = AsyncState.WAITING_RESET
@@ -171,30 +361,70 @@ class AsyncVectorEnv(VectorEnv):
             raise mp.TimeoutError('The call to `reset_wait` has timed out after '
                 '{0} second{1}.'.format(timeout, 's' if timeout > 1 else ''))
 
-        results, successes = zip(*[pipe.recv() for pipe in self.parent_pipes])
-        self._raise_if_errors(successes)
+        results = self._recv_results()
         self._state = AsyncState.DEFAULT
 
         if not self.shared_memory:
-            concatenate(results, self.observations, self.single_observation_space)
+            self._concatenate_observations(results, self.observations)
 
-        return deepcopy(self.observations) if self.copy else self.observations
+        return self._batch_observations()
 
-    def step_async(self, actions):
+    def step_async(self, actions, indices=None):
         """
         Parameters
         ----------
         actions : iterable of samples from `action_space`
             List of actions.
+
+        indices : iterable of int, optional
+            Indices of the environments to step, in which case `actions` only
+            contains the actions of these environments, in the same order.
+            These environments can be stepped while others are still pending,
+            and their results are received with `recv_ready`. With
+            `envs_per_worker > 1`, the environments hosted by a worker must be
+            stepped together. If `None`, then all the environments are stepped.
         """
         self._assert_is_running()
-        if self._state != AsyncState.DEFAULT:
-            raise AlreadyPendingCallError('Calling `step_async` while waiting '
-                'for a pending call to `{0}` to complete.'.format(
-                self._state.value), self._state.value)
+        if (indices is None) or (self._state == AsyncState.WAITING_RESET):
+            if self._state != AsyncState.DEFAULT:
+                raise AlreadyPendingCallError('Calling `step_async` while waiting '
+                    'for a pending call to `{0}` to complete.'.format(
+                    self._state.value), self._state.value)
+        if indices is None:
+            workers, indices = list(range(len(self.parent_pipes))), None
+        else:
+            indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+            workers = self._workers_of(indices)
+        self._rotate_observations(workers, indices)
 
-        for pipe, action in zip(self.parent_pipes, actions):
-            pipe.send(('step', action))
+        if self.shared_memory and (self._actions is not None):
+            if indices is not None:
+                self._actions[indices] = actions
+            elif isinstance(actions, np.ndarray):
+                self._actions[...] = actions
+            else:
+                self._concatenate_actions(list(actions), self._actions)
+            if self._sync is not None:
+                for worker in workers:
+                    self._step_counts[worker] = (self._step_counts[worker] + 1) & _FLAG_COUNTER_MASK
+                    self._sync.steps[worker] = self._step_counts[worker]
+                    self._sync.command_semaphores[worker].release()
+            else:
+                for worker in workers:
+                    self.parent_pipes[worker].send_bytes(_STEP_COMMAND)
+        else:
+            if not isinstance(actions, (list, tuple, np.ndarray)):
+                actions = list(actions)
+            if indices is None:
+                for pipe, env_slice in zip(self.parent_pipes, self._worker_slices):
+                    pipe.send(('step', actions[env_slice]))
+            else:
+                positions = dict((index, position)
+                    for (position, index) in enumerate(indices.tolist()))
+                for worker in workers:
+                    self.parent_pipes[worker].send(('step', [actions[positions[index]]
+                        for index in self._worker_env_indices[worker]]))
+        self._pending_workers.update(workers)
         self._state = AsyncState.WAITING_STEP
 
     def step_wait(self, timeout=None):
@@ -203,7 +433,9 @@ class AsyncVectorEnv(VectorEnv):
         ----------
         timeout : int or float, optional
             Number of seconds before the call to `step_wait` times out. If
-            `None`, the call to `step_wait` never times out.
+            `None`, the call to `step_wait` never times out. If it times out,
+            then the environments are still being stepped, and their results
+            must be received by calling `step_wait` again.
 
         Returns
         -------
@@ -223,23 +455,100 @@ class AsyncVectorEnv(VectorEnv):
         if self._state != AsyncState.WAITING_STEP:
             raise NoAsyncCallError('Calling `step_wait` without any prior call '
                 'to `step_async`.', AsyncState.WAITING_STEP.value)
+        if len(self._pending_workers) < len(self.parent_pipes):
+            raise NoAsyncCallError('Calling `step_wait` while only some of the '
+                'environments are being stepped. Their results must be received '
+                'with `recv_ready`.', AsyncState.WAITING_STEP.value)
 
-        if not self._poll(timeout):
-            self._state = AsyncState.DEFAULT
+        if self._sync is not None:
+            ready = self._wait_step_flags(timeout)
+        else:
+            ready = self._poll(timeout)
+        if not ready:
             raise mp.TimeoutError('The call to `step_wait` has timed out after '
                 '{0} second{1}.'.format(timeout, 's' if timeout > 1 else ''))
 
-        results, successes = zip(*[pipe.recv() for pipe in self.parent_pipes])
-        self._raise_if_errors(successes)
-        self._state = AsyncState.DEFAULT
-        observations_list, rewards, dones, infos = zip(*results)
+        results = self._recv_steps(range(len(self.parent_pipes)))
+        if self.shared_memory:
+            infos = tuple(results)
+            rewards, dones = np.copy(self._rewards), np.copy(self._dones)
+        else:
+            observations_list, rewards, dones, infos = zip(*results)
+            self._concatenate_observations(observations_list, self.observations)
+            rewards, dones = np.array(rewards), np.array(dones, dtype=np.bool_)
 
-        if not self.shared_memory:
-            concatenate(observations_list, self.observations,
-                self.single_observation_space)
+        return self._batch_observations(), rewards, dones, infos
+
+    def recv_ready(self, min_ready=1, timeout=None):
+        """Receives the results of the environments whose step has completed,
+        once at least `min_ready` of the environments stepped by `step_async`
+        have. The other environments keep stepping, and their results are
+        received by later calls to `recv_ready`. Meanwhile, the environments
+        received can be stepped again with `step_async(actions, indices)`.
 
-        return (deepcopy(self.observations) if self.copy else self.observations,
-                np.array(rewards), np.array(dones, dtype=np.bool_), infos)
+        Parameters
+        ----------
+        min_ready : int (default: `1`)
+            Minimum number of environments to wait for. It is capped by the
+            number of environments being stepped.
+
+        timeout : int or float, optional
+            Number of seconds before the call to `recv_ready` times out. If
+            `None`, the call to `recv_ready` never times out. If it times out,
+            then the environments are still being stepped.
+
+        Returns
+        -------
+        indices : `np.ndarray` instance (dtype `np.int64`)
+            The increasing indices of the environments whose results are returned.
+
+        observations : sample from `observation_space`
+            A batch of the observations of these environments.
+
+        rewards : `np.ndarray` instance (dtype `np.float_`)
+            A vector of the rewards of these environments.
+
+        dones : `np.ndarray` instance (dtype `np.bool_`)
+            A vector whose entries indicate whether the episode has ended.
+
+        infos : list of dict
+            A list of auxiliary diagnostic informations.
+        """
+        self._assert_is_running()
+        if self._state != AsyncState.WAITING_STEP:
+            raise NoAsyncCallError('Calling `recv_ready` without any prior call '
+                'to `step_async`.', AsyncState.WAITING_STEP.value)
+
+        min_ready = min(min_ready, sum(len(self._worker_env_indices[worker])
+            for worker in self._pending_workers))
+        workers = self._wait_ready_workers(min_ready, timeout)
+        if workers is None:
+            raise mp.TimeoutError('The call to `recv_ready` has timed out after '
+                '{0} second{1}.'.format(timeout, 's' if timeout > 1 else ''))
+
+        results = self._recv_steps(workers)
+        indices = np.array([index for worker in workers
+            for index in self._worker_env_indices[worker]], dtype=np.int64)
+        if self.shared_memory:
+            observations = self._observation_ring.take(indices, self._env_buffers[indices])
+            infos = tuple(results)
+            rewards, dones = self._rewards[indices], self._dones[indices]
+        else:
+            observations_list, rewards, dones, infos = zip(*results)
+            observations = create_empty_array(self.single_observation_space,
+                n=len(indices), fn=np.zeros)
+            self._concatenate_observations(observations_list, observations)
+            rewards, dones = np.array(rewards), np.array(dones, dtype=np.bool_)
+
+        return indices, observations, rewards, dones, infos
+
+    def step_any(self, actions, indices=None, min_ready=1, timeout=None):
+        """Steps the environments `indices` (or all of them if `None`) with
+        `actions`, and returns the results of the environments that are ready
+        once at least `min_ready` of them are. See `step_async` and `recv_ready`.
+        """
+        self.step_async(actions, indices)
+        return self.recv_ready(min_ready, timeout)
 
     def close_extras(self, timeout=None, terminate=False):
         """
@@ -259,8 +568,11 @@ class AsyncVectorEnv(VectorEnv):
             if self._state != AsyncState.DEFAULT:
                 logger.warn('Calling `close` while waiting for a pending '
                     'call to `{0}` to complete.'.format(self._state.value))
-                function = getattr(self, '{0}_wait'.format(self._state.value))
-                function(timeout)
+                if self._state == AsyncState.WAITING_STEP:
+                    self.recv_ready(self.num_envs, timeout)
+                else:
+                    function = getattr(self, '{0}_wait'.format(self._state.value))
+                    function(timeout)
         except mp.TimeoutError:
             terminate = True
 
@@ -269,8 +581,9 @@ class AsyncVectorEnv(VectorEnv):
                 if process.is_alive():
                     process.terminate()
         else:
-            for pipe in self.parent_pipes:
+            for index, pipe in enumerate(self.parent_pipes):
                 if (pipe is not None) and (not pipe.closed):
+                    self._wake_workers([index])
                     pipe.send(('close', None))
             for pipe in self.parent_pipes:
                 if (pipe is not None) and (not pipe.closed):
@@ -296,8 +609,256 @@ class AsyncVectorEnv(VectorEnv):
                 return False
         return True
 
+    def _rotate_observations(self, workers, indices=None):
+        # Moves on to the next batch of the observation ring, which `workers`
+        # write the observations of the environments `indices` into. While
+        # other environments are still being stepped, the current batch is
+        # kept, so that the observations received by `step_wait` are all in
+        # the same batch
+        if self._pending_workers:
+            buffer_index = self._observation_ring.index
+        else:
+            buffer_index = self._observation_ring.rotate()
+            self.observations = self._observation_ring.current
+        if self._buffer_indices is not None:
+            for worker in workers:
+                self._buffer_indices[worker] = buffer_index
+        if indices is None:
+            self._env_buffers[:] = buffer_index
+        else:
+            self._env_buffers[indices] = buffer_index
+
+    def _batch_observations(self):
+        if self.observation_buffers is not None:
+            return self._observation_ring.views[self._observation_ring.index]
+        return deepcopy(self.observations) if self.copy else self.observations
+
+    def _wake_workers(self, indices=None):
+        # With the 'flag' backend, the workers block on their semaphore, and
+        # must be woken up to read a command from their pipe. They are woken
+        # up before the command is sent, since sending a command larger than
+        # the buffer of the pipe blocks until the worker reads it
+        if self._sync is None:
+            return
+        if indices is None:
+            indices = range(len(self.parent_pipes))
+        for index in indices:
+            self._sync.command_semaphores[index].release()
+
+    def _wait_step_flags(self, timeout=None):
+        self._assert_is_running()
+        end_time = None if timeout is None else time.time() + timeout
+        spins = self._sync.spin_count
+        for index, semaphore in enumerate(self._sync.done_semaphores):
+            if index in self._acquired_workers:
+                continue
+            while (spins > 0) and (self._sync.dones[index] != self._step_counts[index]):
+                spins -= 1
+            if end_time is None:
+                semaphore.acquire()
+            elif not semaphore.acquire(True, max(end_time - time.time(), 0)):
+                return False
+            # A call timing out later must not acquire it again when retried
+            self._acquired_workers.add(index)
+        return True
+
+    def _workers_of(self, indices):
+        # Workers hosting the environments `indices`, which must be all the
+        # environments of these workers, and must not be pending
+        workers = sorted(set(self._env_workers[indices].tolist()))
+        pending = self._pending_workers.intersection(workers)
+        if pending:
+            raise AlreadyPendingCallError('Calling `step_async` on the '
+                'environments `{0}` while waiting for their pending call to '
+                '`step` to complete.'.format([index for worker in sorted(pending)
+                for index in self._worker_env_indices[worker]]),
+                AsyncState.WAITING_STEP.value)
+        if sorted(indices.tolist()) != [index for worker in workers
+                for index in self._worker_env_indices[worker]]:
+            raise ValueError('The environments hosted by a worker must be '
+                'stepped together, once, got the indices `{0}` with {1} '
+                'environments per worker.'.format(indices.tolist(), self.envs_per_worker))
+        return workers
+
+    def _wait_ready_workers(self, min_ready, timeout=None):
+        # Pending workers whose step has completed, once they host at least
+        # `min_ready` environments, or `None` if the call times out. With the
+        # 'flag' backend, the counters are polled.
+        end_time = None if timeout is None else time.time() + timeout
+        pending = sorted(self._pending_workers)
+        spins = 0 if self._sync is None else self._sync.spin_count
+        while True:
+            self._assert_is_running()
+            if self._sync is not None:
+                ready = [worker for worker in pending
+                    if self._sync.dones[worker] == self._step_counts[worker]]
+            else:
+                ready = [worker for worker in pending if self.parent_pipes[worker].poll()]
+            if sum(len(self._worker_env_indices[worker]) for worker in ready) >= min_ready:
+                break
+            delta = None if end_time is None else end_time - time.time()
+            if (delta is not None) and (delta <= 0):
+                return None
+            if self._sync is None:
+                _wait_for_connections([self.parent_pipes[worker] for worker in pending
+                    if worker not in ready], delta)
+            elif spins > 0:
+                spins -= 1
+            else:
+                time.sleep(_FLAG_POLL_INTERVAL)
+        if self._sync is not None:
+            for worker in ready:
+                if worker not in self._acquired_workers:
+                    self._sync.done_semaphores[worker].acquire()
+        return ready
+
+    def _recv_results(self):
+        # Each worker sends back the list of results of its environments
+        results, successes = zip(*[pipe.recv() for pipe in self.parent_pipes])
+        self._raise_if_errors(successes)
+        return [result for worker_results in results for result in worker_results]
+
+    def _recv_steps(self, workers):
+        # Results of the step of `workers`, which must have completed. In shared
+        # memory mode, the workers only send back the infos of their
+        # environments, and only if one of them is not empty. With the 'flag'
+        # backend, the statuses tell which workers have sent a message.
+        workers = list(workers)
+        results, successes = [], []
+        for worker in workers:
+            pipe = self.parent_pipes[worker]
+            if not self.shared_memory:
+                worker_results, success = pipe.recv()
+            else:
+                if (self._sync is not None) and (not self._sync.statuses[worker]):
+                    message = _STEP_DONE
+                else:
+                    message = pipe.recv_bytes()
+                if message == _STEP_DONE:
+                    worker_results = [{} for _ in self._worker_env_indices[worker]]
+                    success = True
+                else:
+                    worker_results, success = pickle.loads(message)
+            results.append(worker_results)
+            successes.append(success)
+        self._pending_workers.difference_update(workers)
+        self._acquired_workers.difference_update(workers)
+        if not self._pending_workers:
+            self._state = AsyncState.DEFAULT
+        if self.restart_workers and (not all(successes)):
+            failed_workers = [worker for (worker, success)
+                in zip(workers, successes) if not success]
+            for worker, worker_results in zip(failed_workers,
+                    self._restart_workers(failed_workers)):
+                results[workers.index(worker)] = worker_results
+        else:
+            self._raise_if_errors(successes)
+        return [result for worker_results in results for result in worker_results]
+
+    def _start_worker(self, index, restart=False):
+        parent_pipe, child_pipe = self._ctx.Pipe()
+        env_slice = self._worker_slices[index]
+        target, args = self._worker_target, (index, [CloudpickleWrapper(env_fn)
+            for env_fn in self.env_fns[env_slice]], child_pipe, parent_pipe,
+            self._shared_memory_buffers, self.error_queue,
+            self._worker_env_indices[index])
+        if self._worker_placements is not None:
+            placement = self._worker_placements[index]
+            if restart:
+                # The slices of a restarted worker may hold observations
+                # returned as read-only views, which must not be overwritten
+                placement = placement._replace(first_touch=False)
+            target, args = _placed_worker, (placement, self._worker_target) + args
+        with clear_mpi_env_vars():
+            process = self._ctx.Process(target=target,
+                name='Worker<{0}>-{1}'.format(type(self).__name__, index),
+                args=args)
+            process.daemon = self._daemon
+            process.start()
+        child_pipe.close()
+        return parent_pipe, process
+
+    def _get_worker_placements(self, worker_affinity, worker_threads, num_buffers):
+        num_workers = len(self._worker_slices)
+        if (worker_affinity is None) and (worker_threads is None):
+            return None
+        if worker_affinity is None:
+            cores = [None] * num_workers
+        elif not hasattr(os, 'sched_setaffinity'):
+            raise ValueError('`worker_affinity` requires `os.sched_setaffinity`, '
+                'which is not available on this platform.')
+        elif worker_affinity == 'auto':
+            # The workers are spread over the NUMA nodes in turn, and over the
+            # cores of each node
+            available_cores = set(os.sched_getaffinity(0))
+            nodes = [[core for core in node if core in available_cores]
+                for node in (numa_nodes() or [])]
+            nodes = [node for node in nodes if node] or [sorted(available_cores)]
+            cores = [[nodes[index % len(nodes)][(index // len(nodes))
+                % len(nodes[index % len(nodes)])]] for index in range(num_workers)]
+        else:
+            cores = [sorted(worker_cores) for worker_cores in worker_affinity]
+            if len(cores) != num_workers:
+                raise ValueError('`worker_affinity` must contain the cores of '
+                    'each of the {0} workers, got {1} sets of cores.'.format(
+                    num_workers, len(cores)))
+        return [_WorkerPlacement(cores=worker_cores, num_threads=worker_threads
+            or (worker_cores and len(worker_cores)),
+            first_touch=self.shared_memory and (worker_cores is not None),
+            num_buffers=num_buffers) for worker_cores in cores]
+
+    def _restart_workers(self, workers):
+        # Replaces the processes of `workers`, which have failed during a step,
+        # and returns the results of this step for their environments
+        for _ in workers:
+            index, exctype, value = self.error_queue.get()
+            logger.warn('Received the following error from Worker-{0}: '
+                '{1}: {2}'.format(index, exctype.__name__, value))
+            logger.warn('Restarting Worker-{0}.'.format(index))
+
+        results = []
+        for worker in workers:
+            self.parent_pipes[worker].close()
+            self.processes[worker].join(1.)
+            if self.processes[worker].is_alive():
+                self.processes[worker].terminate()
+                self.processes[worker].join()
+            if self._sync is not None:
+                self._step_counts[worker] = 0
+                self._sync.steps[worker] = self._sync.dones[worker] = 0
+                self._sync.command_semaphores[worker] = self._ctx.Semaphore(0)
+                self._sync.done_semaphores[worker] = self._ctx.Semaphore(0)
+            self.parent_pipes[worker], self.processes[worker] = self._start_worker(worker,
+                restart=True)
+            self.worker_restart_counts[worker] += 1
+
+            env_slice = self._worker_slices[worker]
+            seeds = [seed if seed is None else seed + self.num_envs
+                * self.worker_restart_counts[worker] for seed in self._seeds[env_slice]]
+            pipe = self.parent_pipes[worker]
+            self._wake_workers([worker])
+            pipe.send(('seed', seeds))
+            _, success = pipe.recv()
+            self._raise_if_errors([success])
+            self._wake_workers([worker])
+            pipe.send(('reset', None))
+            observations, success = pipe.recv()
+            self._raise_if_errors([success])
+
+            info = {'worker_restarted': True}
+            if self.shared_memory:
+                env_indices = self._worker_env_indices[worker]
+                self._rewards[env_indices] = 0.
+                self._dones[env_indices] = True
+                results.append([dict(info) for _ in env_indices])
+            else:
+                results.append([(observation, 0., True, dict(info))
+                    for observation in observations])
+        return results
+
     def _check_observation_spaces(self):
         self._assert_is_running()
+        self._wake_workers()
         for pipe in self.parent_pipes:
             pipe.send(('_check_observation_space', self.single_observation_space))
         same_spaces, successes = zip(*[pipe.recv() for pipe in self.parent_pipes])
@@ -317,7 +878,7 @@ class AsyncVectorEnv(VectorEnv):
         if all(successes):
             return
 
-        num_errors = self.num_envs - sum(successes)
+        num_errors = len(successes) - sum(successes)
         assert num_errors > 0
         for _ in range(num_errors):
             index, exctype, value = self.error_queue.get()
@@ -331,29 +892,63 @@ class AsyncVectorEnv(VectorEnv):
         raise exctype(value)
 
 
-def _worker(index, env_fn, pipe, parent_pipe, shared_memory, error_queue):
+def _placed_worker(placement, target, index, env_fns, pipe, parent_pipe,
+                   shared_memory, error_queue, env_indices):
+    # Pins the worker, limits its threads and first-touches its slices of the
+    # observations, before running the actual worker `target`
+    if placement.cores is not None:
+        os.sched_setaffinity(0, placement.cores)
+    if placement.num_threads is not None:
+        limit_threads(placement.num_threads)
+    if placement.first_touch:
+        num_envs = len(shared_memory.rewards)
+        for buffer in _shared_arrays(shared_memory.observations):
+            data = np.frombuffer(buffer.get_obj(), dtype=np.uint8)
+            size = data.size // (placement.num_buffers * num_envs)
+            for offset in range(0, placement.num_buffers * num_envs, num_envs):
+                for env_index in env_indices:
+                    start = (offset + env_index) * size
+                    data[start:start + size] = 0
+    target(index, env_fns, pipe, parent_pipe, shared_memory, error_queue, env_indices)
+
+
+def _shared_arrays(shared_memory):
+    # The `multiprocessing.Array` instances of a nested shared memory object
+    if isinstance(shared_memory, tuple):
+        return [array for memory in shared_memory for array in _shared_arrays(memory)]
+    elif isinstance(shared_memory, dict):
+        return [array for memory in shared_memory.values()
+            for array in _shared_arrays(memory)]
+    return [shared_memory]
+
+
+def _worker(index, env_fns, pipe, parent_pipe, shared_memory, error_queue, env_indices):
     assert shared_memory is None
-    env = env_fn()
+    envs = [env_fn() for env_fn in env_fns]
     parent_pipe.close()
     try:
         while True:
             command, data = pipe.recv()
             if command == 'reset':
-                observation = env.reset()
-                pipe.send((observation, True))
+                observations = [env.reset() for env in envs]
+                pipe.send((observations, True))
             elif command == 'step':
-                observation, reward, done, info = env.step(data)
-                if done:
-                    observation = env.reset()
-                pipe.send(((observation, reward, done, info), True))
+                results = []
+                for env, action in zip(envs, data):
+                    observation, reward, done, info = env.step(action)
+                    if done:
+                        observation = env.reset()
+                    results.append((observation, reward, done, info))
+                pipe.send((results, True))
             elif command == 'seed':
-                env.seed(data)
+                for env, seed in zip(envs, data):
+                    env.seed(seed)
                 pipe.send((None, True))
             elif command == 'close':
                 pipe.send((None, True))
                 break
             elif command == '_check_observation_space':
-                pipe.send((data == env.observation_space, True))
+                pipe.send((all(data == env.observation_space for env in envs), True))
             else:
                 raise RuntimeError('Received unknown command `{0}`. Must '
                     'be one of {`reset`, `step`, `seed`, `close`, '
@@ -362,37 +957,87 @@ def _worker(index, env_fn, pipe, parent_pipe, shared_memory, error_queue):
         error_queue.put((index,) + sys.exc_info()[:2])
         pipe.send((None, False))
     finally:
-        env.close()
+        for env in envs:
+            env.close()
 
 
-def _worker_shared_memory(index, env_fn, pipe, parent_pipe, shared_memory, error_queue):
+def _worker_shared_memory(index, env_fns, pipe, parent_pipe, shared_memory, error_queue, env_indices):
     assert shared_memory is not None
-    env = env_fn()
-    observation_space = env.observation_space
+    envs = [env_fn() for env_fn in env_fns]
+    observation_space = envs[0].observation_space
+    action_space = envs[0].action_space
+    num_envs = len(np.frombuffer(shared_memory.rewards.get_obj(), dtype=np.float64))
+    actions = None
+    if shared_memory.actions is not None:
+        actions = read_from_shared_memory(shared_memory.actions, action_space, n=num_envs)
+    rewards = np.frombuffer(shared_memory.rewards.get_obj(), dtype=np.float64)
+    dones = np.frombuffer(shared_memory.dones.get_obj(), dtype=np.bool_)
+    sync, step_count = shared_memory.sync, 0
+    write_observation = SharedMemoryWritePlan(shared_memory.observations,
+        observation_space)
     parent_pipe.close()
+    command = None
     try:
         while True:
-            command, data = pipe.recv()
+            if sync is not None:
+                # Busy-wait for a step, then block until the parent either
+                # starts a step or sends a command through the pipe
+                for _ in range(sync.spin_count):
+                    if sync.steps[index] != step_count:
+                        break
+                sync.command_semaphores[index].acquire()
+                if sync.steps[index] != step_count:
+                    step_count = sync.steps[index]
+                    message = _STEP_COMMAND
+                else:
+                    message = pipe.recv_bytes()
+            else:
+                message = pipe.recv_bytes()
+            if message == _STEP_COMMAND:
+                command, data = 'step', None
+            else:
+                command, data = pickle.loads(message)
+            offset = shared_memory.buffer_indices[index] * num_envs
             if command == 'reset':
-                observation = env.reset()
-                write_to_shared_memory(index, observation, shared_memory,
-                                       observation_space)
-                pipe.send((None, True))
-            elif command == 'step':
-                observation, reward, done, info = env.step(data)
-                if done:
+                for env_index, env in zip(env_indices, envs):
                     observation = env.reset()
-                write_to_shared_memory(index, observation, shared_memory,
-                                       observation_space)
-                pipe.send(((None, reward, done, info), True))
+                    write_observation(offset + env_index, observation)
+                pipe.send(([None] * len(envs), True))
+            elif command == 'step':
+                infos = []
+                for i, (env_index, env) in enumerate(zip(env_indices, envs)):
+                    if data is None:
+                        # Copy the action out of the shared buffer, which is
+                        # overwritten by the next call to `step_async`
+                        action = actions[env_index]
+                        if isinstance(action, np.ndarray):
+                            action = action.copy()
+                        else:
+                            action = action.item()
+                    else:
+                        action = data[i]
+                    observation, reward, done, info = env.step(action)
+                    if done:
+                        observation = env.reset()
+                    write_observation(offset + env_index, observation)
+                    rewards[env_index] = reward
+                    dones[env_index] = done
+                    infos.append(info)
+                if any(infos):
+                    pipe.send((infos, True))
+                elif sync is None:
+                    pipe.send_bytes(_STEP_DONE)
+                if sync is not None:
+                    _signal_step_done(sync, index, step_count, any(infos))
             elif command == 'seed':
-                env.seed(data)
+                for env, seed in zip(envs, data):
+                    env.seed(seed)
                 pipe.send((None, True))
             elif command == 'close':
                 pipe.send((None, True))
                 break
             elif command == '_check_observation_space':
-                pipe.send((data == observation_space, True))
+                pipe.send((all(data == env.observation_space for env in envs), True))
             else:
                 raise RuntimeError('Received unknown command `{0}`. Must '
                     'be one of {`reset`, `step`, `seed`, `close`, '
@@ -400,5 +1045,14 @@ def _worker_shared_memory(index, env_fn, pipe, parent_pipe, shared_memory, error
     except (KeyboardInterrupt, Exception):
         error_queue.put((index,) + sys.exc_info()[:2])
         pipe.send((None, False))
+        if (sync is not None) and (command == 'step'):
+            _signal_step_done(sync, index, step_count, True)
     finally:
-        env.close()
+        for env in envs:
+            env.close()
+
+
+def _signal_step_done(sync, index, step_count, has_message):
+    sync.statuses[index] = has_message
+    sync.dones[index] = step_count
+    sync.done_semaphores[index].release()
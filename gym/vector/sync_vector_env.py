@@ -3,7 +3,7 @@ from copy import deepcopy
 
 from gym import logger
 from gym.vector.vector_env import VectorEnv
-from gym.vector.utils import concatenate, create_empty_array
+from gym.vector.utils import ConcatenatePlan, ObservationRing
 
 __all__ = ['SyncVectorEnv']
 
@@ -27,12 +27,21 @@ class SyncVectorEnv(VectorEnv):
     copy : bool (default: `True`)
         If `True`, then the `reset` and `step` methods return a copy of the
         observations.
+
+    observation_buffers : int, optional
+        If not `None`, then the observations are written in turn into
+        `observation_buffers` batches, and the `reset` and `step` methods
+        return a read-only view of the batch just written instead of a copy.
+        This view is valid until the batch is written again,
+        `observation_buffers` calls to `reset` or `step` later. `copy` is
+        then ignored.
     """
     def __init__(self, env_fns, observation_space=None, action_space=None,
-                 copy=True):
+                 copy=True, observation_buffers=None):
         self.env_fns = env_fns
         self.envs = [env_fn() for env_fn in env_fns]
         self.copy = copy
+        self.observation_buffers = observation_buffers
         
         if (observation_space is None) or (action_space is None):
             observation_space = observation_space or self.envs[0].observation_space
@@ -41,8 +50,10 @@ class SyncVectorEnv(VectorEnv):
             observation_space=observation_space, action_space=action_space)
 
         self._check_observation_spaces()
-        self.observations = create_empty_array(self.single_observation_space,
-            n=self.num_envs, fn=np.zeros)
+        self._observation_ring = ObservationRing(self.single_observation_space,
+            self.num_envs, observation_buffers or 1)
+        self.observations = self._observation_ring.current
+        self._concatenate = ConcatenatePlan(self.single_observation_space)
         self._rewards = np.zeros((self.num_envs,), dtype=np.float64)
         self._dones = np.zeros((self.num_envs,), dtype=np.bool_)
         self._actions = None
@@ -63,9 +74,10 @@ class SyncVectorEnv(VectorEnv):
         for env in self.envs:
             observation = env.reset()
             observations.append(observation)
-        concatenate(observations, self.observations, self.single_observation_space)
+        self._rotate_observations()
+        self._concatenate(observations, self.observations)
 
-        return np.copy(self.observations) if self.copy else self.observations
+        return self._batch_observations()
 
     def step_async(self, actions):
         self._actions = actions
@@ -78,14 +90,24 @@ class SyncVectorEnv(VectorEnv):
                 observation = env.reset()
             observations.append(observation)
             infos.append(info)
-        concatenate(observations, self.observations, self.single_observation_space)
+        self._rotate_observations()
+        self._concatenate(observations, self.observations)
 
-        return (deepcopy(self.observations) if self.copy else self.observations,
-            np.copy(self._rewards), np.copy(self._dones), infos)
+        return (self._batch_observations(), np.copy(self._rewards),
+            np.copy(self._dones), infos)
 
     def close_extras(self, **kwargs):
         [env.close() for env in self.envs]
 
+    def _rotate_observations(self):
+        self._observation_ring.rotate()
+        self.observations = self._observation_ring.current
+
+    def _batch_observations(self):
+        if self.observation_buffers is not None:
+            return self._observation_ring.views[self._observation_ring.index]
+        return deepcopy(self.observations) if self.copy else self.observations
+
     def _check_observation_spaces(self):
         for env in self.envs:
             if not (env.observation_space == self.single_observation_space):
@@ -1,13 +1,18 @@
 import pytest
 import numpy as np
+import os
+
+from copy import deepcopy
 
 from multiprocessing import TimeoutError
 from gym.spaces import Box
 from gym.error import (AlreadyPendingCallError, NoAsyncCallError,
                        ClosedEnvironmentError)
-from gym.vector.tests.utils import make_env, make_slow_env
+from gym.vector.tests.utils import (make_env, make_slow_env, make_space_env,
+                                    spaces, UnittestInfoEnv)
 
 from gym.vector.async_vector_env import AsyncVectorEnv
+from gym.vector.sync_vector_env import SyncVectorEnv
 
 @pytest.mark.parametrize('shared_memory', [True, False])
 def test_create_async_vector_env(shared_memory):
@@ -194,3 +199,359 @@ def test_check_observations_async_vector_env(shared_memory):
     with pytest.raises(RuntimeError):
         env = AsyncVectorEnv(env_fns, shared_memory=shared_memory)
         env.close(terminate=True)
+
+
+@pytest.mark.parametrize('shared_memory', [True, False])
+def test_envs_per_worker_async_vector_env(shared_memory):
+    env_fns = [make_env('CubeCrash-v0', i) for i in range(8)]
+    try:
+        env = AsyncVectorEnv(env_fns, shared_memory=shared_memory,
+                             envs_per_worker=3)
+        assert len(env.processes) == 3
+        observations = env.reset()
+        assert observations.shape == (8,) + env.single_observation_space.shape
+        observations, rewards, dones, infos = env.step(env.action_space.sample())
+    finally:
+        env.close()
+
+    assert observations.shape == (8,) + env.single_observation_space.shape
+    assert rewards.shape == (8,)
+    assert dones.shape == (8,)
+    assert len(infos) == 8
+
+
+@pytest.mark.parametrize('shared_memory,sync_backend',
+    [(True, 'pipe'), (False, 'pipe'), (True, 'flag')])
+@pytest.mark.parametrize('envs_per_worker', [1, 2])
+def test_step_infos_async_vector_env(shared_memory, sync_backend, envs_per_worker):
+    env_fns = [lambda i=i: UnittestInfoEnv(info_every=i + 2) for i in range(4)]
+    try:
+        env = AsyncVectorEnv(env_fns, shared_memory=shared_memory,
+                             envs_per_worker=envs_per_worker,
+                             sync_backend=sync_backend, spin_count=10)
+        env.reset()
+        for step in range(1, 11):
+            actions = np.full((4, 2), 0.1 * step)
+            observations, rewards, dones, infos = env.step(actions)
+            # The actions buffer may be modified once `step` has returned
+            actions[:] = 0.
+
+            assert np.all(observations == (0. if step % 5 == 0 else 0.1 * step))
+            assert rewards.dtype == np.float64
+            assert np.allclose(rewards, 0.2 * step)
+            assert dones.dtype == np.bool_
+            assert np.all(dones == (step % 5 == 0))
+            steps = (step - 1) % 5 + 1
+            assert infos == tuple({'steps': steps} if steps % (i + 2) == 0 else {}
+                                  for i in range(4))
+    finally:
+        env.close()
+
+
+@pytest.mark.parametrize('spin_count', [0, 100000])
+def test_flag_sync_backend_async_vector_env(spin_count):
+    env_fns = [lambda: UnittestInfoEnv() for _ in range(4)]
+    try:
+        env = AsyncVectorEnv(env_fns, sync_backend='flag', spin_count=spin_count)
+        env.seed(0)
+        env.reset()
+        for _ in range(10):
+            observations, rewards, dones, infos = env.step(env.action_space.sample())
+        assert observations.shape == (4, 2)
+        env.reset()
+
+        actions = np.zeros((4, 2))
+        actions[2] = np.nan
+        with pytest.raises(ValueError):
+            env.step(actions)
+    finally:
+        env.close(terminate=True)
+
+
+def test_flag_sync_backend_step_timeout_async_vector_env():
+    env_fns = [make_slow_env(0., i) for i in range(4)]
+    with pytest.raises(TimeoutError):
+        try:
+            env = AsyncVectorEnv(env_fns, sync_backend='flag')
+            env.reset()
+            env.step_async([0.1, 0.1, 0.3, 0.1])
+            env.step_wait(timeout=0.1)
+        finally:
+            env.close(terminate=True)
+
+
+@pytest.mark.parametrize('shared_memory,sync_backend',
+    [(True, 'pipe'), (False, 'pipe'), (True, 'flag')])
+def test_step_timeout_retry_async_vector_env(shared_memory, sync_backend):
+    import time
+    env_fns = [make_slow_env(0., i) for i in range(4)]
+    try:
+        env = AsyncVectorEnv(env_fns, shared_memory=shared_memory,
+                             sync_backend=sync_backend)
+        env.reset()
+        env.step_async([0.01, 0.01, 0.3, 0.01])
+        with pytest.raises(TimeoutError):
+            env.step_wait(timeout=0.1)
+        # The step is still pending, and the wait can be retried
+        with pytest.raises(AlreadyPendingCallError):
+            env.step_async([0., 0., 0., 0.])
+        observations, _, _, _ = env.step_wait()
+        assert observations.shape == (4,) + env.single_observation_space.shape
+
+        # No result of the step which timed out is left to be received, so
+        # the next step waits for the last environment
+        start = time.time()
+        env.step_async([0., 0., 0., 0.3])
+        env.step_wait()
+        assert time.time() - start >= 0.25
+    finally:
+        env.close(terminate=True)
+
+
+def test_flag_sync_backend_large_commands_async_vector_env():
+    # The observation space sent to the workers does not fit in a pipe buffer
+    space = Box(low=0, high=255, shape=(256, 256, 3), dtype=np.uint8)
+    env_fns = [make_space_env(space, i) for i in range(2)]
+    try:
+        env = AsyncVectorEnv(env_fns, sync_backend='flag')
+        env.seed(0)
+        observations = env.reset()
+    finally:
+        env.close()
+
+    assert observations.shape == (2, 256, 256, 3)
+
+
+def test_flag_sync_backend_requires_shared_memory():
+    env_fns = [make_env('CubeCrash-v0', i) for i in range(2)]
+    with pytest.raises(ValueError):
+        AsyncVectorEnv(env_fns, shared_memory=False, sync_backend='flag')
+    with pytest.raises(ValueError):
+        AsyncVectorEnv(env_fns, sync_backend='futex')
+
+
+@pytest.mark.parametrize('shared_memory,sync_backend',
+    [(True, 'pipe'), (False, 'pipe'), (True, 'flag')])
+def test_step_any_async_vector_env(shared_memory, sync_backend):
+    env_fns = [make_slow_env(0., i) for i in range(4)]
+    try:
+        env = AsyncVectorEnv(env_fns, shared_memory=shared_memory,
+                             sync_backend=sync_backend, spin_count=10)
+        env.reset()
+        indices, observations, rewards, dones, infos = env.step_any(
+            [0.5, 0., 0.5, 0.], min_ready=2)
+        assert indices.tolist() == [1, 3]
+        assert observations.shape == (2,) + env.single_observation_space.shape
+        assert rewards.shape == (2,)
+        assert dones.shape == (2,)
+        assert len(infos) == 2
+
+        # The fast environments are stepped again while the others are pending
+        with pytest.raises(AlreadyPendingCallError):
+            env.step_async([0.], indices=[0])
+        with pytest.raises(NoAsyncCallError):
+            env.step_wait()
+        env.step_async([0., 0.], indices=indices)
+        indices, observations, _, _, _ = env.recv_ready(min_ready=4)
+        assert indices.tolist() == [0, 1, 2, 3]
+        assert observations.shape == (4,) + env.single_observation_space.shape
+
+        with pytest.raises(NoAsyncCallError):
+            env.recv_ready()
+    finally:
+        env.close()
+
+
+@pytest.mark.parametrize('shared_memory', [True, False])
+def test_step_async_indices_async_vector_env(shared_memory):
+    env_fns = [make_env('CubeCrash-v0', i) for i in range(4)]
+    try:
+        async_env = AsyncVectorEnv(env_fns, shared_memory=shared_memory,
+                                   envs_per_worker=2)
+        sync_env = SyncVectorEnv(env_fns)
+        async_env.seed(0)
+        sync_env.seed(0)
+        async_env.reset()
+        sync_env.reset()
+
+        with pytest.raises(ValueError):
+            async_env.step_async([0], indices=[1])
+        for _ in range(10):
+            actions = async_env.action_space.sample()
+            async_env.step_async(actions[2:], indices=[2, 3])
+            async_env.step_async(actions[:2], indices=[0, 1])
+            indices, observations, rewards, dones, _ = async_env.recv_ready(min_ready=4)
+            sync_observations, sync_rewards, sync_dones, _ = sync_env.step(actions)
+
+            assert indices.tolist() == [0, 1, 2, 3]
+            assert np.all(observations == sync_observations)
+            assert np.all(rewards == sync_rewards)
+            assert np.all(dones == sync_dones)
+    finally:
+        async_env.close()
+        sync_env.close()
+
+
+@pytest.mark.parametrize('shared_memory', [True, False])
+def test_observation_buffers_async_vector_env(shared_memory):
+    env_fns = [make_space_env(spaces[-1], i) for i in range(4)]
+    try:
+        env = AsyncVectorEnv(env_fns, shared_memory=shared_memory,
+                             observation_buffers=2)
+        first = env.reset()
+        first_copy = deepcopy(first)
+        second, _, _, _ = env.step(env.action_space.sample())
+        second_copy = deepcopy(second)
+        assert first in env.observation_space
+        assert second in env.observation_space
+        assert not first['velocity'][1].flags.writeable
+
+        # The first batch is still valid after one step
+        assert np.all(first['position']['x'] == first_copy['position']['x'])
+        assert np.all(first['velocity'][1] == first_copy['velocity'][1])
+
+        indices, observations, _, _, _ = env.step_any(
+            env.action_space.sample()[:2], indices=[0, 1], min_ready=2)
+        assert indices.tolist() == [0, 1]
+        assert observations['position']['y'].shape == (2,)
+        assert np.all(second['position']['y'] == second_copy['position']['y'])
+        assert np.all(second['velocity'][0] == second_copy['velocity'][0])
+    finally:
+        env.close()
+
+
+@pytest.mark.parametrize('shared_memory,sync_backend',
+    [(True, 'pipe'), (False, 'pipe'), (True, 'flag')])
+def test_observation_buffers_partial_steps_async_vector_env(shared_memory, sync_backend):
+    env_fns = [lambda: UnittestInfoEnv(info_every=100) for _ in range(4)]
+    try:
+        env = AsyncVectorEnv(env_fns, shared_memory=shared_memory,
+                             sync_backend=sync_backend, observation_buffers=2)
+        env.reset()
+        first, _, _, _ = env.step(np.full((4, 2), 0.25))
+
+        env.step_async(np.full((2, 2), 0.5), indices=[0, 1])
+        env.step_async(np.full((2, 2), 0.75), indices=[2, 3])
+        observations, _, _, _ = env.step_wait()
+        assert np.all(observations[:2] == 0.5)
+        assert np.all(observations[2:] == 0.75)
+        assert np.all(first == 0.25)
+    finally:
+        env.close()
+
+
+@pytest.mark.parametrize('shared_memory,sync_backend',
+    [(True, 'pipe'), (False, 'pipe'), (True, 'flag')])
+@pytest.mark.parametrize('envs_per_worker', [1, 2])
+def test_restart_workers_async_vector_env(shared_memory, sync_backend, envs_per_worker):
+    env_fns = [lambda: UnittestInfoEnv(info_every=100) for _ in range(4)]
+    try:
+        env = AsyncVectorEnv(env_fns, shared_memory=shared_memory,
+                             sync_backend=sync_backend, envs_per_worker=envs_per_worker,
+                             restart_workers=True)
+        env.seed(0)
+        env.reset()
+        env.step(np.full((4, 2), 0.5))
+
+        actions = np.full((4, 2), 0.5)
+        actions[2] = np.nan
+        observations, rewards, dones, infos = env.step(actions)
+        restarted = [2 // envs_per_worker * envs_per_worker + i
+                     for i in range(envs_per_worker)]
+        for i in range(4):
+            if i in restarted:
+                assert np.all(observations[i] == 0.)
+                assert rewards[i] == 0.
+                assert dones[i]
+                assert infos[i] == {'worker_restarted': True}
+            else:
+                assert np.all(observations[i] == 0.5)
+                assert rewards[i] == 1.
+                assert not dones[i]
+                assert infos[i] == {}
+        assert sum(env.worker_restart_counts) == 1
+        assert env.worker_restart_counts[2 // envs_per_worker] == 1
+
+        observations, rewards, dones, infos = env.step(np.full((4, 2), 0.25))
+        assert np.all(observations == 0.25)
+        assert infos == ({},) * 4
+    finally:
+        env.close()
+
+
+@pytest.mark.skipif(not hasattr(os, 'sched_setaffinity'),
+                    reason='`os.sched_setaffinity` is not available')
+@pytest.mark.parametrize('shared_memory', [True, False])
+def test_worker_affinity_async_vector_env(shared_memory):
+    cores = sorted(os.sched_getaffinity(0))
+    env_fns = [make_env('CubeCrash-v0', i) for i in range(4)]
+    try:
+        env = AsyncVectorEnv(env_fns, shared_memory=shared_memory,
+                             envs_per_worker=2, worker_affinity='auto',
+                             observation_buffers=2)
+        for index, process in enumerate(env.processes):
+            placement = env._worker_placements[index]
+            assert len(placement.cores) == 1
+            assert placement.first_touch == shared_memory
+            assert os.sched_getaffinity(process.pid) == set(placement.cores)
+        env.reset()
+        observations, _, _, _ = env.step(env.action_space.sample())
+        assert observations.shape == (4,) + env.single_observation_space.shape
+    finally:
+        env.close()
+
+    # The observations first-touched by the workers are valid for every space
+    env_fns = [make_space_env(spaces[-1], i) for i in range(4)]
+    try:
+        env = AsyncVectorEnv(env_fns, shared_memory=shared_memory,
+                             worker_affinity='auto', observation_buffers=2)
+        assert env.reset() in env.observation_space
+        observations, _, _, _ = env.step(env.action_space.sample())
+        assert observations in env.observation_space
+    finally:
+        env.close()
+
+    try:
+        env = AsyncVectorEnv(env_fns, worker_affinity=[cores] * 4, worker_threads=1)
+        for process in env.processes:
+            assert os.sched_getaffinity(process.pid) == set(cores)
+    finally:
+        env.close()
+
+    with pytest.raises(ValueError):
+        AsyncVectorEnv(env_fns, worker_affinity=[cores])
+
+
+@pytest.mark.skipif(not hasattr(os, 'sched_setaffinity'),
+                    reason='`os.sched_setaffinity` is not available')
+def test_worker_affinity_numa_nodes_async_vector_env(monkeypatch):
+    from gym.vector import async_vector_env
+    env_fns = [make_env('CubeCrash-v0', i) for i in range(7)]
+    try:
+        env = AsyncVectorEnv(env_fns)
+        # Two nodes with interleaved cores, of which core 6 is not available
+        monkeypatch.setattr(async_vector_env, 'numa_nodes', lambda: [[0, 2, 4, 6], [1, 3]])
+        monkeypatch.setattr(async_vector_env.os, 'sched_getaffinity',
+                            lambda pid: {0, 1, 2, 3, 4})
+        placements = env._get_worker_placements('auto', None, 1)
+        assert [placement.cores for placement in placements] == \
+            [[0], [1], [2], [3], [4], [1], [0]]
+
+        monkeypatch.setattr(async_vector_env, 'numa_nodes', lambda: None)
+        placements = env._get_worker_placements('auto', None, 1)
+        assert [placement.cores for placement in placements] == \
+            [[0], [1], [2], [3], [4], [0], [1]]
+    finally:
+        env.close()
+
+
+def test_numa_nodes(tmpdir, monkeypatch):
+    from gym.vector.utils import misc
+    for name, cpulist in [('node0', '0-3,8-11'), ('node1', '4-7,12'), ('node10', '13')]:
+        tmpdir.mkdir(name).join('cpulist').write(cpulist + '\n')
+    tmpdir.mkdir('power')
+    monkeypatch.setattr(misc, 'NUMA_NODES_DIR', str(tmpdir))
+    assert misc.numa_nodes() == [[0, 1, 2, 3, 8, 9, 10, 11], [4, 5, 6, 7, 12], [13]]
+
+    monkeypatch.setattr(misc, 'NUMA_NODES_DIR', str(tmpdir.join('missing')))
+    assert misc.numa_nodes() is None
@@ -7,7 +7,8 @@ from gym.spaces import Tuple, Dict
 from gym.vector.utils.spaces import _BaseGymSpaces
 from gym.vector.tests.utils import spaces
 
-from gym.vector.utils.numpy_utils import concatenate, create_empty_array
+from gym.vector.utils.numpy_utils import (concatenate, ConcatenatePlan,
+    create_empty_array)
 
 @pytest.mark.parametrize('space', spaces,
     ids=[space.__class__.__name__ for space in spaces])
@@ -50,6 +51,22 @@ def test_concatenate(space):
     assert_nested_equal(array, samples, n=8)
 
 
+@pytest.mark.parametrize('space', spaces,
+    ids=[space.__class__.__name__ for space in spaces])
+def test_concatenate_plan(space):
+    samples = [space.sample() for _ in range(8)]
+    expected = concatenate(samples, create_empty_array(space, n=8), space)
+    plan = ConcatenatePlan(space)
+    array = create_empty_array(space, n=8)
+    for _ in range(2):
+        assert plan(samples, array) is array
+        for path in plan.paths:
+            lhs, rhs = array, expected
+            for key in path:
+                lhs, rhs = lhs[key], rhs[key]
+            assert np.all(lhs == rhs)
+
+
 @pytest.mark.parametrize('n', [1, 8])
 @pytest.mark.parametrize('space', spaces,
     ids=[space.__class__.__name__ for space in spaces])
@@ -0,0 +1,50 @@
+import pytest
+import numpy as np
+
+from gym.spaces import Tuple, Dict
+from gym.vector.tests.utils import spaces
+from gym.vector.utils.spaces import _BaseGymSpaces
+from gym.vector.utils import ObservationRing, concatenate, create_empty_array
+
+
+def _leaves(batch, space):
+    if isinstance(space, _BaseGymSpaces):
+        return [batch]
+    elif isinstance(space, Tuple):
+        return [leaf for (subbatch, subspace) in zip(batch, space.spaces)
+                for leaf in _leaves(subbatch, subspace)]
+    elif isinstance(space, Dict):
+        return [leaf for (key, subspace) in space.spaces.items()
+                for leaf in _leaves(batch[key], subspace)]
+
+
+def _batch(items, space):
+    return concatenate(items, create_empty_array(space, n=len(items)), space)
+
+
+@pytest.mark.parametrize('space', spaces, ids=[space.__class__.__name__ for space in spaces])
+def test_observation_ring(space):
+    ring = ObservationRing(space, n=4, num_buffers=3)
+    samples = [[space.sample() for _ in range(4)] for _ in range(3)]
+    views = []
+    for k in range(3):
+        concatenate(samples[k], ring.current, space)
+        views.append(ring.views[ring.index])
+        assert ring.rotate() == (k + 1) % 3
+
+    # The views of the previous batches are not overwritten
+    for view, items in zip(views, samples):
+        for leaf, expected in zip(_leaves(view, space), _leaves(_batch(items, space), space)):
+            assert not leaf.flags.writeable
+            assert np.all(leaf == expected)
+
+    taken = ring.take([1, 3], [2, 0])
+    expected_taken = _batch([samples[2][1], samples[0][3]], space)
+    for leaf, expected in zip(_leaves(taken, space), _leaves(expected_taken, space)):
+        assert leaf.flags.writeable
+        assert np.all(leaf == expected)
+
+
+def test_observation_ring_invalid_num_buffers():
+    with pytest.raises(ValueError):
+        ObservationRing(spaces[0], n=2, num_buffers=0)
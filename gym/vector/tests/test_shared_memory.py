@@ -7,12 +7,12 @@ from multiprocessing.sharedctypes import SynchronizedArray
 from multiprocessing import Array, Process
 from collections import OrderedDict
 
-from gym.spaces import Tuple, Dict
+from gym.spaces import Box, Tuple, Dict
 from gym.vector.utils.spaces import _BaseGymSpaces
 from gym.vector.tests.utils import spaces
 
 from gym.vector.utils.shared_memory import (create_shared_memory,
-    read_from_shared_memory, write_to_shared_memory)
+    read_from_shared_memory, write_to_shared_memory, SharedMemoryWritePlan)
 
 is_python_2 = (sys.version_info < (3, 0))
 
@@ -37,7 +37,8 @@ expected_types = [
     pytest.param('fork', marks=pytest.mark.skipif(is_python_2, reason='Requires Python 3')),
     pytest.param('spawn', marks=pytest.mark.skipif(is_python_2, reason='Requires Python 3'))],
     ids=['default', 'fork', 'spawn'])
-def test_create_shared_memory(space, expected_type, n, ctx):
+@pytest.mark.parametrize('zero_fill', [True, False])
+def test_create_shared_memory(space, expected_type, n, ctx, zero_fill):
     def assert_nested_type(lhs, rhs, n):
         assert type(lhs) == type(rhs)
         if isinstance(lhs, (list, tuple)):
@@ -60,7 +61,7 @@ def test_create_shared_memory(space, expected_type, n, ctx):
             raise TypeError('Got unknown type `{0}`.'.format(type(lhs)))
 
     ctx = mp if (ctx is None) else mp.get_context(ctx)
-    shared_memory = create_shared_memory(space, n=n, ctx=ctx)
+    shared_memory = create_shared_memory(space, n=n, ctx=ctx, zero_fill=zero_fill)
     assert_nested_type(shared_memory, expected_type, n=n)
 
 
@@ -144,3 +145,45 @@ def test_read_from_shared_memory(space):
         process.join()
 
     assert_nested_equal(memory_view_n8, samples, space, n=8)
+
+
+@pytest.mark.parametrize('space', spaces,
+    ids=[space.__class__.__name__ for space in spaces])
+def test_shared_memory_write_plan(space):
+    samples = [space.sample() for _ in range(8)]
+    expected = create_shared_memory(space, n=8)
+    for i, sample in enumerate(samples):
+        write_to_shared_memory(i, sample, expected, space)
+
+    shared_memory = create_shared_memory(space, n=8)
+    write = SharedMemoryWritePlan(shared_memory, space)
+    for i, sample in enumerate(samples):
+        write(i, sample)
+
+    def assert_nested_equal(lhs, rhs):
+        if isinstance(lhs, (list, tuple)):
+            for lhs_, rhs_ in zip(lhs, rhs):
+                assert_nested_equal(lhs_, rhs_)
+        elif isinstance(lhs, (dict, OrderedDict)):
+            for key in lhs.keys():
+                assert_nested_equal(lhs[key], rhs[key])
+        else:
+            assert lhs[:] == rhs[:]
+
+    assert_nested_equal(shared_memory, expected)
+
+
+@pytest.mark.parametrize('plan', [False, True])
+def test_write_to_shared_memory_conversion(plan):
+    space = Box(low=0, high=255, shape=(4, 3), dtype=np.uint8)
+    shared_memory = create_shared_memory(space, n=2)
+    # Non-contiguous observation, with a different dtype
+    value = np.arange(24, dtype=np.float64).reshape((3, 8)).T[::2]
+    if plan:
+        SharedMemoryWritePlan(shared_memory, space)(1, value)
+    else:
+        write_to_shared_memory(1, value, shared_memory, space)
+
+    observations = read_from_shared_memory(shared_memory, space, n=2)
+    assert np.all(observations[0] == 0)
+    assert np.all(observations[1] == value.astype(np.uint8))
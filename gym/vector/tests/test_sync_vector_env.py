@@ -2,7 +2,7 @@ import pytest
 import numpy as np
 
 from gym.spaces import Box
-from gym.vector.tests.utils import make_env
+from gym.vector.tests.utils import make_env, make_space_env, spaces
 
 from gym.vector.sync_vector_env import SyncVectorEnv
 
@@ -70,3 +70,33 @@ def test_check_observations_sync_vector_env():
     with pytest.raises(RuntimeError):
         env = SyncVectorEnv(env_fns)
         env.close()
+
+
+def test_reset_dict_observations_sync_vector_env():
+    env_fns = [make_space_env(spaces[-1], i) for i in range(4)]
+    try:
+        env = SyncVectorEnv(env_fns)
+        observations = env.reset()
+        assert observations in env.observation_space
+        observations, _, _, _ = env.step(env.action_space.sample())
+        assert observations in env.observation_space
+    finally:
+        env.close()
+
+
+def test_observation_buffers_sync_vector_env():
+    env_fns = [make_env('CubeCrash-v0', i) for i in range(4)]
+    try:
+        env = SyncVectorEnv(env_fns, observation_buffers=3)
+        observations = [env.reset()]
+        copies = [np.copy(observations[0])]
+        for _ in range(2):
+            observations.append(env.step(env.action_space.sample())[0])
+            copies.append(np.copy(observations[-1]))
+    finally:
+        env.close()
+
+    for observation, copy in zip(observations, copies):
+        assert not observation.flags.writeable
+        assert np.all(observation == copy)
+    assert not np.shares_memory(observations[0], observations[1])
@@ -0,0 +1,195 @@
+import pytest
+import numpy as np
+
+from multiprocessing import TimeoutError
+from gym.spaces import Box
+from gym.error import (AlreadyPendingCallError, NoAsyncCallError,
+                       ClosedEnvironmentError)
+from gym.vector.tests.utils import (make_env, make_slow_env, make_space_env,
+                                    spaces, UnittestInfoEnv)
+
+from gym.vector import make
+from gym.vector.threaded_vector_env import ThreadedVectorEnv
+from gym.vector.sync_vector_env import SyncVectorEnv
+
+@pytest.mark.parametrize('num_threads', [None, 1, 3])
+def test_create_threaded_vector_env(num_threads):
+    env_fns = [make_env('CubeCrash-v0', i) for i in range(8)]
+    try:
+        env = ThreadedVectorEnv(env_fns, num_threads=num_threads)
+    finally:
+        env.close()
+
+    assert env.num_envs == 8
+    if num_threads is not None:
+        assert env.num_threads == num_threads
+
+
+@pytest.mark.parametrize('num_threads', [1, 3])
+def test_step_threaded_vector_env(num_threads):
+    env_fns = [make_env('CubeCrash-v0', i) for i in range(8)]
+    try:
+        env = ThreadedVectorEnv(env_fns, num_threads=num_threads)
+        observations = env.reset()
+        assert observations.shape == (8,) + env.single_observation_space.shape
+        observations, rewards, dones, infos = env.step(env.action_space.sample())
+    finally:
+        env.close()
+
+    assert isinstance(env.observation_space, Box)
+    assert isinstance(observations, np.ndarray)
+    assert observations.dtype == env.observation_space.dtype
+    assert observations.shape == env.observation_space.shape
+
+    assert isinstance(rewards, np.ndarray)
+    assert rewards.shape == (8,)
+    assert isinstance(dones, np.ndarray)
+    assert dones.dtype == np.bool_
+    assert dones.shape == (8,)
+    assert len(infos) == 8
+
+
+@pytest.mark.parametrize('num_threads', [1, 3])
+def test_step_infos_threaded_vector_env(num_threads):
+    env_fns = [lambda i=i: UnittestInfoEnv(info_every=i + 2) for i in range(4)]
+    try:
+        env = ThreadedVectorEnv(env_fns, num_threads=num_threads)
+        env.reset()
+        for step in range(1, 11):
+            actions = np.full((4, 2), 0.1 * step)
+            observations, rewards, dones, infos = env.step(actions)
+
+            assert np.all(observations == (0. if step % 5 == 0 else 0.1 * step))
+            assert np.allclose(rewards, 0.2 * step)
+            assert np.all(dones == (step % 5 == 0))
+            steps = (step - 1) % 5 + 1
+            assert infos == [{'steps': steps} if steps % (i + 2) == 0 else {}
+                             for i in range(4)]
+    finally:
+        env.close()
+
+
+def test_step_error_threaded_vector_env():
+    env_fns = [lambda: UnittestInfoEnv() for _ in range(4)]
+    try:
+        env = ThreadedVectorEnv(env_fns, num_threads=2)
+        env.reset()
+        actions = np.zeros((4, 2))
+        actions[3] = np.nan
+        with pytest.raises(ValueError):
+            env.step(actions)
+        # The vectorized environment can still be used after the error
+        observations, _, _, _ = env.step(np.zeros((4, 2)))
+    finally:
+        env.close()
+
+    assert np.all(observations == 0.)
+
+
+def test_step_timeout_threaded_vector_env():
+    env_fns = [make_slow_env(0., i) for i in range(4)]
+    with pytest.raises(TimeoutError):
+        try:
+            env = ThreadedVectorEnv(env_fns, num_threads=4)
+            observations = env.reset()
+            env.step_async([0.1, 0.1, 0.3, 0.1])
+            observations, rewards, dones, _ = env.step_wait(timeout=0.1)
+        finally:
+            env.close(terminate=True)
+
+
+def test_step_timeout_pending_threaded_vector_env():
+    env_fns = [make_slow_env(0., i) for i in range(4)]
+    try:
+        env = ThreadedVectorEnv(env_fns, num_threads=4)
+        env.reset()
+        env.step_async([0.1, 0.1, 0.3, 0.1])
+        with pytest.raises(TimeoutError):
+            env.step_wait(timeout=0.1)
+        # The environments are still being stepped
+        with pytest.raises(AlreadyPendingCallError):
+            env.step_async([0.1, 0.1, 0.1, 0.1])
+        observations, _, _, _ = env.step_wait()
+        assert observations.shape == (4,) + env.single_observation_space.shape
+        env.step([0.1, 0.1, 0.1, 0.1])
+    finally:
+        env.close()
+
+
+@pytest.mark.filterwarnings('ignore::UserWarning')
+def test_out_of_order_threaded_vector_env():
+    env_fns = [make_env('CubeCrash-v0', i) for i in range(4)]
+    with pytest.raises(NoAsyncCallError):
+        try:
+            env = ThreadedVectorEnv(env_fns)
+            observations = env.reset()
+            observations, rewards, dones, infos = env.step_wait()
+        finally:
+            env.close(terminate=True)
+
+    with pytest.raises(AlreadyPendingCallError):
+        try:
+            env = ThreadedVectorEnv(env_fns)
+            env.reset_async()
+            env.step_async(env.action_space.sample())
+        finally:
+            env.close(terminate=True)
+
+
+def test_already_closed_threaded_vector_env():
+    env_fns = [make_env('CubeCrash-v0', i) for i in range(4)]
+    with pytest.raises(ClosedEnvironmentError):
+        env = ThreadedVectorEnv(env_fns)
+        env.close()
+        observations = env.reset()
+
+
+@pytest.mark.parametrize('space', spaces, ids=[space.__class__.__name__ for space in spaces])
+def test_reset_spaces_threaded_vector_env(space):
+    env_fns = [make_space_env(space, i) for i in range(4)]
+    try:
+        env = ThreadedVectorEnv(env_fns, num_threads=2)
+        observations = env.reset()
+        assert observations in env.observation_space
+        observations, _, _, _ = env.step(env.action_space.sample())
+        assert observations in env.observation_space
+    finally:
+        env.close()
+
+
+def test_threaded_vector_env_equal():
+    env_fns = [make_env('CubeCrash-v0', i) for i in range(5)]
+    try:
+        threaded_env = ThreadedVectorEnv(env_fns, num_threads=2)
+        sync_env = SyncVectorEnv(env_fns)
+        threaded_env.seed(0)
+        sync_env.seed(0)
+
+        assert np.all(threaded_env.reset() == sync_env.reset())
+        for _ in range(100):
+            actions = threaded_env.action_space.sample()
+            threaded_observations, threaded_rewards, threaded_dones, _ = threaded_env.step(actions)
+            sync_observations, sync_rewards, sync_dones, _ = sync_env.step(actions)
+
+            assert np.all(threaded_observations == sync_observations)
+            assert np.all(threaded_rewards == sync_rewards)
+            assert np.all(threaded_dones == sync_dones)
+    finally:
+        threaded_env.close()
+        sync_env.close()
+
+
+@pytest.mark.parametrize('backend,cls', [('sync', SyncVectorEnv),
+    ('thread', ThreadedVectorEnv)])
+def test_make_backend(backend, cls):
+    env = make('CubeCrash-v0', num_envs=2, backend=backend)
+    try:
+        assert isinstance(env, cls)
+        assert env.num_envs == 2
+    finally:
+        env.close()
+
+
+def test_make_invalid_backend():
+    with pytest.raises(ValueError):
+        make('CubeCrash-v0', num_envs=2, backend='mpi')
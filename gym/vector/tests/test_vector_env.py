@@ -6,12 +6,16 @@ from gym.vector.tests.utils import make_env
 from gym.vector.async_vector_env import AsyncVectorEnv
 from gym.vector.sync_vector_env import SyncVectorEnv
 
-@pytest.mark.parametrize('shared_memory', [True, False])
-def test_vector_env_equal(shared_memory):
+@pytest.mark.parametrize('shared_memory,sync_backend',
+    [(True, 'pipe'), (False, 'pipe'), (True, 'flag')])
+@pytest.mark.parametrize('envs_per_worker', [1, 3])
+def test_vector_env_equal(shared_memory, sync_backend, envs_per_worker):
     env_fns = [make_env('CubeCrash-v0', i) for i in range(4)]
     num_steps = 100
     try:
-        async_env = AsyncVectorEnv(env_fns, shared_memory=shared_memory)
+        async_env = AsyncVectorEnv(env_fns, shared_memory=shared_memory,
+                                   envs_per_worker=envs_per_worker,
+                                   sync_backend=sync_backend)
         sync_env = SyncVectorEnv(env_fns)
 
         async_env.seed(0)
@@ -1,6 +1,7 @@
 import numpy as np
 import gym
 import time
+from copy import deepcopy
 
 from gym.spaces import Box, Discrete, MultiDiscrete, MultiBinary, Tuple, Dict
 
@@ -47,6 +48,44 @@ class UnittestSlowEnv(gym.Env):
         reward, done = 0., False
         return observation, reward, done, {}
 
+class UnittestInfoEnv(gym.Env):
+    """Environment returning a non-empty `info` every `info_every` steps, and
+    raising an error on NaN actions."""
+    def __init__(self, info_every=3):
+        super(UnittestInfoEnv, self).__init__()
+        self.info_every = info_every
+        self.observation_space = Box(low=-np.inf, high=np.inf,
+            shape=(2,), dtype=np.float64)
+        self.action_space = Box(low=-1., high=1., shape=(2,), dtype=np.float64)
+        self._steps = 0
+
+    def reset(self):
+        self._steps = 0
+        return np.zeros((2,), dtype=np.float64)
+
+    def step(self, action):
+        if np.any(np.isnan(action)):
+            raise ValueError('Invalid action: {0}'.format(action))
+        self._steps += 1
+        observation = np.array(action, dtype=np.float64)
+        reward, done = float(np.sum(action)), self._steps % 5 == 0
+        info = {'steps': self._steps} if self._steps % self.info_every == 0 else {}
+        return observation, reward, done, info
+
+class UnittestSpaceEnv(gym.Env):
+    """Environment whose observations are samples from `observation_space`."""
+    def __init__(self, observation_space, seed=None):
+        super(UnittestSpaceEnv, self).__init__()
+        self.observation_space = observation_space
+        self.action_space = Box(low=-1., high=1., shape=(), dtype=np.float32)
+        self.observation_space.seed(seed)
+
+    def reset(self):
+        return self.observation_space.sample()
+
+    def step(self, action):
+        return self.observation_space.sample(), 0., False, {}
+
 def make_env(env_name, seed):
     def _make():
         env = gym.make(env_name)
@@ -60,3 +99,8 @@ def make_slow_env(slow_reset, seed):
         env.seed(seed)
         return env
     return _make
+
+def make_space_env(observation_space, seed):
+    def _make():
+        return UnittestSpaceEnv(deepcopy(observation_space), seed=seed)
+    return _make
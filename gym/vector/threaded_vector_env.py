@@ -0,0 +1,283 @@
+import numpy as np
+import multiprocessing as mp
+from concurrent import futures
+from copy import deepcopy
+
+from gym import logger
+from gym.vector.vector_env import VectorEnv
+from gym.error import (AlreadyPendingCallError, NoAsyncCallError,
+                       ClosedEnvironmentError)
+from gym.vector.async_vector_env import AsyncState
+from gym.vector.utils import ConcatenatePlan, ObservationRing
+
+__all__ = ['ThreadedVectorEnv']
+
+
+class ThreadedVectorEnv(VectorEnv):
+    """Vectorized environment that runs multiple environments in parallel on a
+    pool of threads, in the main process. This only pays off if the
+    environments release the GIL while they step, e.g. environments whose step
+    is dominated by large numpy operations. The simulators used by the
+    environments of this repository hold the GIL while they step (mujoco_py's
+    `MjSim.step` in particular, see `MobileSIA7FARMVecEnv` for a batched
+    alternative), so they do not step faster in threads. Unlike
+    `AsyncVectorEnv`, it does not pickle the actions and observations, nor
+    duplicate the environments in other processes.
+
+    Parameters
+    ----------
+    env_fns : iterable of callable
+        Functions that create the environments.
+
+    observation_space : `gym.spaces.Space` instance, optional
+        Observation space of a single environment. If `None`, then the
+        observation space of the first environment is taken.
+
+    action_space : `gym.spaces.Space` instance, optional
+        Action space of a single environment. If `None`, then the action space
+        of the first environment is taken.
+
+    copy : bool (default: `True`)
+        If `True`, then the `reset` and `step` methods return a copy of the
+        observations.
+
+    observation_buffers : int, optional
+        If not `None`, then the observations are written in turn into
+        `observation_buffers` batches, and the `reset` and `step` methods
+        return a read-only view of the batch just written instead of a copy.
+        This view is valid until the batch is written again,
+        `observation_buffers` calls to `reset` or `step` later. `copy` is
+        then ignored.
+
+    num_threads : int, optional
+        Number of threads. The environments are split into `num_threads`
+        contiguous chunks, and each thread steps the environments of a chunk
+        in turn. If `None`, then it is the minimum of the number of
+        environments and the number of CPUs.
+    """
+    def __init__(self, env_fns, observation_space=None, action_space=None,
+                 copy=True, observation_buffers=None, num_threads=None):
+        self.env_fns = env_fns
+        self.envs = [env_fn() for env_fn in env_fns]
+        self.copy = copy
+        self.observation_buffers = observation_buffers
+
+        if (observation_space is None) or (action_space is None):
+            observation_space = observation_space or self.envs[0].observation_space
+            action_space = action_space or self.envs[0].action_space
+        super(ThreadedVectorEnv, self).__init__(num_envs=len(env_fns),
+            observation_space=observation_space, action_space=action_space)
+
+        self._check_observation_spaces()
+        self._observation_ring = ObservationRing(self.single_observation_space,
+            self.num_envs, observation_buffers or 1)
+        self.observations = self._observation_ring.current
+        self._concatenate = ConcatenatePlan(self.single_observation_space)
+        self._rewards = np.zeros((self.num_envs,), dtype=np.float64)
+        self._dones = np.zeros((self.num_envs,), dtype=np.bool_)
+
+        if num_threads is None:
+            num_threads = min(self.num_envs, mp.cpu_count())
+        if num_threads < 1:
+            raise ValueError('`num_threads` must be at least 1, got '
+                '{0}.'.format(num_threads))
+        self.num_threads = num_threads
+        chunk_size = -(-self.num_envs // num_threads)
+        self._chunks = [slice(start, min(start + chunk_size, self.num_envs))
+            for start in range(0, self.num_envs, chunk_size)]
+        self._executor = futures.ThreadPoolExecutor(max_workers=num_threads)
+        self._futures = []
+        self._state = AsyncState.DEFAULT
+
+    def seed(self, seeds=None):
+        self._assert_is_running()
+        if seeds is None:
+            seeds = [None for _ in range(self.num_envs)]
+        if isinstance(seeds, int):
+            seeds = [seeds + i for i in range(self.num_envs)]
+        assert len(seeds) == self.num_envs
+
+        if self._state != AsyncState.DEFAULT:
+            raise AlreadyPendingCallError('Calling `seed` while waiting '
+                'for a pending call to `{0}` to complete.'.format(
+                self._state.value), self._state.value)
+
+        for env, seed in zip(self.envs, seeds):
+            env.seed(seed)
+
+    def reset_async(self):
+        self._assert_is_running()
+        if self._state != AsyncState.DEFAULT:
+            raise AlreadyPendingCallError('Calling `reset_async` while waiting '
+                'for a pending call to `{0}` to complete'.format(
+                self._state.value), self._state.value)
+
+        self._futures = [self._executor.submit(self._reset_chunk, chunk)
+            for chunk in self._chunks]
+        self._state = AsyncState.WAITING_RESET
+
+    def reset_wait(self, timeout=None):
+        """
+        Parameters
+        ----------
+        timeout : int or float, optional
+            Number of seconds before the call to `reset_wait` times out. If
+            `None`, the call to `reset_wait` never times out. If it times out,
+            then the environments are still being reset, and `reset_wait` must be
+            called again before any other call.
+
+        Returns
+        -------
+        observations : sample from `observation_space`
+            A batch of observations from the vectorized environment.
+        """
+        self._assert_is_running()
+        if self._state != AsyncState.WAITING_RESET:
+            raise NoAsyncCallError('Calling `reset_wait` without any prior '
+                'call to `reset_async`.', AsyncState.WAITING_RESET.value)
+
+        observations = [observation for results in self._wait(timeout)
+            for observation in results]
+        self._dones[:] = False
+        self._rotate_observations()
+        self._concatenate(observations, self.observations)
+
+        return self._batch_observations()
+
+    def step_async(self, actions):
+        """
+        Parameters
+        ----------
+        actions : iterable of samples from `action_space`
+            List of actions.
+        """
+        self._assert_is_running()
+        if self._state != AsyncState.DEFAULT:
+            raise AlreadyPendingCallError('Calling `step_async` while waiting '
+                'for a pending call to `{0}` to complete.'.format(
+                self._state.value), self._state.value)
+
+        if not isinstance(actions, (list, tuple, np.ndarray)):
+            actions = list(actions)
+        self._futures = [self._executor.submit(self._step_chunk, chunk, actions[chunk])
+            for chunk in self._chunks]
+        self._state = AsyncState.WAITING_STEP
+
+    def step_wait(self, timeout=None):
+        """
+        Parameters
+        ----------
+        timeout : int or float, optional
+            Number of seconds before the call to `step_wait` times out. If
+            `None`, the call to `step_wait` never times out. If it times out,
+            then the environments are still being stepped, and `step_wait` must be
+            called again before any other call.
+
+        Returns
+        -------
+        observations : sample from `observation_space`
+            A batch of observations from the vectorized environment.
+
+        rewards : `np.ndarray` instance (dtype `np.float_`)
+            A vector of rewards from the vectorized environment.
+
+        dones : `np.ndarray` instance (dtype `np.bool_`)
+            A vector whose entries indicate whether the episode has ended.
+
+        infos : list of dict
+            A list of auxiliary diagnostic informations.
+        """
+        self._assert_is_running()
+        if self._state != AsyncState.WAITING_STEP:
+            raise NoAsyncCallError('Calling `step_wait` without any prior call '
+                'to `step_async`.', AsyncState.WAITING_STEP.value)
+
+        results = [result for chunk_results in self._wait(timeout)
+            for result in chunk_results]
+        observations, infos = [], []
+        for i, (observation, reward, done, info) in enumerate(results):
+            observations.append(observation)
+            self._rewards[i], self._dones[i] = reward, done
+            infos.append(info)
+        self._rotate_observations()
+        self._concatenate(observations, self.observations)
+
+        return (self._batch_observations(), np.copy(self._rewards),
+            np.copy(self._dones), infos)
+
+    def close_extras(self, timeout=None, terminate=False):
+        """
+        Parameters
+        ----------
+        timeout : int or float, optional
+            Number of seconds before the call to `close` times out. If `None`,
+            the call to `close` never times out.
+
+        terminate : bool (default: `False`)
+            If `True`, then the pending calls are not waited for. Threads
+            cannot be interrupted, so the pending steps still run to completion
+            before the environments are closed.
+        """
+        timeout = 0 if terminate else timeout
+        try:
+            if self._state != AsyncState.DEFAULT:
+                logger.warn('Calling `close` while waiting for a pending '
+                    'call to `{0}` to complete.'.format(self._state.value))
+                function = getattr(self, '{0}_wait'.format(self._state.value))
+                function(timeout)
+        except mp.TimeoutError:
+            pass
+
+        self._executor.shutdown(wait=True)
+        [env.close() for env in self.envs]
+
+    def _reset_chunk(self, chunk):
+        return [env.reset() for env in self.envs[chunk]]
+
+    def _step_chunk(self, chunk, actions):
+        results = []
+        for env, action in zip(self.envs[chunk], actions):
+            observation, reward, done, info = env.step(action)
+            if done:
+                observation = env.reset()
+            results.append((observation, reward, done, info))
+        return results
+
+    def _wait(self, timeout=None):
+        # Results of the pending calls of all the chunks, in order. An error
+        # raised in a thread is raised again here. On a timeout, the calls are
+        # still pending: the threads cannot be interrupted, and the
+        # environments must not be stepped again before they are done.
+        done, not_done = futures.wait(self._futures, timeout=timeout)
+        if not_done:
+            raise mp.TimeoutError('The call to `{0}_wait` has timed out after '
+                '{1} second{2}.'.format(self._state.value, timeout,
+                's' if timeout > 1 else ''))
+        pending, self._futures = self._futures, []
+        self._state = AsyncState.DEFAULT
+        return [future.result() for future in pending]
+
+    def _rotate_observations(self):
+        self._observation_ring.rotate()
+        self.observations = self._observation_ring.current
+
+    def _batch_observations(self):
+        if self.observation_buffers is not None:
+            return self._observation_ring.views[self._observation_ring.index]
+        return deepcopy(self.observations) if self.copy else self.observations
+
+    def _check_observation_spaces(self):
+        for env in self.envs:
+            if not (env.observation_space == self.single_observation_space):
+                break
+        else:
+            return True
+        raise RuntimeError('Some environments have an observation space '
+            'different from `{0}`. In order to batch observations, the '
+            'observation spaces from all environments must be '
+            'equal.'.format(self.single_observation_space))
+
+    def _assert_is_running(self):
+        if self.closed:
+            raise ClosedEnvironmentError('Trying to operate on `{0}`, after a '
+                'call to `close()`.'.format(type(self).__name__))
@@ -1,16 +1,22 @@
-from gym.vector.utils.misc import CloudpickleWrapper, clear_mpi_env_vars
-from gym.vector.utils.numpy_utils import concatenate, create_empty_array
-from gym.vector.utils.shared_memory import create_shared_memory, read_from_shared_memory, write_to_shared_memory
+from gym.vector.utils.misc import CloudpickleWrapper, clear_mpi_env_vars, limit_threads, numa_nodes
+from gym.vector.utils.numpy_utils import concatenate, ConcatenatePlan, create_empty_array
+from gym.vector.utils.observation_ring import ObservationRing
+from gym.vector.utils.shared_memory import create_shared_memory, read_from_shared_memory, write_to_shared_memory, SharedMemoryWritePlan
 from gym.vector.utils.spaces import _BaseGymSpaces, batch_space
 
 __all__ = [
     'CloudpickleWrapper',
     'clear_mpi_env_vars',
+    'limit_threads',
+    'numa_nodes',
     'concatenate',
+    'ConcatenatePlan',
     'create_empty_array',
+    'ObservationRing',
     'create_shared_memory',
     'read_from_shared_memory',
     'write_to_shared_memory',
+    'SharedMemoryWritePlan',
     '_BaseGymSpaces',
     'batch_space'
 ]
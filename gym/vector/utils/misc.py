@@ -1,7 +1,15 @@
 import contextlib
 import os
 
-__all__ = ['CloudpickleWrapper', 'clear_mpi_env_vars']
+__all__ = ['CloudpickleWrapper', 'clear_mpi_env_vars', 'limit_threads', 'numa_nodes']
+
+# Environment variables setting the size of the thread pools of OpenMP and of
+# the BLAS libraries
+THREAD_LIMIT_ENV_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+    'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS')
+
+# Directory listing the NUMA nodes of the machine, with their cores
+NUMA_NODES_DIR = '/sys/devices/system/node'
 
 class CloudpickleWrapper(object):
     def __init__(self, fn):
@@ -38,3 +46,47 @@ def clear_mpi_env_vars():
         yield
     finally:
         os.environ.update(removed_environment)
+
+def limit_threads(num_threads):
+    """
+    Limits the number of threads used by OpenMP and the BLAS libraries in the
+    current process, e.g. in a worker process of a vectorized environment, so
+    that the workers do not oversubscribe the cores. The environment variables
+    are read by the libraries loaded afterwards. The libraries which are
+    already loaded (e.g. the BLAS of numpy) are limited with `threadpoolctl`,
+    if it is installed.
+    """
+    for k in THREAD_LIMIT_ENV_VARS:
+        os.environ[k] = str(num_threads)
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(num_threads)
+
+def numa_nodes():
+    """
+    Returns the sorted cores of each NUMA node, read from
+    `/sys/devices/system/node/node*/cpulist` (Linux only), or `None` if they
+    are not available.
+    """
+    try:
+        names = os.listdir(NUMA_NODES_DIR)
+    except OSError:
+        return None
+    indices = sorted(int(name[4:]) for name in names
+        if name.startswith('node') and name[4:].isdigit())
+    nodes = []
+    for index in indices:
+        path = os.path.join(NUMA_NODES_DIR, 'node{0}'.format(index), 'cpulist')
+        try:
+            with open(path) as f:
+                cpulist = f.read().strip()
+        except (IOError, OSError):
+            return None
+        cores = []
+        for cpu_range in filter(None, cpulist.split(',')):
+            start, _, end = cpu_range.partition('-')
+            cores.extend(range(int(start), int(end or start) + 1))
+        nodes.append(cores)
+    return nodes or None
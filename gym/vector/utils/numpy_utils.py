@@ -1,10 +1,10 @@
 import numpy as np
 
 from gym.spaces import Tuple, Dict
-from gym.vector.utils.spaces import _BaseGymSpaces
+from gym.vector.utils.spaces import _BaseGymSpaces, _leaf_paths, _path_getter
 from collections import OrderedDict
 
-__all__ = ['concatenate', 'create_empty_array']
+__all__ = ['concatenate', 'ConcatenatePlan', 'create_empty_array']
 
 def concatenate(items, out, space):
     """Concatenate multiple samples from space into a single object.
@@ -57,6 +57,55 @@ def concatenate_dict(items, out, space):
         out[key], subspace)) for (key, subspace) in space.spaces.items()])
 
 
+class ConcatenatePlan(object):
+    """Compiled version of `concatenate` for a fixed space. The (possibly
+    nested) space is flattened once into the paths of its base spaces, so that
+    concatenating the samples does not dispatch on the type of the space nor
+    build intermediate lists at every call.
+
+    Parameters
+    ----------
+    space : `gym.spaces.Space` instance
+        Observation space of a single environment in the vectorized environment.
+
+    Example
+    -------
+    >>> from gym.spaces import Box, Dict
+    >>> space = Dict({
+    ... 'position': Box(low=0, high=1, shape=(3,), dtype=np.float32),
+    ... 'velocity': Box(low=0, high=1, shape=(2,), dtype=np.float32)})
+    >>> plan = ConcatenatePlan(space)
+    >>> out = create_empty_array(space, n=2)
+    >>> out = plan([space.sample() for _ in range(2)], out)
+    """
+    def __init__(self, space):
+        self.space = space
+        self.paths = [path for (path, _) in _leaf_paths(space)]
+        self._getters = [_path_getter(path) for path in self.paths]
+
+    def __call__(self, items, out):
+        """Concatenates `items` into `out`, like `concatenate(items, out, space)`.
+
+        Parameters
+        ----------
+        items : iterable of samples of `space`
+            Samples to be concatenated.
+
+        out : tuple, dict, or `np.ndarray`
+            The output object. This object is a (possibly nested) numpy array.
+
+        Returns
+        -------
+        out : tuple, dict, or `np.ndarray`
+            The output object.
+        """
+        for getter in self._getters:
+            destination = getter(out)
+            for i, item in enumerate(items):
+                destination[i] = getter(item)
+        return out
+
+
 def create_empty_array(space, n=1, fn=np.zeros):
     """Create an empty (possibly nested) numpy array.
 
@@ -0,0 +1,95 @@
+import numpy as np
+from collections import OrderedDict
+
+from gym.spaces import Tuple, Dict
+from gym.vector.utils.spaces import _BaseGymSpaces
+from gym.vector.utils.numpy_utils import create_empty_array
+
+__all__ = ['ObservationRing']
+
+
+class ObservationRing(object):
+    """Batches of observations written in rotation, so that a batch can be
+    handed out as a read-only view instead of a copy. A view stays valid until
+    the same batch is written again, `num_buffers` rotations later.
+
+    Parameters
+    ----------
+    space : `gym.spaces.Space` instance
+        Observation space of a single environment in the vectorized environment.
+
+    n : int
+        Number of environments in the vectorized environment.
+
+    num_buffers : int (default: `1`)
+        Number of batches of observations.
+
+    flat : tuple, dict, or `np.ndarray`, optional
+        The (possibly nested) numpy array of `num_buffers * n` observations in
+        which the batches are stored, one after the other (e.g. from
+        `read_from_shared_memory`). If `None`, then it is allocated.
+
+    Example
+    -------
+    >>> from gym.spaces import Box
+    >>> space = Box(low=0, high=1, shape=(3,), dtype=np.float32)
+    >>> ring = ObservationRing(space, n=2, num_buffers=2)
+    >>> ring.current[:] = 1.
+    >>> observations = ring.views[ring.index]
+    >>> ring.rotate()
+    1
+    >>> ring.current[:] = 2.
+    >>> observations
+    array([[1., 1., 1.],
+           [1., 1., 1.]], dtype=float32)
+    """
+    def __init__(self, space, n, num_buffers=1, flat=None):
+        if num_buffers < 1:
+            raise ValueError('`num_buffers` must be at least 1, got '
+                '{0}.'.format(num_buffers))
+        self.space = space
+        self.n = n
+        self.num_buffers = num_buffers
+        if flat is None:
+            flat = create_empty_array(space, n=num_buffers * n, fn=np.zeros)
+        self.flat = flat
+        self.buffers = [_map_batch(lambda array: array[k * n:(k + 1) * n], flat, space)
+            for k in range(num_buffers)]
+        self.views = [_map_batch(_read_only_view, buffer, space)
+            for buffer in self.buffers]
+        self.index = 0
+
+    @property
+    def current(self):
+        """The (writeable) batch of observations at the current index."""
+        return self.buffers[self.index]
+
+    def rotate(self):
+        """Moves on to the next batch, and returns its index."""
+        self.index = (self.index + 1) % self.num_buffers
+        return self.index
+
+    def take(self, indices, buffer_indices):
+        """Returns a copy of the observations of the environments `indices`,
+        from the batches `buffer_indices`.
+        """
+        flat_indices = np.asarray(buffer_indices) * self.n + np.asarray(indices)
+        return _map_batch(lambda array: array[flat_indices], self.flat, self.space)
+
+
+def _read_only_view(array):
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+def _map_batch(fn, batch, space):
+    if isinstance(space, _BaseGymSpaces):
+        return fn(batch)
+    elif isinstance(space, Tuple):
+        return tuple(_map_batch(fn, subbatch, subspace)
+            for (subbatch, subspace) in zip(batch, space.spaces))
+    elif isinstance(space, Dict):
+        return OrderedDict([(key, _map_batch(fn, batch[key], subspace))
+            for (key, subspace) in space.spaces.items()])
+    else:
+        raise NotImplementedError()
@@ -1,19 +1,21 @@
 import numpy as np
 import multiprocessing as mp
+from multiprocessing import sharedctypes
 from ctypes import c_bool
 from collections import OrderedDict
 
 from gym import logger
 from gym.spaces import Tuple, Dict
-from gym.vector.utils.spaces import _BaseGymSpaces
+from gym.vector.utils.spaces import _BaseGymSpaces, _leaf_paths, _path_getter
 
 __all__ = [
     'create_shared_memory',
     'read_from_shared_memory',
-    'write_to_shared_memory'
+    'write_to_shared_memory',
+    'SharedMemoryWritePlan'
 ]
 
-def create_shared_memory(space, n=1, ctx=mp):
+def create_shared_memory(space, n=1, ctx=mp, zero_fill=True):
     """Create a shared memory object, to be shared across processes. This
     eventually contains the observations from the vectorized environment.
 
@@ -29,33 +31,44 @@ def create_shared_memory(space, n=1, ctx=mp):
     ctx : `multiprocessing` context
         Context for multiprocessing.
 
+    zero_fill : bool (default: `True`)
+        If `False`, then the memory is not zero-filled at allocation. Its pages
+        are then only allocated when they are first written to, on the NUMA
+        node of the process writing them. The memory must be written before it
+        is read, since it may hold the content of memory freed earlier.
+
     Returns
     -------
     shared_memory : dict, tuple, or `multiprocessing.Array` instance
         Shared object across processes.
     """
     if isinstance(space, _BaseGymSpaces):
-        return create_base_shared_memory(space, n=n, ctx=ctx)
+        return create_base_shared_memory(space, n=n, ctx=ctx, zero_fill=zero_fill)
     elif isinstance(space, Tuple):
-        return create_tuple_shared_memory(space, n=n, ctx=ctx)
+        return create_tuple_shared_memory(space, n=n, ctx=ctx, zero_fill=zero_fill)
     elif isinstance(space, Dict):
-        return create_dict_shared_memory(space, n=n, ctx=ctx)
+        return create_dict_shared_memory(space, n=n, ctx=ctx, zero_fill=zero_fill)
     else:
         raise NotImplementedError()
 
-def create_base_shared_memory(space, n=1, ctx=mp):
+def create_base_shared_memory(space, n=1, ctx=mp, zero_fill=True):
     dtype = space.dtype.char
     if dtype in '?':
         dtype = c_bool
-    return ctx.Array(dtype, n * int(np.prod(space.shape)))
-
-def create_tuple_shared_memory(space, n=1, ctx=mp):
-    return tuple(create_shared_memory(subspace, n=n, ctx=ctx)
+    size = n * int(np.prod(space.shape))
+    if zero_fill:
+        return ctx.Array(dtype, size)
+    # Same as `ctx.Array`, without the `memset` of `RawArray`
+    type_ = sharedctypes.typecode_to_type.get(dtype, dtype) * size
+    return sharedctypes.synchronized(sharedctypes._new_value(type_), ctx.RLock())
+
+def create_tuple_shared_memory(space, n=1, ctx=mp, zero_fill=True):
+    return tuple(create_shared_memory(subspace, n=n, ctx=ctx, zero_fill=zero_fill)
         for subspace in space.spaces)
 
-def create_dict_shared_memory(space, n=1, ctx=mp):
-    return OrderedDict([(key, create_shared_memory(subspace, n=n, ctx=ctx))
-        for (key, subspace) in space.spaces.items()])
+def create_dict_shared_memory(space, n=1, ctx=mp, zero_fill=True):
+    return OrderedDict([(key, create_shared_memory(subspace, n=n, ctx=ctx,
+        zero_fill=zero_fill)) for (key, subspace) in space.spaces.items()])
 
 
 def read_from_shared_memory(shared_memory, space, n=1):
@@ -141,8 +154,10 @@ def write_to_shared_memory(index, value, shared_memory, space):
 def write_base_to_shared_memory(index, value, shared_memory, space):
     size = int(np.prod(space.shape))
     destination = np.frombuffer(shared_memory.get_obj(), dtype=space.dtype)
-    np.copyto(destination[index * size:(index + 1) * size], np.asarray(
-        value, dtype=space.dtype).flatten())
+    # `np.ravel` does not copy a contiguous observation, and `np.copyto`
+    # converts the dtype while copying
+    np.copyto(destination[index * size:(index + 1) * size], np.ravel(value),
+        casting='unsafe')
 
 def write_tuple_to_shared_memory(index, values, shared_memory, space):
     for value, memory, subspace in zip(values, shared_memory, space.spaces):
@@ -151,3 +166,52 @@ def write_tuple_to_shared_memory(index, values, shared_memory, space):
 def write_dict_to_shared_memory(index, values, shared_memory, space):
     for key, subspace in space.spaces.items():
         write_to_shared_memory(index, values[key], shared_memory[key], subspace)
+
+
+class SharedMemoryWritePlan(object):
+    """Compiled version of `write_to_shared_memory` for a fixed space and
+    shared memory. The (possibly nested) space is flattened once into the
+    paths of its base spaces, each paired with a numpy view of its shared
+    memory, so that writing an observation neither dispatches on the type of
+    the space nor wraps the shared memory at every call. The views of the
+    observation at a given index are cached the first time it is written, so
+    a worker only creates the views of the indices of its own environments.
+
+    Parameters
+    ----------
+    shared_memory : dict, tuple, or `multiprocessing.Array` instance
+        Shared object across processes. This object is created with
+        `create_shared_memory`.
+
+    space : `gym.spaces.Space` instance
+        Observation space of a single environment in the vectorized environment.
+    """
+    def __init__(self, shared_memory, space):
+        self.space = space
+        self._getters, self._destinations = [], []
+        for path, subspace in _leaf_paths(space):
+            getter = _path_getter(path)
+            destination = np.frombuffer(getter(shared_memory).get_obj(),
+                dtype=subspace.dtype)
+            self._getters.append(getter)
+            self._destinations.append((destination, int(np.prod(subspace.shape))))
+        self._views = {}
+
+    def __call__(self, index, value):
+        """Writes `value` into shared memory, like
+        `write_to_shared_memory(index, value, shared_memory, space)`.
+
+        Parameters
+        ----------
+        index : int
+            Index of the environment (must be in `[0, num_envs)`).
+
+        value : sample from `space`
+            Observation of the single environment to write to shared memory.
+        """
+        views = self._views.get(index)
+        if views is None:
+            views = self._views[index] = [destination[index * size:(index + 1) * size]
+                for (destination, size) in self._destinations]
+        for getter, view in zip(self._getters, views):
+            np.copyto(view, np.ravel(getter(value)), casting='unsafe')
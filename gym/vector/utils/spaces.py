@@ -1,5 +1,6 @@
 import numpy as np
 from collections import OrderedDict
+from operator import itemgetter
 
 from gym.spaces import Box, Discrete, MultiDiscrete, MultiBinary, Tuple, Dict
 
@@ -68,3 +69,34 @@ def batch_space_tuple(space, n=1):
 def batch_space_dict(space, n=1):
     return Dict(OrderedDict([(key, batch_space(subspace, n=n))
         for (key, subspace) in space.spaces.items()]))
+
+
+def _leaf_paths(space, path=()):
+    # List of `(path, subspace)` for the base spaces in a (possibly nested)
+    # space, where `path` is the sequence of keys/indices leading to `subspace`.
+    if isinstance(space, _BaseGymSpaces):
+        return [(path, space)]
+    elif isinstance(space, Tuple):
+        return [leaf for (i, subspace) in enumerate(space.spaces)
+            for leaf in _leaf_paths(subspace, path + (i,))]
+    elif isinstance(space, Dict):
+        return [leaf for (key, subspace) in space.spaces.items()
+            for leaf in _leaf_paths(subspace, path + (key,))]
+    else:
+        raise NotImplementedError()
+
+def _path_getter(path):
+    # Function returning the element at `path` of a (possibly nested) sample.
+    if len(path) == 0:
+        return _identity
+    elif len(path) == 1:
+        return itemgetter(path[0])
+    getters = [itemgetter(key) for key in path]
+    def getter(value):
+        for get in getters:
+            value = get(value)
+        return value
+    return getter
+
+def _identity(value):
+    return value
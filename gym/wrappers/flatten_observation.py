@@ -8,8 +8,8 @@ class FlattenObservation(ObservationWrapper):
     def __init__(self, env):
         super(FlattenObservation, self).__init__(env)
 
-        flatdim = spaces.flatdim(env.observation_space)
-        self.observation_space = spaces.Box(low=-float('inf'), high=float('inf'), shape=(flatdim,), dtype=np.float32)
+        self._flatten_plan = spaces.FlattenPlan(env.observation_space)
+        self.observation_space = spaces.Box(low=-float('inf'), high=float('inf'), shape=(self._flatten_plan.dim,), dtype=np.float32)
 
     def observation(self, observation):
-        return spaces.flatten(self.env.observation_space, observation)
+        return self._flatten_plan.flatten(observation)
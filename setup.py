@@ -29,7 +29,8 @@ setup(name='gym',
       zip_safe=False,
       install_requires=[
           'scipy', 'numpy>=1.10.4', 'six', 'pyglet>=1.2.0,<=1.3.2', 'cloudpickle~=1.2.0',
-          'enum34~=1.1.6;python_version<"3.4"', 'opencv-python'
+          'enum34~=1.1.6;python_version<"3.4"', 'futures;python_version<"3"',
+          'opencv-python'
       ],
       extras_require=extras,
       package_data={'gym': [
@@ -0,0 +1,73 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from gym.envs.tests.spec_list import skip_mujoco, SKIP_MUJOCO_WARNING_MESSAGE
+
+
+class FakeSIA7FARMServices(object):
+    """Local stand-in for the `ee_pose_srv` and `ee_delta_srv` services of the
+    arm, taking `latency` seconds to answer every request.
+    """
+    def __init__(self, latency=0.01):
+        self.latency = latency
+        self.position = np.zeros(3)
+        self.lock = threading.Lock()
+
+    def ee_pose_srv(self, request):
+        time.sleep(self.latency)
+        with self.lock:
+            x, y, z = self.position
+        position = SimpleNamespace(x=x, y=y, z=z)
+        orientation = SimpleNamespace(w=1., x=0., y=0., z=0.)
+        return SimpleNamespace(pose=SimpleNamespace(position=position, orientation=orientation))
+
+    def ee_delta_srv(self, request):
+        time.sleep(self.latency)
+        position = request.pose.position
+        with self.lock:
+            self.position += [position.x, position.y, position.z]
+        return SimpleNamespace(success=True)
+
+
+def delta_request(dx, dy, dz):
+    return SimpleNamespace(pose=SimpleNamespace(position=SimpleNamespace(x=dx, y=dy, z=dz)))
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+def test_commands_are_sent_in_the_background():
+    from gym.envs.robotics.ros_interface.async_backend import AsyncCommandQueue
+
+    robot = FakeSIA7FARMServices(latency=0.02)
+    commands = AsyncCommandQueue()
+    start = time.time()
+    for _ in range(5):
+        commands.submit('ee_delta', robot.ee_delta_srv, delta_request(0.01, 0., -0.02))
+    assert time.time() - start < 5 * robot.latency
+    commands.join()
+    ee_pose = robot.ee_pose_srv(None)
+    assert np.allclose([ee_pose.pose.position.x, ee_pose.pose.position.z], [0.05, -0.1])
+
+    stats = commands.latency_stats.summary()
+    assert stats['ee_delta']['count'] == 5
+    assert stats['ee_delta']['p50'] >= robot.latency
+    commands.close()
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+def test_command_errors_are_raised():
+    from gym.envs.robotics.ros_interface.async_backend import AsyncCommandQueue
+
+    def failing_service(request):
+        raise RuntimeError('service unavailable')
+
+    commands = AsyncCommandQueue()
+    commands.submit('ee_delta', failing_service, delta_request(0., 0., 0.))
+    with pytest.raises(RuntimeError):
+        commands.join()
+    commands.close()
+    with pytest.raises(RuntimeError):
+        commands.submit('ee_delta', failing_service, delta_request(0., 0., 0.))
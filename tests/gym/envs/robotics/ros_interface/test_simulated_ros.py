@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from gym.envs.tests.spec_list import skip_mujoco, SKIP_MUJOCO_WARNING_MESSAGE
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+@pytest.mark.parametrize('asynchronous', [False, True])
+def test_real_robot_path_with_simulated_robot(asynchronous):
+    from gym.envs.robotics import SIA7FARMPickAndPlaceEnv
+    from gym.envs.robotics.ros_interface.simulated_sia_7f_arm_ros import (
+        ServiceLatency, SimulatedSIA7FARMROS)
+
+    robot = SimulatedSIA7FARMROS(
+        SIA7FARMPickAndPlaceEnv(), service_latency=ServiceLatency(0.001, 0.0005),
+        joint_states_drop_rate=0.5, asynchronous=asynchronous, seed=0)
+    env = SIA7FARMPickAndPlaceEnv(use_real_robot=True, ros_interface=robot)
+    env.seed(0)
+    env.reset()
+    for _ in range(10):
+        obs, _, _, _ = env.step(env.action_space.sample())
+        assert env.observation_space.contains(obs)
+    robot.arm_wait_for_commands()
+
+    stats = env.get_real_robot_latency_stats()
+    assert stats['arm_set_ee_pose_relative']['count'] == 10
+    assert stats['arm_set_ee_pose_relative']['p50'] > 0.
+    env.close()
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+def test_object_target_is_stale():
+    from gym.envs.robotics import SIA7FARMPickAndPlaceEnv
+    from gym.envs.robotics.ros_interface.simulated_sia_7f_arm_ros import SimulatedSIA7FARMROS
+
+    robot = SimulatedSIA7FARMROS(SIA7FARMPickAndPlaceEnv(), object_target_delay=3, seed=0)
+    published = [robot.get_object_position()]
+    actual = [robot.sim.data.get_site_xpos('object0').copy()]
+    for _ in range(6):
+        robot.arm_set_ee_pose_relative([0., 0., -0.03])
+        published.append(robot.get_object_position())
+        actual.append(robot.sim.data.get_site_xpos('object0').copy())
+    for i, position in enumerate(published):
+        assert np.array_equal(position, actual[max(i - 3, 0)])
+    robot.close()
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+@pytest.mark.parametrize('command_queue_size', [1, 2])
+def test_arm_commands_are_bounded(command_queue_size):
+    import time
+    from gym.envs.robotics import SIA7FARMPickAndPlaceEnv
+    from gym.envs.robotics.ros_interface.simulated_sia_7f_arm_ros import (
+        ServiceLatency, SimulatedSIA7FARMROS)
+
+    latency = 0.05
+    robot = SimulatedSIA7FARMROS(
+        SIA7FARMPickAndPlaceEnv(),
+        service_latency={'arm_set_ee_pose_relative': ServiceLatency(latency)},
+        asynchronous=True, command_queue_size=command_queue_size, seed=0)
+    start = time.time()
+    for _ in range(command_queue_size + 3):
+        robot.arm_set_ee_pose_relative([0., 0., -0.01])
+        assert robot.arm_commands._commands.qsize() <= command_queue_size
+    # One motion is being sent and `command_queue_size` are waiting, so the
+    # last submissions waited for the arm to catch up
+    assert time.time() - start >= 1.5 * latency
+    robot.arm_wait_for_commands()
+    assert robot.get_latency_stats()['arm_set_ee_pose_relative']['count'] == command_queue_size + 3
+    robot.close()
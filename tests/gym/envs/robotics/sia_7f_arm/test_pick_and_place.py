@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+
+from gym import envs
+from gym.envs.tests.spec_list import skip_mujoco, SKIP_MUJOCO_WARNING_MESSAGE
+
+
+def _reference_obs(sim):
+    names = [n for n in sim.model.joint_names if n.startswith('sia_7f_arm')]
+    grip_pos = sim.data.get_site_xpos('r_grip_site')
+    object_pos = sim.data.get_site_xpos('object0')
+    return np.concatenate([
+        grip_pos,
+        object_pos,
+        object_pos - grip_pos,
+        [sim.data.get_joint_qpos(name) for name in names],
+        [sim.data.get_joint_qvel(name) for name in names],
+    ])
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+def test_obs_layout_matches_named_lookups():
+    env = envs.make('SIA7FARMPickAndPlace-v1')
+    env.seed(0)
+    obs = env.reset()
+    for _ in range(5):
+        assert np.allclose(obs[:-1], _reference_obs(env.unwrapped.sim))
+        assert obs[-1] == env.unwrapped._is_success
+        obs, _, _, _ = env.step(env.action_space.sample())
+    env.close()
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+def test_obs_is_not_aliased():
+    env = envs.make('SIA7FARMPickAndPlace-v1')
+    obs1 = env.reset()
+    obs2, _, _, _ = env.step(env.action_space.sample())
+    assert obs1 is not obs2
+    assert not np.shares_memory(obs1, obs2)
+    env.close()
+
+
+def _reference_reward(object_pos, grip_pos, action):
+    dist = np.linalg.norm(object_pos - grip_pos)
+    reward_grasping, is_success = 0., 0
+    if dist < 0.05 and object_pos[2] > 0.75:
+        reward_grasping += 10.
+        if object_pos[2] > 0.8:
+            reward_grasping += 100.
+            is_success = 1
+    reward = -0.01 * np.square(action).sum() - dist + reward_grasping
+    if object_pos[2] < 0.1:
+        reward -= 10
+    return reward, is_success, dist < 0.05
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+def test_compute_reward_batch():
+    from gym.envs.robotics.mobile_sia_7f_arm_gym_env import compute_reward_batch
+    rng = np.random.RandomState(0)
+    grip_pos = rng.uniform(0., 1., size=(1000, 3))
+    object_pos = grip_pos + rng.uniform(-0.05, 0.05, size=(1000, 3))
+    object_pos[::2, 2] = rng.uniform(0., 1., size=500)
+    action = rng.uniform(-1., 1., size=(1000, 4))
+
+    rewards, successes, gripper_closes = compute_reward_batch(object_pos, grip_pos, action)
+    assert rewards.shape == successes.shape == gripper_closes.shape == (1000,)
+    for i in range(1000):
+        reward, success, gripper_close = _reference_reward(object_pos[i], grip_pos[i], action[i])
+        assert np.isclose(rewards[i], reward)
+        assert successes[i] == success
+        assert gripper_closes[i] == gripper_close
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+@pytest.mark.parametrize('refill', ['never', 'background'])
+def test_reset_cache_is_deterministic(refill):
+    def rollout():
+        env = envs.make('SIA7FARMPickAndPlace-v1', reset_cache_size=4,
+                        reset_cache_refill=refill)
+        env.seed(0)
+        observations = [env.reset() for _ in range(6)]
+        env.close()
+        return np.array(observations)
+
+    assert np.array_equal(rollout(), rollout())
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+def test_reset_cache_restores_settled_states():
+    env = envs.make('SIA7FARMPickAndPlace-v1', reset_cache_size=2)
+    env.seed(0)
+    observations = np.array([env.reset() for _ in range(10)])
+    assert len(np.unique(observations[:, :3], axis=0)) <= 2
+    env.step(env.action_space.sample())
+    env.close()
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+def test_clone_restore_state():
+    env = envs.make('SIA7FARMPickAndPlace-v1').unwrapped
+    env.seed(0)
+    env.reset()
+    for _ in range(5):
+        env.step(env.action_space.sample())
+    state = env.clone_state()
+    assert state.shape == (env.state_size,)
+
+    def rollout():
+        actions = env.np_random.uniform(-1., 1., size=(10, env.n_actions))
+        return [env.step(action)[:2] for action in actions]
+
+    expected = rollout()
+    env.restore_state(state.tobytes())
+    assert np.array_equal(env.clone_state(out=np.empty_like(state)), state)
+    for (obs, reward), (expected_obs, expected_reward) in zip(rollout(), expected):
+        assert np.array_equal(obs, expected_obs)
+        assert reward == expected_reward
+    env.close()
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+def test_obs_out():
+    env = envs.make('SIA7FARMPickAndPlace-v1').unwrapped
+    env.seed(0)
+    obs_out = np.full(env.observation_space.shape, np.nan)
+    assert env.reset(obs_out=obs_out) is obs_out
+    assert np.array_equal(obs_out, env._get_obs())
+
+    obs, _, _, _ = env.step(env.action_space.sample(), obs_out=obs_out)
+    assert obs is obs_out
+    assert np.array_equal(obs_out, env._get_obs())
+    env.close()
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from gym import envs
+from gym.envs.tests.spec_list import skip_mujoco, SKIP_MUJOCO_WARNING_MESSAGE
+
+
+def _make_env():
+    return envs.make('SIA7FARMPickAndPlace-v1')
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+def test_vec_env_matches_single_envs():
+    from gym.envs.robotics import MobileSIA7FARMVecEnv
+    num_envs = 3
+    vec_env = MobileSIA7FARMVecEnv([_make_env for _ in range(num_envs)])
+    single_envs = [_make_env() for _ in range(num_envs)]
+    try:
+        vec_env.seed(0)
+        for i, env in enumerate(single_envs):
+            env.seed(i)
+
+        observations = vec_env.reset()
+        assert observations.shape == (num_envs,) + vec_env.single_observation_space.shape
+        assert np.allclose(observations, [env.reset() for env in single_envs])
+
+        rng = np.random.RandomState(0)
+        for _ in range(10):
+            actions = rng.uniform(-1., 1., size=(num_envs, 4))
+            observations, rewards, dones, infos = vec_env.step(actions)
+            results = [env.step(action) for env, action in zip(single_envs, actions)]
+            assert np.allclose(observations, [result[0] for result in results])
+            assert np.allclose(rewards, [result[1] for result in results])
+            assert [info['is_success'] for info in infos] == \
+                [result[3]['is_success'] for result in results]
+            assert not np.any(dones)
+    finally:
+        vec_env.close()
+        for env in single_envs:
+            env.close()
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+def test_vec_env_time_limit():
+    from gym.envs.robotics import MobileSIA7FARMVecEnv
+    vec_env = MobileSIA7FARMVecEnv([_make_env for _ in range(2)], max_episode_steps=3)
+    try:
+        vec_env.reset()
+        actions = np.zeros((2, 4))
+        for _ in range(2):
+            _, _, dones, _ = vec_env.step(actions)
+            assert not np.any(dones)
+        _, _, dones, infos = vec_env.step(actions)
+        assert np.all(dones)
+        assert all(info['TimeLimit.truncated'] for info in infos)
+    finally:
+        vec_env.close()
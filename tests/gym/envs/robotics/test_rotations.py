@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from gym.envs.tests.spec_list import skip_mujoco, SKIP_MUJOCO_WARNING_MESSAGE
+
+
+def _mat2quat_eigh(mat):
+    # Reference implementation: the quaternion is the eigenvector of the
+    # largest eigenvalue of the symmetric matrix K (Bar-Itzhack).
+    (Qxx, Qyx, Qzx), (Qxy, Qyy, Qzy), (Qxz, Qyz, Qzz) = mat
+    K = np.array([
+        [Qxx - Qyy - Qzz, 0, 0, 0],
+        [Qyx + Qxy, Qyy - Qxx - Qzz, 0, 0],
+        [Qzx + Qxz, Qzy + Qyz, Qzz - Qxx - Qyy, 0],
+        [Qyz - Qzy, Qzx - Qxz, Qxy - Qyx, Qxx + Qyy + Qzz]]) / 3.0
+    vals, vecs = np.linalg.eigh(K)
+    q = vecs[[3, 0, 1, 2], np.argmax(vals)]
+    return -q if q[0] < 0 else q
+
+
+def _random_euler(shape, seed=0):
+    return np.random.RandomState(seed).uniform(-np.pi, np.pi, size=shape + (3,))
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+@pytest.mark.parametrize('shape', [(), (7,), (3, 5)])
+def test_mat2quat(shape):
+    from gym.envs.robotics import rotations
+
+    mat = rotations.euler2mat(_random_euler(shape))
+    quat = rotations.mat2quat(mat)
+    assert quat.shape == shape + (4,)
+    expected = np.array([_mat2quat_eigh(m) for m in mat.reshape(-1, 3, 3)])
+    assert np.allclose(quat.reshape(-1, 4), expected)
+    assert np.allclose(rotations.quat2mat(quat), mat)
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+def test_mat2quat_parallel_rotations():
+    from gym.envs.robotics import rotations
+
+    for euler in rotations.get_parallel_rotations():
+        mat = rotations.euler2mat(euler)
+        assert np.allclose(rotations.quat2mat(rotations.mat2quat(mat)), mat)
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+@pytest.mark.parametrize('shape', [(), (7,), (3, 5)])
+def test_quat_mul(shape):
+    from gym.envs.robotics import rotations
+
+    q0 = rotations.euler2quat(_random_euler(shape, seed=0))
+    q1 = rotations.euler2quat(_random_euler(shape, seed=1))
+    q = rotations.quat_mul(q0, q1)
+    assert q.shape == shape + (4,)
+    mat = np.matmul(rotations.quat2mat(q0), rotations.quat2mat(q1))
+    assert np.allclose(rotations.quat2mat(q), mat)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from gym import envs
+from gym.envs.tests.spec_list import skip_mujoco, SKIP_MUJOCO_WARNING_MESSAGE
+
+
+def _ctrl_set_action_loop(sim, action):
+    # Reference implementation, looping over the actuators.
+    if sim.model.nmocap > 0:
+        _, action = np.split(action, (sim.model.nmocap * 7, ))
+    for i in range(action.shape[0]):
+        if sim.model.actuator_biastype[i] == 0:
+            sim.data.ctrl[i] = action[i]
+        else:
+            idx = sim.model.jnt_qposadr[sim.model.actuator_trnid[i, 0]]
+            sim.data.ctrl[i] = sim.data.qpos[idx] + action[i]
+
+
+def _reset_mocap2body_xpos_loop(sim):
+    # Reference implementation, looping over the equality constraints.
+    import mujoco_py
+    for eq_type, obj1_id, obj2_id in zip(sim.model.eq_type, sim.model.eq_obj1id,
+                                         sim.model.eq_obj2id):
+        if eq_type != mujoco_py.const.EQ_WELD:
+            continue
+        mocap_id = sim.model.body_mocapid[obj1_id]
+        if mocap_id != -1:
+            body_idx = obj2_id
+        else:
+            mocap_id = sim.model.body_mocapid[obj2_id]
+            body_idx = obj1_id
+        sim.data.mocap_pos[mocap_id][:] = sim.data.body_xpos[body_idx]
+        sim.data.mocap_quat[mocap_id][:] = sim.data.body_xquat[body_idx]
+
+
+@pytest.mark.skipif(skip_mujoco, reason=SKIP_MUJOCO_WARNING_MESSAGE)
+@pytest.mark.parametrize('environment_id', ['FetchPickAndPlace-v1', 'SIA7FARMPickAndPlace-v1'])
+def test_actuation_matches_loops(environment_id):
+    from gym.envs.robotics import utils
+
+    env = envs.make(environment_id).unwrapped
+    env.seed(0)
+    env.reset()
+    sim = env.sim
+    for _ in range(5):
+        env.step(env.action_space.sample())
+        action = env.np_random.uniform(-1., 1., size=sim.model.nmocap * 7 + sim.model.nu)
+
+        _ctrl_set_action_loop(sim, action)
+        expected_ctrl = sim.data.ctrl.copy()
+        sim.data.ctrl[:] = 0.
+        utils.ctrl_set_action(sim, action)
+        assert np.array_equal(sim.data.ctrl, expected_ctrl)
+
+        _reset_mocap2body_xpos_loop(sim)
+        expected_mocap = sim.data.mocap_pos.copy(), sim.data.mocap_quat.copy()
+        sim.data.mocap_pos[:] = 0.
+        sim.data.mocap_quat[:] = 0.
+        utils.reset_mocap2body_xpos(sim)
+        assert np.array_equal(sim.data.mocap_pos, expected_mocap[0])
+        assert np.array_equal(sim.data.mocap_quat, expected_mocap[1])
+    env.close()